@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Product, Order, OrderItem
+from .models import Product, CustomDesign, Order, OrderItem
 
 # The @admin.register decorator is a clean way to register your models.
 
@@ -12,13 +12,23 @@ class ProductAdmin(admin.ModelAdmin):
     list_filter = ('created_at',)
     search_fields = ('name', 'description')
 
+@admin.register(CustomDesign)
+class CustomDesignAdmin(admin.ModelAdmin):
+    """
+    Customizes the display of customer-created custom designs in the admin interface.
+    """
+    list_display = ('name', 'customer', 'price', 'created_at')
+    list_filter = ('created_at',)
+    search_fields = ('name', 'customer__username')
+    raw_id_fields = ['customer']
+
 # OrderItem is best managed "inline" with the Order, so we define that here.
 class OrderItemInline(admin.TabularInline):
     """
     Allows editing OrderItems directly within the Order detail page.
     """
     model = OrderItem
-    raw_id_fields = ['product'] 
+    raw_id_fields = ['product', 'custom_design'] 
     extra = 0 
     readonly_fields = ('price',) 
 
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        # Register signal handlers (search index maintenance).
+        from . import signals  # noqa: F401
+        # Register the background tasks run by the job queue workers.
+        from . import tasks  # noqa: F401
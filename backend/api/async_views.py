@@ -0,0 +1,55 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.utils.decorators import classonlymethod
+from rest_framework.views import APIView
+
+
+class AsyncDispatchMixin:
+    """
+    Lets a DRF view define `async def` handlers, so I/O-bound endpoints don't hold a worker thread
+    while they wait (on the payment gateway, the cache or async ORM calls) when served under ASGI.
+
+    Authentication, permission and throttling checks are synchronous in DRF (and may query the
+    database), so they run through sync_to_async; so do any handlers that are still synchronous,
+    e.g. the write actions inherited from ModelViewSet. Under WSGI Django runs the async view in
+    an event loop per request, so the same views work in both deployment modes.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncAPIView(AsyncDispatchMixin, APIView):
+    """APIView whose HTTP handlers are all `async def` (Django marks the view as a coroutine)."""
+
+
+class AsyncViewSetMixin(AsyncDispatchMixin):
+    """
+    Makes a ViewSet's view function a coroutine. Actions can be a mix of `async def`
+    (e.g. read-only list/retrieve) and regular methods.
+    """
+
+    @classonlymethod
+    def as_view(cls, actions=None, **initkwargs):
+        return markcoroutinefunction(super().as_view(actions, **initkwargs))
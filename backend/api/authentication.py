@@ -0,0 +1,124 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import IntegrityError, models, transaction
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import TokenVersion
+from .passwords import check_credentials
+
+VERSION_CLAIM = 'ver'
+TOKEN_VERSION_KEY = 'auth:token-version:{user_id}'
+
+# User fields signed into every token; the request user is built from them without a database query.
+CLAIM_FIELDS = ('username', 'is_staff', 'is_superuser')
+
+
+def token_version(user_id):
+    """
+    Returns the current token version of a user. Read from the cache, so checking a token costs no query;
+    a miss falls back to the TokenVersion table (no row: version 0) and caches the answer for
+    TOKEN_VERSION_CACHE_TIMEOUT seconds. `revoke_tokens` only clears the cache it can reach, so with a
+    per-process cache that timeout bounds how long other workers keep accepting revoked tokens.
+    """
+    key = TOKEN_VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        version = TokenVersion.objects.filter(user_id=user_id).values_list('version', flat=True).first() or 0
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def revoke_tokens(user_id):
+    """
+    Revokes every access and refresh token issued to a user so far by bumping their token version.
+    Called when a user's password, permissions or active flag change and when they are deleted.
+    """
+    if not TokenVersion.objects.filter(user_id=user_id).update(version=models.F('version') + 1):
+        try:
+            with transaction.atomic():
+                TokenVersion.objects.create(user_id=user_id, version=1)
+        except IntegrityError:
+            # A concurrent request created the row first.
+            TokenVersion.objects.filter(user_id=user_id).update(version=models.F('version') + 1)
+
+    key = TOKEN_VERSION_KEY.format(user_id=user_id)
+    # Forget the cached version now, and again once the transaction commits: a request reading the
+    # version in between would cache the old one.
+    cache.delete(key)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: cache.delete(key))
+
+
+class VersionedRefreshToken(RefreshToken):
+    """A refresh token (and access tokens derived from it) carrying CLAIM_FIELDS and the user's token version."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for field in CLAIM_FIELDS:
+            token[field] = getattr(user, field)
+        token[VERSION_CLAIM] = token_version(user.pk)
+        return token
+
+
+def check_token_version(token):
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        raise InvalidToken("Token contained no recognizable user identification")
+    if token.get(VERSION_CLAIM) != token_version(user_id):
+        raise AuthenticationFailed("Token has been revoked.", code='token_revoked')
+    return user_id
+
+
+def claims_user(token, user_id):
+    """
+    Builds the request user from the token's claims, without a query. It is a real User instance, so it can
+    be assigned to foreign keys and used in filters; the fields not in the token (email, password, ...) are
+    deferred and loaded from the database only if something reads them.
+    """
+    claims = {'id': user_id, 'is_active': True, **{field: token.get(field) for field in CLAIM_FIELDS}}
+    fields = [field.attname for field in User._meta.concrete_fields if field.attname in claims]
+    return User.from_db('default', fields, [claims[field] for field in fields])
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication that trusts the signed claims instead of loading the User row on every request.
+    A token is only accepted while its version matches the user's current token version (see
+    `revoke_tokens`), so changing a password or permissions, deactivating or deleting a user still
+    logs them out straight away (in other worker processes, once their cached version expires, unless
+    the cache is shared). Checking the version is a cache read.
+    """
+
+    def get_user(self, validated_token):
+        user_id = check_token_version(validated_token)
+        if any(field not in validated_token for field in CLAIM_FIELDS):
+            raise InvalidToken("Token is missing user claims")
+        return claims_user(validated_token, user_id)
+
+
+class VersionedTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Issues versioned tokens; credentials are checked by `check_credentials` (rate limited, pooled hashing)."""
+    token_class = VersionedRefreshToken
+
+    def validate(self, attrs):
+        self.user = check_credentials(self.context.get('request'), attrs[self.username_field], attrs['password'])
+        if self.user is None:
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        refresh = self.get_token(self.user)
+        return {'refresh': str(refresh), 'access': str(refresh.access_token)}
+
+
+class VersionedTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refuses to refresh a revoked refresh token; new access tokens keep the refresh token's claims."""
+    token_class = VersionedRefreshToken
+
+    def validate(self, attrs):
+        check_token_version(self.token_class(attrs['refresh']))
+        return super().validate(attrs)
@@ -0,0 +1,87 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+# Cache keys are versioned instead of deleted: bumping a version makes every response built
+# from the old version unreachable, whatever query parameters it was cached under.
+LIST_VERSION_KEY = 'products:list-version'
+DETAIL_VERSION_KEY = 'products:detail-version:{pk}'
+
+
+def get_product_cache():
+    return caches[getattr(settings, 'PRODUCT_CACHE_ALIAS', 'default')]
+
+
+def _bump(cache, key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Key missing (never set or evicted): any new value differs from what was cached before it.
+        cache.set(key, 1, None)
+
+
+def invalidate_products(product_ids):
+    """
+    Invalidates the cached detail responses of the given products and every cached list response.
+    Called from the Product save/delete signals and after bulk stock updates (which skip signals).
+    """
+    cache = get_product_cache()
+    keys = [LIST_VERSION_KEY] + [DETAIL_VERSION_KEY.format(pk=pk) for pk in product_ids]
+
+    def bump_all():
+        for key in keys:
+            _bump(cache, key)
+
+    # Bump now, and again once the transaction commits: a response rebuilt by a concurrent
+    # request in between would still hold the pre-commit data.
+    bump_all()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(bump_all)
+
+
+async def aproduct_cache_key(request, pk=None):
+    """
+    Builds the cache key for a product list (pk=None) or detail response.
+    The key covers the host (image URLs are absolute), every query parameter
+    (is_featured/is_trending/is_bestseller, cursor, page_size, fields) and the current version.
+    """
+    cache = get_product_cache()
+    version_key = LIST_VERSION_KEY if pk is None else DETAIL_VERSION_KEY.format(pk=pk)
+    version = await cache.aget(version_key, 0)
+    params = sorted((key, value) for key, values in request.query_params.lists() for value in values)
+    raw = json.dumps([request.get_host(), pk, version, params])
+    return 'products:response:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def if_none_match(request, etag):
+    header = request.headers.get('If-None-Match', '')
+    return header.strip() == '*' or etag in [tag.strip() for tag in header.split(',')]
+
+
+async def acached_product_response(request, key, build_response):
+    """
+    Returns the cached response for `key`, building (and caching) it with `await build_response()` on a miss.
+    Only 200 responses are cached. Every response carries an ETag, and a request whose
+    If-None-Match matches it gets an empty 304 Not Modified.
+    """
+    cache = get_product_cache()
+    entry = await cache.aget(key)
+    if entry is None:
+        response = await build_response()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        content = JSONRenderer().render(response.data)
+        # Store plain JSON data so the cache never holds serializer references.
+        entry = (json.loads(content), f'"{hashlib.md5(content).hexdigest()}"')
+        await cache.aset(key, entry, getattr(settings, 'PRODUCT_CACHE_TIMEOUT', 300))
+
+    data, etag = entry
+    if if_none_match(request, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return Response(data, headers={'ETag': etag})
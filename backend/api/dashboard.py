@@ -0,0 +1,130 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import Order, OrderStatsRollup, Product, ProductSalesRollup, ProductSalesTotal
+from .serializers import AdminOrderListSerializer
+
+SUMMARY_CACHE_KEY = 'admin:dashboard-summary'
+
+
+def order_stats(today=None):
+    """
+    The order charts of the admin dashboard, computed from the OrderStatsRollup table with two queries:
+    per-(day, status) totals, which every all-time and daily figure is folded from, and today's hours.
+    """
+    today = today or timezone.localdate()
+    rollups = OrderStatsRollup.objects.all()
+    daily = rollups.values('day', 'status').annotate(count=Sum('order_count'), revenue=Sum('revenue'))
+    hourly_today = rollups.filter(day=today).values('hour').annotate(count=Sum('order_count'))
+
+    monthly, yearly = defaultdict(int), defaultdict(int)
+    by_status, by_date, by_weekday = defaultdict(int), defaultdict(int), defaultdict(int)
+    total_revenue = 0
+    thirty_days_ago = today - timedelta(days=30)
+    for row in daily:
+        day, count = row['day'], row['count']
+        monthly[day.replace(day=1)] += count
+        yearly[day.replace(month=1, day=1)] += count
+        by_status[row['status']] += count
+        # 1=Sunday, 2=Monday, ..., 7=Saturday, like the database's WEEKDAY.
+        by_weekday[day.isoweekday() % 7 + 1] += count
+        if day >= thirty_days_ago:
+            by_date[day] += count
+        if row['status'] == 'DELIVERED':
+            total_revenue += row['revenue']
+
+    hours = {row['hour']: row['count'] for row in hourly_today}
+    return {
+        "monthly_orders": [{'month': month, 'count': count} for month, count in sorted(monthly.items())],
+        "yearly_orders": [{'year': year, 'count': count} for year, count in sorted(yearly.items())],
+        "status_distribution": [{'status': s, 'count': count} for s, count in sorted(by_status.items()) if count > 0],
+        "total_revenue": total_revenue,
+        "daily_orders": [{'date': date, 'count': count} for date, count in sorted(by_date.items()) if count > 0],
+        "hourly_orders_today": [{'hour': f"{hour:02d}:00", 'count': hours.get(hour, 0)} for hour in range(24)],
+        "orders_by_day_of_week": [
+            {'day_of_week_num': num, 'count': count} for num, count in sorted(by_weekday.items()) if count > 0
+        ],
+    }
+
+
+def top_selling_products(limit, days=None):
+    """
+    The `limit` best-selling products, by units in SHIPPED/DELIVERED orders, read from the product sales counters.
+    All time (an index scan on ProductSalesTotal.units_sold), or over the orders of the last `days` days
+    including today (a range scan on ProductSalesRollup.day, summing at most `days` rows per product).
+    """
+    if days is None:
+        rows = ProductSalesTotal.objects.filter(units_sold__gt=0).order_by('-units_sold', 'product_id')
+    else:
+        since = timezone.localdate() - timedelta(days=days - 1)
+        rows = ProductSalesRollup.objects.filter(day__gte=since).values('product_id').annotate(
+            units_sold=Sum('units_sold'), revenue=Sum('revenue'),
+        ).filter(units_sold__gt=0).order_by('-units_sold', 'product_id')
+    return list(rows.values(
+        'revenue', id=F('product_id'), name=F('product__name'), total_sold=F('units_sold'),
+    )[:limit])
+
+
+def dashboard_summary():
+    """
+    Everything the admin dashboard shows on load, in a fixed number of queries whatever the table sizes:
+    the order charts (two rollup queries), user and product counts (one aggregate each),
+    the most recent orders and the products lowest on stock (one indexed, limited query each).
+    """
+    today = timezone.localdate()
+    threshold = settings.LOW_STOCK_THRESHOLD
+    limit = settings.ADMIN_DASHBOARD_LIST_SIZE
+    stats = order_stats(today)
+
+    users = User.objects.aggregate(
+        total=Count('id'),
+        staff=Count('id', filter=Q(is_staff=True)),
+        joined_today=Count('id', filter=Q(date_joined__date=today)),
+    )
+    products = Product.objects.aggregate(
+        total=Count('id'),
+        low_stock=Count('id', filter=Q(stock__lt=threshold)),
+        out_of_stock=Count('id', filter=Q(stock=0)),
+    )
+    recent_orders = Order.objects.with_list_summary().order_by('-created_at', '-id')[:limit]
+    low_stock = Product.objects.filter(stock__lt=threshold).order_by('stock', 'id').values('id', 'name', 'stock', 'price')[:limit]
+
+    by_status = {row['status']: row['count'] for row in stats['status_distribution']}
+    return {
+        **stats,
+        "kpis": {
+            "total_orders": sum(by_status.values()),
+            "orders_today": sum(row['count'] for row in stats['hourly_orders_today']),
+            "open_orders": by_status.get('PENDING', 0) + by_status.get('PROCESSING', 0),
+            "total_revenue": stats['total_revenue'],
+            "users": users['total'],
+            "staff_users": users['staff'],
+            "users_joined_today": users['joined_today'],
+            "products": products['total'],
+            "low_stock_products": products['low_stock'],
+            "out_of_stock_products": products['out_of_stock'],
+        },
+        "recent_orders": list(AdminOrderListSerializer(recent_orders, many=True).data),
+        "low_stock": list(low_stock),
+        "low_stock_threshold": threshold,
+        "generated_at": timezone.now(),
+    }
+
+
+def cached_dashboard_summary():
+    """
+    Returns the dashboard summary, recomputed at most once every ADMIN_DASHBOARD_CACHE_TIMEOUT seconds,
+    so any number of admin sessions polling the dashboard share one computation.
+    `generated_at` tells how old the figures are.
+    """
+    summary = cache.get(SUMMARY_CACHE_KEY)
+    if summary is None:
+        summary = dashboard_summary()
+        cache.set(SUMMARY_CACHE_KEY, summary, settings.ADMIN_DASHBOARD_CACHE_TIMEOUT)
+    return summary
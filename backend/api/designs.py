@@ -0,0 +1,113 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+from .models import DesignPreview, ImageBlob
+
+# Bumped whenever the canonical form changes, so old hashes can never collide with new ones.
+SPEC_VERSION = 1
+
+
+def canonical_spec(spec):
+    """
+    Normalizes a validated design spec (see DesignSpecSerializer) so that designs which render
+    identically get identical specs: colors are lowercase six-digit hex, text is stripped, and
+    the text styling is dropped when there is no text to style.
+    """
+    canonical = {
+        'v': SPEC_VERSION,
+        'shirt_color': expand_color(spec['shirt_color']),
+        'decal_sha256': (spec.get('decal_sha256') or '').lower() or None,
+        'text': spec.get('text', '').strip(),
+    }
+    if canonical['text']:
+        canonical['text_color'] = expand_color(spec['text_color'])
+        canonical['text_size'] = spec['text_size']
+        canonical['text_position'] = {'x': spec['text_position']['x'], 'y': spec['text_position']['y']}
+    return canonical
+
+
+def expand_color(color):
+    color = color.lower()
+    if len(color) == 4:
+        color = '#' + ''.join(digit * 2 for digit in color[1:])
+    return color
+
+
+def spec_hash(spec):
+    """The SHA-256 of a canonical spec, serialized with sorted keys and no whitespace."""
+    raw = json.dumps(spec, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def describe_spec(spec):
+    """The human-readable summary stored as a design's description."""
+    description = f"Custom design with color: {spec['shirt_color']}"
+    if spec['text']:
+        description += f' and text: "{spec["text"]}"'
+    if spec['decal_sha256']:
+        description += " and an uploaded decal"
+    return description + "."
+
+
+def find_preview(customer, digest, use=True):
+    """
+    Returns the customer's cached preview for a spec hash, or None. With `use`, a hit counts as a use,
+    so it moves the preview to the back of the eviction queue; a mere lookup leaves it as it is.
+    """
+    preview = DesignPreview.objects.filter(customer=customer, spec_hash=digest).first()
+    if preview is not None and use:
+        preview.last_used_at = timezone.now()
+        DesignPreview.objects.filter(pk=preview.pk).update(
+            last_used_at=preview.last_used_at, hit_count=models.F('hit_count') + 1
+        )
+    return preview
+
+
+def create_preview(customer, spec, digest, image):
+    """
+    Stores the customer's newly rendered preview for `spec`. If a concurrent request of theirs stored the
+    same spec first, that preview is returned instead. The cache is trimmed once the transaction commits.
+    """
+    try:
+        with transaction.atomic():
+            preview = DesignPreview.objects.create(customer=customer, spec_hash=digest, spec=spec, image=image, size=image.size)
+    except IntegrityError:
+        return find_preview(customer, digest)
+    transaction.on_commit(evict_previews)
+    return preview
+
+
+def attach_preview(design_data, preview):
+    """Points new CustomDesign data at a cached preview's image, without uploading or writing a file."""
+    design_data['image'] = preview.image.name
+    design_data['spec_hash'] = preview.spec_hash
+    ImageBlob.retain(preview.image.name)
+
+
+def evict_previews(max_entries=None, max_bytes=None):
+    """
+    Deletes the least recently used previews until the cache holds at most `max_entries` previews
+    totalling at most `max_bytes` (default: the DESIGN_PREVIEW_CACHE_* settings). Designs created from
+    an evicted preview keep their own reference to its image. Returns the number of previews evicted.
+    """
+    max_entries = settings.DESIGN_PREVIEW_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+    max_bytes = settings.DESIGN_PREVIEW_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+    totals = DesignPreview.objects.aggregate(count=models.Count('id'), size=models.Sum('size'))
+    count, size = totals['count'], totals['size'] or 0
+    evicted = []
+    if count > max_entries or size > max_bytes:
+        oldest_first = DesignPreview.objects.order_by('last_used_at', 'id').values_list('id', 'size')
+        for pk, preview_size in oldest_first.iterator():
+            if count <= max_entries and size <= max_bytes:
+                break
+            evicted.append(pk)
+            count -= 1
+            size -= preview_size
+        # Deleting through the ORM fires post_delete, which releases each preview's image blob.
+        DesignPreview.objects.filter(pk__in=evicted).delete()
+    return len(evicted)
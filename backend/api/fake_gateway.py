@@ -0,0 +1,94 @@
+import json
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeGateway:
+    """
+    A local stand-in for the Razorpay orders API, for tests and load tests.
+    Serves POST /orders on 127.0.0.1 from a background thread, after an artificial `latency`.
+    Failures can be scripted with `fail_next`, and `request_count` tells how many requests arrived.
+
+        with FakeGateway(latency=0.2) as fake:
+            fake.fail_next(2, status=503)
+            ...  # point RAZORPAY_API_URL at fake.url
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.request_count = 0
+        self._failures = deque()
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self._server.server_port}'
+
+    def fail_next(self, count, status=503, body=None):
+        """
+        Answers the next `count` requests with HTTP `status` instead of creating an order, and a JSON error
+        body or `body` (bytes) as is.
+        """
+        with self._lock:
+            self._failures.extend([(status, body)] * count)
+
+    def _next_response(self, body):
+        with self._lock:
+            self.request_count += 1
+            number = self.request_count
+            failure = self._failures.popleft() if self._failures else None
+        if failure is not None:
+            status, content = failure
+            return status, content or {'error': {'code': 'SERVER_ERROR', 'description': 'Scripted failure'}}
+        return 200, {
+            'id': f'order_fake{number:010d}', 'entity': 'order', 'status': 'created',
+            'amount': body.get('amount'), 'currency': body.get('currency'), 'receipt': body.get('receipt'),
+        }
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                time.sleep(fake.latency)
+                status, payload = fake._next_response(body)
+                content = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            # The default listen backlog of 5 would refuse bursts of concurrent connections.
+            request_queue_size = 1024
+
+            def handle_error(self, request, client_address):
+                # A client that timed out closes the connection before the delayed response is written.
+                if not isinstance(sys.exc_info()[1], ConnectionError):
+                    super().handle_error(request, client_address)
+
+        self._server = Server(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,70 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Order
+
+
+def date_range_filter(params, field):
+    """
+    Turns the `from` / `to` query parameters (inclusive dates, YYYY-MM-DD) into queryset filters on `field`.
+    """
+    filters = {}
+    for param, lookup, bound in (('from', 'gte', time.min), ('to', 'lte', time.max)):
+        value = params.get(param)
+        if not value:
+            continue
+        day = parse_date(value)
+        if day is None:
+            raise serializers.ValidationError({param: "Must be a date in YYYY-MM-DD format."})
+        filters[f'{field}__{lookup}'] = timezone.make_aware(datetime.combine(day, bound))
+    return filters
+
+
+def filter_orders(queryset, params):
+    """
+    Applies the admin order filters, each of which can use an index on Order:
+    - `from` / `to`: creation date range
+    - `status`: one or more statuses, comma-separated
+    - `customer`: a customer's id or exact username
+    - `razorpay_order_id`: an exact Razorpay order id
+    """
+    queryset = queryset.filter(**date_range_filter(params, 'created_at'))
+
+    statuses = [value for value in params.get('status', '').split(',') if value]
+    if statuses:
+        unknown = set(statuses) - set(dict(Order.STATUS_CHOICES))
+        if unknown:
+            raise serializers.ValidationError({'status': f"Unknown status: {', '.join(sorted(unknown))}."})
+        queryset = queryset.filter(status__in=statuses)
+
+    customer = params.get('customer')
+    if customer:
+        queryset = queryset.filter(customer_id=customer) if customer.isdigit() else queryset.filter(customer__username=customer)
+
+    razorpay_order_id = params.get('razorpay_order_id')
+    if razorpay_order_id:
+        queryset = queryset.filter(razorpay_order_id=razorpay_order_id)
+    return queryset
+
+
+def filter_users(queryset, params):
+    """Applies the admin user filters: `from` / `to` (join date), `is_staff` and `is_active` (true/false)."""
+    queryset = queryset.filter(**date_range_filter(params, 'date_joined'))
+    for flag in ('is_staff', 'is_active'):
+        value = params.get(flag)
+        if value in ('true', 'false'):
+            queryset = queryset.filter(**{flag: value == 'true'})
+        elif value:
+            raise serializers.ValidationError({flag: "Must be 'true' or 'false'."})
+    return queryset
+
+
+class AdminOrderFilterBackend(BaseFilterBackend):
+    """Filter backend applying `filter_orders` to the admin order list."""
+
+    def filter_queryset(self, request, queryset, view):
+        return filter_orders(queryset, request.query_params)
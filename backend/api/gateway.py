@@ -0,0 +1,300 @@
+import asyncio
+import random
+import threading
+import time
+
+import httpx
+import razorpay
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+# Responses that mean the gateway did not process the request and it is safe to send it again.
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+
+
+class GatewayError(Exception):
+    """The payment gateway rejected a request or could not be reached."""
+
+
+class GatewayTimeout(GatewayError):
+    """The gateway did not answer within the configured timeout."""
+
+
+class GatewayRejected(GatewayError):
+    """The gateway answered with a client error (4xx other than 429): the request was at fault, not the gateway."""
+
+
+class GatewayUnavailable(GatewayError):
+    """The circuit breaker is open: the gateway failed repeatedly, so calls fail fast without trying it."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency for a while instead of letting every request wait on it.
+
+    - closed: calls go through; `failure_threshold` consecutive failures open the breaker.
+    - open: calls are refused until `reset_timeout` seconds have passed.
+    - half-open: a single trial call goes through; success closes the breaker, failure opens it again.
+      A trial that hasn't reported back after `reset_timeout` seconds is given up, and another one allowed.
+
+    State is per process (each worker learns about an outage on its own) and guarded by a lock,
+    since WSGI deployments call it from several threads.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+    def __init__(self, failure_threshold, reset_timeout, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.trial_started_at = None
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Returns True if a call may be made now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = self.clock()
+            if self.state == self.OPEN and now - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self.trial_started_at = now
+                return True
+            if self.state == self.HALF_OPEN and now - self.trial_started_at >= self.reset_timeout:
+                # The trial call never reported back (e.g. its worker died): let another one through.
+                self.trial_started_at = now
+                return True
+            # Open, or half-open with the trial call still in flight.
+            return False
+
+    def retry_after(self):
+        """Seconds until the breaker lets a trial call through (0 when it is not open)."""
+        if self.state != self.OPEN:
+            return 0
+        return max(0, self.reset_timeout - (self.clock() - self.opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+class PaymentGateway:
+    """
+    Client for the Razorpay REST API used by the async payment views.
+
+    Every call is bounded: connecting and waiting for a pooled connection are limited by
+    `connect_timeout`, waiting for the response by `read_timeout`. Calls that fail before the
+    gateway could have acted on them (connection errors, 429/502/503/504) are retried up to
+    `max_retries` times with exponential backoff and full jitter. Read timeouts are not retried,
+    because the gateway may already have created the order. A circuit breaker makes calls fail
+    fast while the gateway is down, and `stats()` exposes request, error and latency counters.
+
+    Under ASGI every request runs on the server's single event loop, and calls share an httpx.AsyncClient
+    and its connection pool. Under WSGI every async view runs on an event loop of its own, which an
+    AsyncClient's connections can't outlive, so those calls (`asynchronous=False`) go through a shared,
+    thread-safe httpx.Client from a worker thread instead.
+    """
+
+    def __init__(self, base_url, auth, connect_timeout=3.0, read_timeout=10.0, max_connections=20,
+                 max_keepalive_connections=10, max_retries=2, backoff=0.2, max_backoff=2.0, breaker=None):
+        self.base_url = base_url
+        self.auth = auth
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout, pool=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker or CircuitBreaker(failure_threshold=5, reset_timeout=30)
+        self.counters = dict.fromkeys(
+            ('requests', 'successes', 'failures', 'retries', 'short_circuited', 'timeouts', 'connection_errors', 'http_errors'), 0
+        )
+        self.latency = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+        self._stats_lock = threading.Lock()
+        self._client_lock = threading.Lock()
+        self._async_client = None
+        self._async_client_loop = None
+        self._sync_client = None
+
+    def async_client(self):
+        # An AsyncClient is bound to the loop it was first used on; a new loop (a test's) gets a new one.
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = httpx.AsyncClient(base_url=self.base_url, auth=self.auth, timeout=self.timeout, limits=self.limits)
+            self._async_client_loop = loop
+        return self._async_client
+
+    def sync_client(self):
+        with self._client_lock:
+            if self._sync_client is None:
+                self._sync_client = httpx.Client(base_url=self.base_url, auth=self.auth, timeout=self.timeout, limits=self.limits)
+            return self._sync_client
+
+    async def send(self, method, path, asynchronous, **kwargs):
+        if asynchronous:
+            return await self.async_client().request(method, path, **kwargs)
+        return await sync_to_async(self.sync_client().request, thread_sensitive=False)(method, path, **kwargs)
+
+    def close(self):
+        """Closes the sync client's connections (the async client's belong to its event loop)."""
+        with self._client_lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+
+    def backoff_delay(self, attempt):
+        """Full jitter: a random delay up to base * 2^attempt, so retrying clients don't stampede together."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def request(self, method, path, asynchronous=True, **kwargs):
+        """Sends a request and returns the decoded JSON body. Raises GatewayError (or a subclass) on failure."""
+        if not self.breaker.allow():
+            self.count('short_circuited')
+            raise GatewayUnavailable(f"Payment gateway unavailable; retry in {self.breaker.retry_after():.0f}s.")
+
+        try:
+            data = await self.send_with_retries(method, path, asynchronous, **kwargs)
+        except GatewayRejected:
+            # The gateway is healthy, it just rejected this request.
+            self.breaker.record_success()
+            raise
+        except BaseException:
+            # Any other way out, cancellation included, is a failure: a half-open breaker waits for its
+            # trial call's outcome.
+            self.count('failures')
+            self.breaker.record_failure()
+            raise
+        self.count('successes')
+        self.breaker.record_success()
+        return data
+
+    async def send_with_retries(self, method, path, asynchronous, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            self.count('requests')
+            start = time.perf_counter()
+            try:
+                response = await self.send(method, path, asynchronous, **kwargs)
+            except httpx.TimeoutException as exc:
+                self.count('timeouts')
+                error = GatewayTimeout(f"Payment gateway timed out ({type(exc).__name__}).")
+                retryable = isinstance(exc, (httpx.ConnectTimeout, httpx.PoolTimeout))
+            except httpx.TransportError as exc:
+                self.count('connection_errors')
+                error = GatewayError(f"Could not reach the payment gateway ({type(exc).__name__}).")
+                retryable = isinstance(exc, httpx.ConnectError)
+            else:
+                self.observe_latency(time.perf_counter() - start)
+                if not response.is_error:
+                    try:
+                        return response.json()
+                    except ValueError:
+                        raise GatewayError(f"Payment gateway returned a body that is not JSON: {response.text[:200]}")
+                self.count('http_errors')
+                message = f"Payment gateway returned HTTP {response.status_code}: {response.text[:200]}"
+                retryable = response.status_code in RETRYABLE_STATUSES
+                if not retryable and response.status_code < 500:
+                    raise GatewayRejected(message)
+                error = GatewayError(message)
+
+            if not retryable or attempt == self.max_retries:
+                raise error
+            self.count('retries')
+            await asyncio.sleep(self.backoff_delay(attempt))
+
+    def count(self, name):
+        with self._stats_lock:
+            self.counters[name] += 1
+
+    def observe_latency(self, seconds):
+        ms = seconds * 1000
+        with self._stats_lock:
+            self.latency['count'] += 1
+            self.latency['total_ms'] += ms
+            self.latency['max_ms'] = max(self.latency['max_ms'], ms)
+
+    def stats(self):
+        with self._stats_lock:
+            counters, latency = dict(self.counters), dict(self.latency)
+        count = latency['count']
+        return {
+            **counters,
+            'latency_ms': {
+                'count': count,
+                'avg': round(latency['total_ms'] / count, 2) if count else None,
+                'max': round(latency['max_ms'], 2),
+            },
+            'circuit': {
+                'state': self.breaker.state,
+                'consecutive_failures': self.breaker.failures,
+                'times_opened': self.breaker.times_opened,
+            },
+        }
+
+    async def create_order(self, data, asynchronous=True):
+        """Creates a Razorpay order (POST /orders) and returns it as a dict."""
+        return await self.request('POST', '/orders', asynchronous, json=data)
+
+
+_gateway = None
+
+
+def get_gateway():
+    """Returns the process-wide gateway client, configured from the RAZORPAY_* settings."""
+    global _gateway
+    if _gateway is None:
+        _gateway = PaymentGateway(
+            base_url=settings.RAZORPAY_API_URL,
+            auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+            connect_timeout=settings.RAZORPAY_CONNECT_TIMEOUT,
+            read_timeout=settings.RAZORPAY_READ_TIMEOUT,
+            max_connections=settings.RAZORPAY_MAX_CONNECTIONS,
+            max_retries=settings.RAZORPAY_MAX_RETRIES,
+            backoff=settings.RAZORPAY_RETRY_BACKOFF,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.RAZORPAY_BREAKER_FAILURE_THRESHOLD,
+                reset_timeout=settings.RAZORPAY_BREAKER_RESET_TIMEOUT,
+            ),
+        )
+    return _gateway
+
+
+def reset_gateway():
+    """Drops the gateway client so the next call rebuilds it from the current settings (tests, load tests)."""
+    global _gateway
+    if _gateway is not None:
+        _gateway.close()
+    _gateway = None
+
+
+async def create_order(data, asynchronous=True):
+    """
+    Creates a Razorpay order through the shared gateway client. Pass `asynchronous=False` when the
+    calling event loop lives only for the request (an async view under WSGI).
+    """
+    return await get_gateway().create_order(data, asynchronous)
+
+
+_signature_client = None
+
+
+def verify_payment_signature(params):
+    """
+    Checks a payment callback's signature (a local HMAC, no network call).
+    Raises razorpay.errors.SignatureVerificationError if it doesn't match.
+    """
+    global _signature_client
+    if _signature_client is None:
+        _signature_client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+    return _signature_client.utility.verify_payment_signature(params)
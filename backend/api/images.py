@@ -0,0 +1,113 @@
+import hashlib
+import io
+import posixpath
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, features
+
+from .caching import invalidate_products
+from .jobs import enqueue
+
+# Pillow encoder name and save options for each variant format.
+VARIANT_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'avif': ('AVIF', {'quality': 60}),
+}
+
+def variant_formats():
+    """The configured variant formats that this Pillow build can actually encode."""
+    return [fmt for fmt in settings.IMAGE_VARIANT_FORMATS if features.check(fmt)]
+
+
+def needs_variants(instance):
+    """True when the instance has an image whose variants have not been generated yet."""
+    return bool(instance.image) and instance.image_variants.get('source') != instance.image.name
+
+
+def build_variants(image_field):
+    """
+    Generates resized WebP/AVIF variants of an uploaded image for every configured width
+    (never upscaling) and stores them under content-hashed names, so their URLs can be cached forever.
+    Returns the variant map saved on the model:
+        {'source': <original name>, 'width': <original width>, 'webp': {'320': <name>, ...}, 'avif': {...}}
+    """
+    with image_field.storage.open(image_field.name, 'rb') as source_file:
+        source = ImageOps.exif_transpose(Image.open(source_file))
+        source.load()
+    if source.mode not in ('RGB', 'RGBA'):
+        source = source.convert('RGBA')
+
+    stem = posixpath.splitext(posixpath.basename(image_field.name))[0]
+    variants = {'source': image_field.name, 'width': source.width}
+    widths = sorted({min(width, source.width) for width in settings.IMAGE_VARIANT_WIDTHS})
+
+    for fmt in variant_formats():
+        encoder, options = VARIANT_FORMATS[fmt]
+        variants[fmt] = {}
+        for width in widths:
+            resized = source if width == source.width else source.resize(
+                (width, round(source.height * width / source.width)), Image.LANCZOS
+            )
+            buffer = io.BytesIO()
+            resized.save(buffer, encoder, **options)
+            content = buffer.getvalue()
+            digest = hashlib.sha256(content).hexdigest()[:16]
+            name = f'{settings.IMAGE_VARIANT_DIR}/{stem}-{width}w.{digest}.{fmt}'
+            # Identical bytes always get the same name, so an existing file can be reused as is.
+            if not default_storage.exists(name):
+                name = default_storage.save(name, ContentFile(content))
+            variants[fmt][str(width)] = name
+    return variants
+
+
+def generate_variants(model_label, pk):
+    """
+    Builds and stores the variants for one model instance (a Product or CustomDesign).
+    Runs as the images.generate_variants job (see schedule_variants); writes with a queryset update
+    so no save signals fire again. Errors propagate, so the job queue retries the job.
+    """
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).only('image', 'image_variants').first()
+    if instance is None or not needs_variants(instance):
+        return
+    # Deduplicated uploads share an image file, so another row may already have its variants.
+    variants = model.objects.filter(
+        image=instance.image.name, image_variants__source=instance.image.name
+    ).values_list('image_variants', flat=True).first()
+    variants = variants or build_variants(instance.image)
+    # Only store the result if the image was not replaced in the meantime.
+    model.objects.filter(pk=pk, image=instance.image.name).update(image_variants=variants)
+    if model_label == 'api.Product':
+        invalidate_products([pk])
+
+
+def schedule_variants(instance):
+    """
+    Queues variant generation for `instance` on the job queue (see api/jobs.py), so uploads don't block
+    the request. The job is part of the current transaction: it only exists if the upload commits, and
+    survives restarts until a `run_jobs` worker has done it.
+    """
+    enqueue('images.generate_variants', model_label=instance._meta.label, pk=instance.pk)
+
+
+def variant_urls(image_variants, request=None):
+    """
+    Turns a stored variant map into srcset strings per format plus a thumbnail URL:
+        {'webp': 'https://.../tee-320w.ab12.webp 320w, ...', 'avif': '...', 'thumbnail': 'https://...'}
+    Returns None when no variants have been generated yet.
+    """
+    def url(name):
+        location = default_storage.url(name)
+        return request.build_absolute_uri(location) if request is not None else location
+
+    srcset = {}
+    for fmt in VARIANT_FORMATS:
+        sizes = image_variants.get(fmt)
+        if sizes:
+            ordered = sorted(sizes.items(), key=lambda item: int(item[0]))
+            srcset[fmt] = ', '.join(f'{url(name)} {width}w' for width, name in ordered)
+            srcset.setdefault('thumbnail', url(ordered[0][1]))
+    return srcset or None
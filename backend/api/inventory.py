@@ -0,0 +1,55 @@
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Sum, When
+
+from .models import Product
+from .caching import invalidate_products
+
+
+class InsufficientStock(Exception):
+    """Raised when an order can no longer be fulfilled because a product ran out of stock."""
+
+
+def decrement_stock_for_order(order):
+    """
+    Takes the stock for every catalog product in `order` with a single conditional UPDATE:
+
+        UPDATE api_product SET stock = CASE id WHEN .. THEN stock - qty .. END
+        WHERE (id = .. AND stock >= qty) OR ..
+
+    The database does the read-modify-write, so concurrent payments cannot lose updates or
+    drive stock negative. If any product is short, the update is undone (in a savepoint) and
+    InsufficientStock is raised, naming only the products that are short and their actual stock.
+    Custom design items are made to order and carry no stock.
+    """
+    quantities = dict(
+        order.items.filter(product__isnull=False)
+        .values('product_id')
+        .annotate(total=Sum('quantity'))
+        .values_list('product_id', 'total')
+    )
+    if not quantities:
+        return
+
+    try:
+        with transaction.atomic():
+            updated = Product.objects.filter(
+                reduce(or_, (Q(id=product_id, stock__gte=quantity) for product_id, quantity in quantities.items()))
+            ).update(
+                stock=Case(*(When(id=product_id, then=F('stock') - quantity) for product_id, quantity in quantities.items()))
+            )
+            if updated != len(quantities):
+                raise InsufficientStock
+    except InsufficientStock:
+        # With the update rolled back, the stock read here is what the products really have.
+        short = Product.objects.filter(
+            reduce(or_, (Q(id=product_id, stock__lt=quantity) for product_id, quantity in quantities.items()))
+        ).values_list('name', 'stock')
+        raise InsufficientStock("Not enough stock for " + ", ".join(
+            f"{name} (only {stock} available)" for name, stock in short
+        ))
+
+    # Bulk updates skip the Product save signal, so invalidate the cached responses here.
+    invalidate_products(quantities)
@@ -0,0 +1,154 @@
+import logging
+import os
+import random
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, models
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Registered tasks by name: {'orders.send_payment_confirmation': (function, max_attempts)}.
+_tasks = {}
+
+
+def task(name, max_attempts=None):
+    """
+    Registers a function as a background task under `name`:
+
+        @task('orders.send_payment_confirmation')
+        def send_payment_confirmation(order_id): ...
+
+    Tasks are called with the job's payload as keyword arguments, so payloads must be JSON-serializable.
+    A task may run more than once (a worker can die after it finished), so it should be idempotent.
+    """
+    def register(func):
+        _tasks[name] = (func, max_attempts or settings.JOB_MAX_ATTEMPTS)
+        return func
+    return register
+
+
+def enqueue(name, **payload):
+    """
+    Adds a job to the queue. Call it inside the transaction that makes the change the job reacts to:
+    the row is only visible to workers once that transaction commits, and disappears if it rolls back.
+    """
+    _, max_attempts = _tasks[name]
+    return Job.objects.create(task=name, payload=payload, max_attempts=max_attempts)
+
+
+def enqueue_many(jobs):
+    """Adds several (name, payload) jobs with a single INSERT."""
+    return Job.objects.bulk_create([
+        Job(task=name, payload=payload, max_attempts=_tasks[name][1]) for name, payload in jobs
+    ])
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim_jobs(worker, limit):
+    """
+    Claims up to `limit` due jobs for `worker` and returns them.
+    Each job is claimed with a conditional UPDATE (status still QUEUED), so when several workers race
+    for the same job exactly one of them wins; this works on every database without row locks.
+    """
+    now = timezone.now()
+    candidates = list(
+        Job.objects.filter(status=Job.QUEUED, run_at__lte=now).order_by('run_at', 'id').values_list('id', flat=True)[:limit]
+    )
+    claimed = [
+        pk for pk in candidates
+        if Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+            status=Job.RUNNING, locked_by=worker, locked_at=now, attempts=models.F('attempts') + 1
+        )
+    ]
+    return list(Job.objects.filter(pk__in=claimed).order_by('run_at', 'id'))
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter: about JOB_RETRY_BACKOFF * 2^(attempts - 1) seconds."""
+    base = settings.JOB_RETRY_BACKOFF * 2 ** (attempts - 1)
+    return timedelta(seconds=min(base, settings.JOB_RETRY_MAX_BACKOFF) * random.uniform(0.5, 1.0))
+
+
+def run_job(job):
+    """Runs one claimed job and records the outcome: succeeded, queued for a retry, or dead."""
+    registered = _tasks.get(job.task)
+    try:
+        if registered is None:
+            raise LookupError(f"No task registered as {job.task!r}")
+        registered[0](**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            logger.error("Job #%s (%s) failed %s times; marking it dead.\n%s", job.pk, job.task, job.attempts, error)
+            Job.objects.filter(pk=job.pk).update(status=Job.DEAD, last_error=error, finished_at=timezone.now())
+        else:
+            logger.warning("Job #%s (%s) failed (attempt %s/%s); will retry.", job.pk, job.task, job.attempts, job.max_attempts)
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.QUEUED, last_error=error, locked_by='', locked_at=None,
+                run_at=timezone.now() + retry_delay(job.attempts),
+            )
+        return False
+    Job.objects.filter(pk=job.pk).update(status=Job.SUCCEEDED, finished_at=timezone.now())
+    return True
+
+
+def requeue_stale_jobs():
+    """
+    Puts jobs back in the queue whose worker died mid-run (RUNNING for longer than JOB_LOCK_TIMEOUT).
+    The interrupted attempt still counts towards max_attempts: a job that has used them all is marked dead
+    in the same UPDATE instead, so a task that keeps killing its worker isn't retried forever.
+    Returns the number of stale jobs found (requeued or dead).
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT)
+    exhausted = models.Q(attempts__gte=models.F('max_attempts'))
+    return Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff).update(
+        status=models.Case(models.When(exhausted, then=models.Value(Job.DEAD)), default=models.Value(Job.QUEUED)),
+        last_error=models.Case(
+            models.When(exhausted, then=models.Value(f"Worker lost after the last attempt (locked for over {settings.JOB_LOCK_TIMEOUT}s).")),
+            default=models.F('last_error'), output_field=models.TextField(),
+        ),
+        finished_at=models.Case(models.When(exhausted, then=models.Value(now)), default=None),
+        locked_by='', locked_at=None, run_at=now,
+    )
+
+
+def run_pending(worker=None, limit=None):
+    """Claims and runs every job that is due now. Returns the number of jobs run."""
+    worker = worker or worker_name()
+    batch = limit or settings.JOB_BATCH_SIZE
+    count = 0
+    while True:
+        jobs = claim_jobs(worker, batch)
+        for job in jobs:
+            run_job(job)
+        count += len(jobs)
+        if len(jobs) < batch:
+            return count
+
+
+def work(poll_interval=None, burst=False, should_stop=lambda: False):
+    """
+    The worker loop: runs due jobs, requeues stale ones and sleeps `poll_interval` seconds when idle.
+    With burst=True it returns as soon as the queue has no due jobs left.
+    """
+    poll_interval = settings.JOB_POLL_INTERVAL if poll_interval is None else poll_interval
+    worker = worker_name()
+    while not should_stop():
+        close_old_connections()
+        requeue_stale_jobs()
+        ran = run_pending(worker)
+        if burst and not ran:
+            return
+        if not ran:
+            time.sleep(poll_interval)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from api.rollups import rebuild_order_stats, rebuild_product_sales
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the OrderStatsRollup table (per day/hour/status order counts and revenue) and the "
+        "product sales counters (units sold and revenue per product and day) from all orders."
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild_order_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} order stats rollup rows."))
+        count = rebuild_product_sales()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} product sales rollup rows."))
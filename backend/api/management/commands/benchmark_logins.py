@@ -0,0 +1,110 @@
+import logging
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.test import override_settings
+
+from api import passwords
+
+BENCHMARK_USERNAME = 'benchmark-login'
+BENCHMARK_PASSWORD = 'benchmark-password'
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks POST /api/auth/login/ through the WSGI application from a pool of client threads, with "
+        "password hashing on the request threads and in the hashing pool (api/passwords.py). Reports "
+        "successful logins per second per core used for hashing, logins refused because the pool was "
+        "full, and the latency of a cheap product request sent during the burst, i.e. how much the hashing "
+        "slows the rest of the API. Rate limits are disabled for the run. Creates a temporary user, which "
+        "is deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=100, help="Number of logins per run.")
+        parser.add_argument('--threads', type=int, default=16, help="Client threads (as in a threaded WSGI server).")
+        parser.add_argument('--workers', type=int, default=settings.PASSWORD_HASHER_WORKERS, help="Hashing pool processes.")
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(BENCHMARK_USERNAME, password=BENCHMARK_PASSWORD)
+        unlimited = {'LOGIN_IP_BURST': 10 ** 9, 'LOGIN_USERNAME_BURST': 10 ** 9}
+        cores = os.cpu_count() or 1
+        runs = [
+            ("request threads", 0, min(options['threads'], cores)),
+            (f"pool ({options['workers']} workers)", options['workers'], min(options['workers'], cores)),
+        ]
+        app = get_wsgi_application()  # Sets up logging, so before silencing the request logger.
+        # Refused logins would log a warning each.
+        request_logger = logging.getLogger('django.request')
+        level = request_logger.level
+        request_logger.setLevel(logging.ERROR)
+        try:
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"\n{options['logins']} logins from {options['threads']} threads, {cores} CPU core(s)"
+            ))
+            for label, workers, hashing_cores in runs:
+                with override_settings(**unlimited, PASSWORD_HASHER_WORKERS=workers, PASSWORD_HASHER_MAX_PENDING=max(workers, 1) * 4):
+                    passwords.reset_limiters()
+                    passwords.shutdown_pool()
+                    if workers:
+                        self.warm_up(workers)
+                    self.report(label, hashing_cores, self.run(app, options['logins'], options['threads']))
+        finally:
+            request_logger.setLevel(level)
+            passwords.shutdown_pool()
+            passwords.reset_limiters()
+            user.delete()
+
+    def warm_up(self, workers):
+        # Start the pool's processes before timing, as a long-running server would have.
+        pool, _ = passwords._get_pool()
+        list(pool.map(make_password, ['warm-up'] * workers))
+
+    def run(self, app, logins, threads):
+        client = httpx.Client(transport=httpx.WSGITransport(app=app), base_url='http://localhost')
+        done = threading.Event()
+        probe_latencies = []
+
+        def login(_):
+            response = client.post('/api/auth/login/', json={'username': BENCHMARK_USERNAME, 'password': BENCHMARK_PASSWORD})
+            return response.status_code
+
+        def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                client.get('/api/products/', params={'page_size': 1})
+                probe_latencies.append(time.perf_counter() - start)
+                time.sleep(0.01)
+
+        with client, ThreadPoolExecutor(max_workers=threads) as pool:
+            prober = threading.Thread(target=probe)
+            start = time.perf_counter()
+            prober.start()
+            codes = list(pool.map(login, range(logins)))
+            elapsed = time.perf_counter() - start
+            done.set()
+            prober.join()
+        return codes, elapsed, probe_latencies
+
+    def report(self, label, hashing_cores, run):
+        codes, elapsed, probe_latencies = run
+        rate = codes.count(200) / elapsed
+        # 503: no hashing slot within PASSWORD_HASHER_QUEUE_TIMEOUT, i.e. load shed by the pool bound.
+        refused = codes.count(503)
+        failures = len(codes) - codes.count(200) - refused
+        probes = sorted(probe_latencies)
+        p95 = probes[max(0, int(len(probes) * 0.95) - 1)]
+        self.stdout.write(
+            f"  {label:<22} {rate:7.1f} logins/s  {rate / hashing_cores:7.1f} /s/core  "
+            f"other API p50 {statistics.median(probes) * 1000:6.1f} ms  p95 {p95 * 1000:6.1f} ms  "
+            f"refused {refused}  failures {failures}"
+        )
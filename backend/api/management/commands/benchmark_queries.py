@@ -0,0 +1,143 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.models import Product, Order
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a large synthetic dataset, then prints the EXPLAIN plan and timing of the hot "
+        "catalog/order queries without and with the model indexes. Everything runs in one "
+        "transaction that is rolled back, so the database is left untouched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100_000, help="Number of synthetic products.")
+        parser.add_argument('--orders', type=int, default=200_000, help="Number of synthetic orders.")
+        parser.add_argument('--customers', type=int, default=1_000, help="Number of synthetic customers.")
+        parser.add_argument('--repeat', type=int, default=5, help="Timed runs per query (the best one is reported).")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options['products'], options['orders'], options['customers'])
+            queries = self.hot_queries()
+
+            self.set_indexes(enabled=False)
+            before = self.run_queries(queries, options['repeat'], label="without indexes")
+            self.set_indexes(enabled=True)
+            after = self.run_queries(queries, options['repeat'], label="with indexes")
+
+            self.stdout.write(self.style.MIGRATE_HEADING("\nSummary (best of %d runs)" % options['repeat']))
+            for name in queries:
+                speedup = before[name] / after[name] if after[name] else float('inf')
+                self.stdout.write(
+                    f"  {name:<28} {before[name] * 1000:9.2f} ms -> {after[name] * 1000:9.2f} ms  ({speedup:.1f}x)"
+                )
+
+            # Discard the synthetic data.
+            transaction.set_rollback(True)
+
+    def seed(self, product_count, order_count, customer_count):
+        self.stdout.write(f"Seeding {product_count} products, {order_count} orders, {customer_count} customers...")
+        rng = random.Random(42)
+        now = timezone.now()
+        statuses = [choice for choice, _ in Order.STATUS_CHOICES]
+
+        users = User.objects.bulk_create(
+            [User(username=f'bench-user-{i}', password='!') for i in range(customer_count)],
+            batch_size=1000,
+        )
+        # bulk_create skips the save signals, so neither the search index nor the rollups are touched.
+        Product.objects.bulk_create(
+            [
+                Product(
+                    name=f"Bench Tee {i}",
+                    description="Synthetic benchmark product",
+                    price=Decimal(rng.randint(300, 3000)),
+                    stock=rng.randint(0, 500),
+                    image='products/bench.png',
+                    is_featured=rng.random() < 0.02,
+                    is_trending=rng.random() < 0.02,
+                    is_bestseller=rng.random() < 0.02,
+                )
+                for i in range(product_count)
+            ],
+            batch_size=2000,
+        )
+        # auto_now_add ignores explicit values on insert, so spread created_at out afterwards.
+        self.spread_created_at(Product, days=365 * 2, rng=rng)
+
+        Order.objects.bulk_create(
+            [
+                Order(
+                    customer=rng.choice(users),
+                    total_price=Decimal(rng.randint(300, 10000)),
+                    status=rng.choice(statuses),
+                )
+                for _ in range(order_count)
+            ],
+            batch_size=2000,
+        )
+        self.spread_created_at(Order, days=365 * 2, rng=rng)
+        self.benchmark_customer = users[0]
+        self.now = now
+
+    def spread_created_at(self, model, days, rng):
+        table = connection.ops.quote_name(model._meta.db_table)
+        now = timezone.now()
+        ids = list(model.objects.values_list('id', flat=True))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"UPDATE {table} SET created_at = %s WHERE id = %s",
+                [(now - timedelta(seconds=rng.randint(0, days * 86400)), pk) for pk in ids],
+            )
+
+    def hot_queries(self):
+        since = self.now - timedelta(days=30)
+        return {
+            'product list (newest)': Product.objects.order_by('-created_at', '-id')[:24],
+            'featured products': Product.objects.filter(is_featured=True).order_by('-created_at', '-id')[:24],
+            'trending products': Product.objects.filter(is_trending=True).order_by('-created_at', '-id')[:24],
+            'low stock products': Product.objects.filter(stock__lt=10).order_by('stock'),
+            'customer order history': Order.objects.filter(customer=self.benchmark_customer).order_by('-created_at')[:20],
+            'orders by status': Order.objects.filter(status__in=['SHIPPED', 'DELIVERED']).order_by('-created_at')[:50],
+            'orders in last 30 days': Order.objects.filter(created_at__gte=since).order_by('-created_at')[:50],
+        }
+
+    def set_indexes(self, enabled):
+        # The schema editor context manager can't run inside a transaction on SQLite,
+        # so only use it to generate the CREATE INDEX statements and execute them directly.
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model in (Product, Order):
+                for index in model._meta.indexes:
+                    if enabled:
+                        cursor.execute(str(index.create_sql(model, editor)))
+                    else:
+                        cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+    def run_queries(self, queries, repeat, label):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\nQuery plans {label}"))
+        timings = {}
+        for name, queryset in queries.items():
+            self.stdout.write(self.style.MIGRATE_LABEL(f"  {name}"))
+            for line in queryset.explain().splitlines():
+                self.stdout.write(f"    {line}")
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(queryset.all())
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[name] = best
+        return timings
@@ -0,0 +1,161 @@
+import hashlib
+import io
+import hmac
+import logging
+import queue
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from pathlib import Path
+
+import httpx
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import override_settings
+
+from api.authentication import VersionedRefreshToken
+from api.fake_gateway import FakeGateway
+from api.gateway import reset_gateway
+from api.models import Product
+from ecommerce_project.database import sqlite_tuning_options
+
+PROFILES = [
+    # (label, OPTIONS, whether the database is switched to WAL with enable_sqlite_wal)
+    # Django's SQLite defaults: rollback journal, deferred transactions.
+    ("Django defaults", {}, False),
+    ("tuned (WAL, IMMEDIATE)", sqlite_tuning_options(), True),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks concurrent checkouts on SQLite through the WSGI application: each writer thread places an "
+        "order (POST /api/orders/), creates its payment order against a local stub gateway and verifies the "
+        "payment, i.e. the three write transactions of a checkout. Runs once with Django's SQLite defaults and "
+        "once with the tuning profile of ecommerce_project/database.py (and WAL), each on a fresh database in a temporary "
+        "directory (the configured database is not touched), and reports checkouts per second, latency and "
+        "requests that failed, with how many of them on 'database is locked'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--checkouts', type=int, default=200, help="Number of checkouts per run.")
+        parser.add_argument('--writers', type=int, default=8, help="Concurrent writer threads (as in a threaded WSGI server).")
+
+    def handle(self, *args, **options):
+        settings_dict = connections[DEFAULT_DB_ALIAS].settings_dict
+        if settings_dict['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError("The default database is not SQLite.")
+        original = settings_dict['NAME'], settings_dict['OPTIONS']
+        gateway = FakeGateway().start()
+        app = get_wsgi_application()  # Sets up logging, so before silencing the request logger.
+        # Every failed request would log its traceback.
+        request_logger = logging.getLogger('django.request')
+        level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        directory = Path(tempfile.mkdtemp())
+        try:
+            # Migrate once, then give every run its own copy, so they start from the same state.
+            template = directory / 'template.sqlite3'
+            self.use_database(settings_dict, template, {})
+            call_command('migrate', verbosity=0, interactive=False)
+            connections.close_all()
+
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"\n{options['checkouts']} checkouts from {options['writers']} writer threads"
+            ))
+            with override_settings(RAZORPAY_API_URL=gateway.url, RAZORPAY_MAX_CONNECTIONS=options['writers']):
+                for index, (label, profile, wal) in enumerate(PROFILES):
+                    path = directory / f'run-{index}.sqlite3'
+                    shutil.copy(template, path)
+                    self.use_database(settings_dict, path, profile)
+                    if wal:
+                        call_command('enable_sqlite_wal', stdout=io.StringIO())
+                    cache.clear()
+                    reset_gateway()
+                    self.report(label, self.run(app, options['checkouts'], options['writers']))
+        finally:
+            request_logger.setLevel(level)
+            self.use_database(settings_dict, *original)
+            reset_gateway()
+            gateway.stop()
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def use_database(self, settings_dict, name, options):
+        # Like the test runner: repoint the connection settings, and reconnect on next use.
+        connections.close_all()
+        settings_dict['NAME'] = name
+        settings_dict['OPTIONS'] = options
+
+    def run(self, app, checkouts, writers):
+        user = User.objects.create(username='benchmark-customer')
+        products = [
+            Product.objects.create(name=f"Benchmark tee {i}", description="Cotton tee", price=Decimal('499.00'), stock=10 ** 6)
+            for i in range(3)
+        ]
+        headers = {'Authorization': f'Bearer {VersionedRefreshToken.for_user(user).access_token}'}
+        items = [{'product_id': product.id, 'quantity': 1, 'price': '0'} for product in products]
+        connections.close_all()
+
+        def checkout(client):
+            """Returns the failed response, if any, and the checkout's latency."""
+            start = time.perf_counter()
+            response = client.post('/api/orders/', json={'items': items}, headers=headers)
+            if response.status_code != 201:
+                return response, time.perf_counter() - start
+            response = client.post('/api/payment/create-order/', json={'order_id': response.json()['id']}, headers=headers)
+            if response.status_code != 200:
+                return response, time.perf_counter() - start
+            razorpay_order_id = response.json()['razorpay_order_id']
+            payment_id = f'pay_{razorpay_order_id}'
+            signature = hmac.new(
+                settings.RAZORPAY_KEY_SECRET.encode(), f'{razorpay_order_id}|{payment_id}'.encode(), hashlib.sha256,
+            ).hexdigest()
+            response = client.post('/api/payment/verify/', json={
+                'razorpay_order_id': razorpay_order_id, 'razorpay_payment_id': payment_id, 'razorpay_signature': signature,
+            }, headers=headers)
+            return (response if response.status_code != 200 else None), time.perf_counter() - start
+
+        pending = queue.SimpleQueue()
+        for _ in range(checkouts):
+            pending.put(None)
+        results = []
+
+        def writer():
+            try:
+                with httpx.Client(transport=httpx.WSGITransport(app=app), base_url='http://localhost') as client:
+                    while True:
+                        try:
+                            pending.get_nowait()
+                        except queue.Empty:
+                            return
+                        results.append(checkout(client))
+            finally:
+                connections.close_all()  # This thread's connection, before the next run swaps the database.
+
+        threads = [threading.Thread(target=writer) for _ in range(writers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, time.perf_counter() - start
+
+    def report(self, label, run):
+        results, elapsed = run
+        failed = [response for response, _ in results if response is not None]
+        locked = sum(1 for response in failed if b'database is locked' in response.content)
+        latencies = sorted(latency for response, latency in results if response is None) or [0.0]
+        p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+        self.stdout.write(
+            f"  {label:<24} {(len(results) - len(failed)) / elapsed:7.1f} checkouts/s  "
+            f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms  "
+            f"failed {len(failed)} (database is locked: {locked})"
+        )
@@ -0,0 +1,92 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import Product, CustomDesign, DesignPreview, ImageBlob
+from api.storage import image_storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes content-addressed image files that no product, custom design or design preview uses any more, "
+        "and image variants whose source image is gone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=int, default=24,
+            help="Keep unreferenced blobs for this long (an upload may still be waiting for its row to be saved).",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be deleted.")
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        self.recount_references()
+
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        orphans = ImageBlob.objects.filter(ref_count=0, updated_at__lt=cutoff)
+        if dry_run:
+            deleted = list(orphans.values_list('name', 'size'))
+        else:
+            storage = image_storage()
+            deleted = []
+            for pk, name, size in list(orphans.values_list('pk', 'name', 'size')):
+                # Delete the row first, and only while it is still unreferenced: if ImageBlob.acquire() took a
+                # reference since the query above, the row survives and so does the file.
+                removed, _ = ImageBlob.objects.filter(pk=pk, ref_count=0).delete()
+                if removed:
+                    if storage.exists(name):
+                        storage.delete(name)
+                    deleted.append((name, size))
+        freed = sum(size for _, size in deleted)
+        self.stdout.write(f"{'Would delete' if dry_run else 'Deleted'} {len(deleted)} orphaned image blobs ({freed} bytes).")
+
+        stale_variants = self.unreferenced_variants(cutoff)
+        if not dry_run:
+            for name in stale_variants:
+                default_storage.delete(name)
+        self.stdout.write(f"{'Would delete' if dry_run else 'Deleted'} {len(stale_variants)} unreferenced image variants.")
+
+    def recount_references(self):
+        """
+        Recomputes every blob's reference count from the rows that use it, correcting any drift
+        (e.g. uploads whose row was never saved, or rows pointed at a file without an upload).
+        """
+        references = Counter()
+        for model in (Product, CustomDesign, DesignPreview):
+            references.update(model.objects.values_list('image', flat=True).iterator())
+
+        changed = []
+        for blob in ImageBlob.objects.only('name', 'ref_count').iterator():
+            count = references.get(blob.name, 0)
+            if blob.ref_count != count:
+                blob.ref_count = count
+                changed.append(blob)
+        # Saving updated_at restarts the grace period of blobs that just became unreferenced.
+        for blob in changed:
+            ImageBlob.objects.filter(pk=blob.pk).update(ref_count=blob.ref_count, updated_at=timezone.now())
+        if changed:
+            self.stdout.write(f"Corrected the reference count of {len(changed)} image blobs.")
+
+    def unreferenced_variants(self, cutoff):
+        referenced = set()
+        for model in (Product, CustomDesign):
+            for variants in model.objects.values_list('image_variants', flat=True).iterator():
+                for fmt, sizes in variants.items():
+                    if isinstance(sizes, dict):
+                        referenced.update(sizes.values())
+
+        directory = settings.IMAGE_VARIANT_DIR
+        if not default_storage.exists(directory):
+            return []
+        _, files = default_storage.listdir(directory)
+        # Skip recent files: their variant map may not have been saved yet.
+        return [
+            f'{directory}/{name}' for name in files
+            if f'{directory}/{name}' not in referenced
+            and default_storage.get_modified_time(f'{directory}/{name}') < cutoff
+        ]
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from ecommerce_project.database import SQLITE_JOURNAL_MODE
+
+
+class Command(BaseCommand):
+    help = (
+        "Switches an SQLite database to write-ahead logging (SQLITE_JOURNAL_MODE in ecommerce_project/database.py), "
+        "so readers and the writer stop blocking each other. The journal mode is stored in the database file, so "
+        "this is run once per database (e.g. at deploy, after migrate), not on every connection."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help="The database to switch (default: 'default').")
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"The {options['database']!r} database is not SQLite.")
+        with connection.cursor() as cursor:
+            # Can't change inside a transaction; this connection is in autocommit mode here.
+            cursor.execute(f'PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}')
+            mode = cursor.fetchone()[0]
+        if mode.upper() != SQLITE_JOURNAL_MODE:
+            raise CommandError(f"SQLite kept the {mode!r} journal mode (in-memory databases can't use {SQLITE_JOURNAL_MODE}).")
+        self.stdout.write(self.style.SUCCESS(f"The {options['database']!r} database now uses the {mode.upper()} journal mode."))
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.designs import evict_previews
+
+
+class Command(BaseCommand):
+    help = (
+        "Evicts the least recently used design previews until the preview cache fits its size bounds. "
+        "Run cleanup_orphaned_images afterwards to delete image files nothing references any more."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-entries', type=int, default=settings.DESIGN_PREVIEW_CACHE_MAX_ENTRIES,
+            help="Keep at most this many previews.",
+        )
+        parser.add_argument(
+            '--max-bytes', type=int, default=settings.DESIGN_PREVIEW_CACHE_MAX_BYTES,
+            help="Keep at most this many bytes of preview images.",
+        )
+
+    def handle(self, *args, **options):
+        evicted = evict_previews(max_entries=options['max_entries'], max_bytes=options['max_bytes'])
+        self.stdout.write(self.style.SUCCESS(f"Evicted {evicted} design previews."))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from api.images import generate_variants, needs_variants
+from api.models import Product, CustomDesign
+
+
+class Command(BaseCommand):
+    help = "Generates the resized WebP/AVIF image variants for products and custom designs that don't have them yet."
+
+    def handle(self, *args, **options):
+        for model in (Product, CustomDesign):
+            pending = [
+                instance.pk
+                for instance in model.objects.only('image', 'image_variants').iterator()
+                if needs_variants(instance)
+            ]
+            failed = 0
+            for pk in pending:
+                try:
+                    generate_variants(model._meta.label, pk)
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"Could not generate variants for {model._meta.verbose_name} #{pk}: {e}")
+            self.stdout.write(self.style.SUCCESS(
+                f"Generated variants for {len(pending) - failed} {model._meta.verbose_name_plural}."
+            ))
@@ -0,0 +1,105 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import httpx
+from django.contrib.auth.models import User
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.test import override_settings
+
+from api.authentication import VersionedRefreshToken
+from api.fake_gateway import FakeGateway
+from api.gateway import reset_gateway
+from api.models import Order
+
+LOADTEST_USERNAME = 'loadtest-customer'
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests POST /api/payment/create-order/ against a local stub gateway with artificial latency, "
+        "served by the ASGI application (one event loop) and by the WSGI application (a fixed pool of "
+        "worker threads), and compares their throughput. Creates a temporary customer and orders, "
+        "which are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Number of checkouts per run.")
+        parser.add_argument('--concurrency', type=int, default=100, help="Concurrent in-flight requests for the ASGI run.")
+        parser.add_argument('--threads', type=int, default=8, help="Worker threads for the WSGI run (as in a threaded WSGI server).")
+        parser.add_argument('--latency', type=float, default=0.2, help="Artificial gateway latency in seconds.")
+
+    def handle(self, *args, **options):
+        gateway = FakeGateway(latency=options['latency']).start()
+        user, _ = User.objects.get_or_create(username=LOADTEST_USERNAME)
+        try:
+            # Created one by one (not bulk_create) so the order stats rollups stay consistent on cleanup.
+            order_ids = [Order.objects.create(customer=user, total_price=Decimal('499.00')).pk for _ in range(options['requests'])]
+            token = str(VersionedRefreshToken.for_user(user).access_token)
+            # Let the pool hold every in-flight gateway call, so the gateway latency is what's measured.
+            with override_settings(RAZORPAY_API_URL=gateway.url, RAZORPAY_MAX_CONNECTIONS=options['concurrency']):
+                reset_gateway()
+                asgi = self.run_asgi(order_ids, token, options['concurrency'])
+                Order.objects.filter(pk__in=order_ids).update(razorpay_order_id=None)
+                wsgi = self.run_wsgi(order_ids, token, options['threads'])
+        finally:
+            reset_gateway()
+            gateway.stop()
+            user.delete()
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"\n{options['requests']} checkouts, gateway latency {options['latency'] * 1000:.0f} ms"
+        ))
+        self.report(f"ASGI ({options['concurrency']} concurrent)", asgi)
+        self.report(f"WSGI ({options['threads']} threads)", wsgi)
+
+    def run_asgi(self, order_ids, token, concurrency):
+        async def run():
+            limit = asyncio.Semaphore(concurrency)
+            transport = httpx.ASGITransport(app=get_asgi_application())
+            async with httpx.AsyncClient(transport=transport, base_url='http://localhost') as client:
+                async def checkout(order_id):
+                    async with limit:
+                        start = time.perf_counter()
+                        response = await client.post(
+                            '/api/payment/create-order/', json={'order_id': order_id},
+                            headers={'Authorization': f'Bearer {token}'},
+                        )
+                        return response.status_code, time.perf_counter() - start
+
+                start = time.perf_counter()
+                results = await asyncio.gather(*(checkout(order_id) for order_id in order_ids))
+                return results, time.perf_counter() - start
+
+        return asyncio.run(run())
+
+    def run_wsgi(self, order_ids, token, threads):
+        client = httpx.Client(transport=httpx.WSGITransport(app=get_wsgi_application()), base_url='http://localhost')
+
+        def checkout(order_id):
+            start = time.perf_counter()
+            response = client.post(
+                '/api/payment/create-order/', json={'order_id': order_id},
+                headers={'Authorization': f'Bearer {token}'},
+            )
+            return response.status_code, time.perf_counter() - start
+
+        with client, ThreadPoolExecutor(max_workers=threads) as pool:
+            start = time.perf_counter()
+            results = list(pool.map(checkout, order_ids))
+            return results, time.perf_counter() - start
+
+    def report(self, label, run):
+        results, elapsed = run
+        latencies = sorted(latency for _, latency in results)
+        failures = sum(1 for code, _ in results if code != 200)
+        p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+        self.stdout.write(
+            f"  {label:<22} {len(results) / elapsed:8.1f} req/s  "
+            f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms  "
+            f"wall {elapsed:6.2f} s  failures {failures}"
+        )
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import CustomDesign
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes custom designs that were never added to an order. Their snapshot files are shared "
+        "content-addressed blobs, removed by cleanup_orphaned_images once nothing references them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.CUSTOM_DESIGN_RETENTION_DAYS,
+            help="Only purge designs older than this many days.",
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Report how many designs would be purged without deleting anything.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        abandoned = CustomDesign.objects.filter(created_at__lt=cutoff, order_items__isnull=True)
+
+        if options['dry_run']:
+            self.stdout.write(f"{abandoned.count()} abandoned custom designs would be purged.")
+            return
+
+        # The files may still be used by other designs or cached previews, so only the rows are
+        # deleted here; post_delete releases each image reference.
+        deleted, _ = abandoned.delete()
+
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} abandoned custom designs."))
@@ -0,0 +1,57 @@
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+
+from api.jobs import work
+from api.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs background job queue workers. Jobs that keep failing end up in the DEAD state; "
+        "use --requeue-dead to give them another round of attempts once the cause is fixed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help="Number of worker processes to run.")
+        parser.add_argument('--poll-interval', type=float, default=None, help="Seconds to wait when the queue is empty.")
+        parser.add_argument('--burst', action='store_true', help="Exit once there are no due jobs left.")
+        parser.add_argument('--requeue-dead', action='store_true', help="Requeue every dead job, then exit.")
+
+    def handle(self, *args, **options):
+        if options['requeue_dead']:
+            count = Job.objects.filter(status=Job.DEAD).update(
+                status=Job.QUEUED, attempts=0, run_at=timezone.now(), finished_at=None
+            )
+            self.stdout.write(self.style.SUCCESS(f"Requeued {count} dead jobs."))
+            return
+
+        kwargs = {'poll_interval': options['poll_interval'], 'burst': options['burst']}
+        if options['processes'] <= 1:
+            self.run_worker(**kwargs)
+            return
+
+        # Forked children must not share the parent's database connections.
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=self.run_worker, kwargs=kwargs, daemon=True)
+            for _ in range(options['processes'])
+        ]
+        for process in workers:
+            process.start()
+        self.stdout.write(f"Started {len(workers)} job workers.")
+        try:
+            for process in workers:
+                process.join()
+        except KeyboardInterrupt:
+            for process in workers:
+                process.terminate()
+
+    def run_worker(self, poll_interval, burst):
+        stopping = []
+        # Finish the current job on SIGTERM instead of dying halfway through it.
+        signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+        work(poll_interval=poll_interval, burst=burst, should_stop=lambda: bool(stopping))
@@ -0,0 +1,276 @@
+import cProfile
+import io
+import pstats
+import threading
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException
+from rest_framework.fields import empty
+
+from .authentication import ClaimsJWTAuthentication
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# The measurements of the request being handled. Copied into the threads of sync_to_async calls,
+# so the queries and serializers run there are counted too.
+_current = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    """What one request spent: database queries and their time, and time in serializers."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper, installed on every connection (see api/signals.py), that counts and times queries."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += perf_counter() - start
+
+
+def install_query_recorder(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedSerializerMixin:
+    """
+    Adds a serializer's representation and validation time to the request's metrics. Only the outermost
+    serializer is timed, so nested ones aren't counted twice. Queries made while serializing count in both
+    the serializer and the database time.
+    """
+
+    def to_representation(self, instance):
+        return self._timed(super().to_representation, instance)
+
+    def run_validation(self, data=empty):
+        return self._timed(super().run_validation, data)
+
+    def _timed(self, method, *args):
+        stats = _current.get()
+        if stats is None or stats.serializer_depth:
+            return method(*args)
+        stats.serializer_depth += 1
+        start = perf_counter()
+        try:
+            return method(*args)
+        finally:
+            stats.serializer_depth -= 1
+            stats.serializer_time += perf_counter() - start
+
+
+class RequestMetrics:
+    """
+    Per-view request metrics of this worker process, in the Prometheus text format: request counts and
+    a latency histogram, and the totals of database queries, database time, serializer time and response
+    bytes (divide by the request count for per-request averages). Series are labelled by URL name
+    (e.g. `product-list`), method and status code.
+    """
+
+    COUNTERS = [
+        ('http_request_db_queries_total', 'queries', "Database queries run by requests."),
+        ('http_request_db_seconds_total', 'db_time', "Time spent in database queries."),
+        ('http_request_serializer_seconds_total', 'serializer_time', "Time spent in serializers."),
+        ('http_response_size_bytes_total', 'response_bytes', "Response body bytes (streamed responses excluded)."),
+    ]
+
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self._series = {}  # (view, method, status): {'count', 'duration', 'buckets', *COUNTERS}
+        self._lock = threading.Lock()
+
+    def observe(self, view, method, status, duration, stats, response_bytes):
+        with self._lock:
+            series = self._series.get((view, method, status))
+            if series is None:
+                series = self._series[(view, method, status)] = {
+                    'count': 0, 'duration': 0.0, 'buckets': [0] * len(self.buckets),
+                    'queries': 0, 'db_time': 0.0, 'serializer_time': 0.0, 'response_bytes': 0,
+                }
+            series['count'] += 1
+            series['duration'] += duration
+            for index, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    series['buckets'][index] += 1
+            series['queries'] += stats.queries
+            series['db_time'] += stats.db_time
+            series['serializer_time'] += stats.serializer_time
+            series['response_bytes'] += response_bytes
+
+    def render(self):
+        with self._lock:
+            series = sorted((key, {**values, 'buckets': list(values['buckets'])}) for key, values in self._series.items())
+        lines = [
+            "# HELP http_request_duration_seconds Request wall time, from this middleware to the response.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (view, method, status), values in series:
+            labels = f'view="{_escape(view)}",method="{method}",status="{status}"'
+            for bound, count in zip(self.buckets, values['buckets']):
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {values["count"]}')
+            lines.append(f'http_request_duration_seconds_sum{{{labels}}} {values["duration"]:.6f}')
+            lines.append(f'http_request_duration_seconds_count{{{labels}}} {values["count"]}')
+        for name, key, help_text in self.COUNTERS:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (view, method, status), values in series:
+                value = values[key]
+                value = f'{value:.6f}' if isinstance(value, float) else value
+                lines.append(f'{name}{{view="{_escape(view)}",method="{method}",status="{status}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = RequestMetrics(settings.REQUEST_METRICS_BUCKETS)
+        return _metrics
+
+
+def reset_metrics():
+    """Forgets every series (tests, or after changing REQUEST_METRICS_BUCKETS)."""
+    global _metrics
+    with _metrics_lock:
+        _metrics = None
+
+
+# --- Profiling ---
+
+PROFILE_SORT_KEYS = ('cumulative', 'tottime', 'calls')
+
+# cProfile can only profile one request at a time (Python 3.12+ allows a single active profiler).
+_profile_lock = threading.Lock()
+
+
+def wants_profile(request):
+    """`?profile=1` from a staff user, by session or by access token."""
+    if request.GET.get('profile') != '1':
+        return False
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_staff:
+        return True
+    try:
+        authenticated = ClaimsJWTAuthentication().authenticate(request)
+    except APIException:
+        return False
+    return authenticated is not None and authenticated[0].is_staff
+
+
+def profile_report(request, response, duration, stats, profiler):
+    """The profiled request's measurements and its cProfile statistics, as a plain-text response."""
+    sort = request.GET.get('profile_sort', 'cumulative')
+    output = io.StringIO()
+    output.write(
+        f"{request.method} {request.get_full_path()} -> {response.status_code} ({_view_name(request)})\n"
+        f"wall {duration * 1000:.1f} ms, {stats.queries} queries in {stats.db_time * 1000:.1f} ms, "
+        f"serializers {stats.serializer_time * 1000:.1f} ms, response {_response_bytes(response)} bytes\n\n"
+    )
+    pstats.Stats(profiler, stream=output).strip_dirs().sort_stats(
+        sort if sort in PROFILE_SORT_KEYS else 'cumulative'
+    ).print_stats(settings.REQUEST_PROFILE_ROWS)
+    return HttpResponse(output.getvalue(), content_type='text/plain; charset=utf-8')
+
+
+def profile_busy_response():
+    return HttpResponse("Another request is being profiled; try again.\n", status=409, content_type='text/plain; charset=utf-8')
+
+
+def _view_name(request):
+    match = request.resolver_match
+    return match.view_name if match is not None else '<unmatched>'
+
+
+def _response_bytes(response):
+    return 0 if response.streaming else len(response.content)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records every request's wall time, database queries and time, serializer time and response size per
+    URL name in the RequestMetrics (exposed at /api/admin/metrics/). The wall time of a streamed response
+    ends when streaming starts.
+
+    With `?profile=1`, a staff user gets a cProfile breakdown of the request instead of its response
+    (`&profile_sort=tottime` or `calls` to sort it differently); profiled requests are not recorded.
+    Under ASGI only the event loop thread is profiled, not the work done in sync_to_async threads.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile = wants_profile(request)
+        if profile and not _profile_lock.acquire(blocking=False):
+            return profile_busy_response()
+        stats = RequestStats()
+        token = _current.set(stats)
+        profiler = cProfile.Profile() if profile else None
+        start = perf_counter()
+        try:
+            if profiler:
+                profiler.enable()
+            response = self.get_response(request)
+        finally:
+            if profiler:
+                profiler.disable()
+                _profile_lock.release()
+            _current.reset(token)
+        return self.finish(request, response, perf_counter() - start, stats, profiler)
+
+    async def __acall__(self, request):
+        # The staff check may query the session or the token version, so only when asked to profile.
+        profile = request.GET.get('profile') == '1' and await sync_to_async(wants_profile)(request)
+        if profile and not _profile_lock.acquire(blocking=False):
+            return profile_busy_response()
+        stats = RequestStats()
+        token = _current.set(stats)
+        profiler = cProfile.Profile() if profile else None
+        start = perf_counter()
+        try:
+            if profiler:
+                profiler.enable()
+            response = await self.get_response(request)
+        finally:
+            if profiler:
+                profiler.disable()
+                _profile_lock.release()
+            _current.reset(token)
+        return self.finish(request, response, perf_counter() - start, stats, profiler)
+
+    def finish(self, request, response, duration, stats, profiler):
+        if profiler:
+            return profile_report(request, response, duration, stats, profiler)
+        get_metrics().observe(
+            _view_name(request), request.method, response.status_code, duration, stats, _response_bytes(response),
+        )
+        return response
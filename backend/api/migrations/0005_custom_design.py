@@ -0,0 +1,98 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def move_custom_products(apps, schema_editor):
+    """
+    Turns every `is_custom` Product into a CustomDesign and repoints its order items.
+    The snapshot files stay where they are; only new designs are stored under custom_designs/.
+    """
+    Product = apps.get_model('api', 'Product')
+    CustomDesign = apps.get_model('api', 'CustomDesign')
+    OrderItem = apps.get_model('api', 'OrderItem')
+    db_alias = schema_editor.connection.alias
+
+    moved_ids = []
+    for product in Product.objects.using(db_alias).filter(is_custom=True).iterator():
+        # The designer is not recorded on Product; attribute the design to whoever ordered it.
+        first_item = OrderItem.objects.using(db_alias).filter(product=product).select_related('order').first()
+        design = CustomDesign.objects.using(db_alias).create(
+            customer_id=first_item.order.customer_id if first_item else None,
+            name=product.name,
+            description=product.description,
+            price=product.price,
+            image=product.image.name,
+        )
+        CustomDesign.objects.using(db_alias).filter(pk=design.pk).update(created_at=product.created_at)
+        OrderItem.objects.using(db_alias).filter(product=product).update(product=None, custom_design=design)
+        moved_ids.append(product.pk)
+
+    Product.objects.using(db_alias).filter(pk__in=moved_ids).delete()
+    if moved_ids and schema_editor.connection.vendor == 'sqlite':
+        # Signals don't fire in migrations, so drop the rows from the search index by hand.
+        placeholders = ', '.join(['%s'] * len(moved_ids))
+        schema_editor.execute(f"DELETE FROM api_product_fts WHERE rowid IN ({placeholders})", moved_ids)
+
+
+def restore_custom_products(apps, schema_editor):
+    Product = apps.get_model('api', 'Product')
+    CustomDesign = apps.get_model('api', 'CustomDesign')
+    OrderItem = apps.get_model('api', 'OrderItem')
+    db_alias = schema_editor.connection.alias
+
+    for design in CustomDesign.objects.using(db_alias).iterator():
+        product = Product.objects.using(db_alias).create(
+            name=design.name,
+            description=design.description,
+            price=design.price,
+            stock=0,
+            image=design.image.name,
+            is_custom=True,
+        )
+        OrderItem.objects.using(db_alias).filter(custom_design=design).update(product=product, custom_design=None)
+    CustomDesign.objects.using(db_alias).all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_product_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='orderitem',
+            name='product',
+            field=models.ForeignKey(blank=True, help_text='The product being ordered. PROTECT prevents deleting a product that has been ordered.', null=True, on_delete=django.db.models.deletion.PROTECT, to='api.product'),
+        ),
+        migrations.CreateModel(
+            name='CustomDesign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='The name of the custom design.', max_length=255)),
+                ('description', models.TextField(blank=True, help_text='A summary of the design (shirt color, text, etc.).')),
+                ('price', models.DecimalField(decimal_places=2, help_text='The price of the custom T-shirt in INR.', max_digits=10)),
+                ('image', models.ImageField(help_text='A snapshot of the rendered design.', upload_to='custom_designs/')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='The date and time the design was created.')),
+                ('customer', models.ForeignKey(blank=True, help_text='The user who created the design.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='custom_designs', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='custom_design',
+            field=models.ForeignKey(blank=True, help_text='The custom design being ordered, for configurator orders.', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='order_items', to='api.customdesign'),
+        ),
+        migrations.RunPython(move_custom_products, restore_custom_products),
+        migrations.RemoveField(
+            model_name='product',
+            name='is_custom',
+        ),
+        migrations.AddConstraint(
+            model_name='orderitem',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('custom_design__isnull', True), ('product__isnull', False)), models.Q(('custom_design__isnull', False), ('product__isnull', True)), _connector='OR'), name='orderitem_product_xor_custom_design'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def blank_razorpay_ids_to_null(apps, schema_editor):
+    # Empty strings would collide under the new unique constraint; NULLs don't.
+    Order = apps.get_model('api', 'Order')
+    Order.objects.using(schema_editor.connection.alias).filter(razorpay_order_id='').update(razorpay_order_id=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_custom_design'),
+    ]
+
+    operations = [
+        migrations.RunPython(blank_razorpay_ids_to_null, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='order',
+            name='razorpay_order_id',
+            field=models.CharField(blank=True, help_text='The order ID generated by Razorpay. Unique, so payment callbacks look orders up through an index.', max_length=100, null=True, unique=True),
+        ),
+        migrations.CreateModel(
+            name='PaymentVerification',
+            fields=[
+                ('razorpay_payment_id', models.CharField(help_text='The Razorpay payment ID that was verified.', max_length=100, primary_key=True, serialize=False)),
+                ('status_code', models.PositiveSmallIntegerField(help_text='The HTTP status code returned for the verification.')),
+                ('response', models.JSONField(help_text='The response body returned for the verification.')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the payment was first verified.')),
+                ('order', models.ForeignKey(help_text='The order the payment was for.', on_delete=django.db.models.deletion.CASCADE, related_name='payment_verifications', to='api.order')),
+            ],
+        ),
+    ]
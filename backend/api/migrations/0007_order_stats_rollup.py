@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:03
+
+from django.db import migrations, models
+
+
+def backfill_order_stats(apps, schema_editor):
+    from api.rollups import rebuild_order_stats
+    rebuild_order_stats(
+        apps.get_model('api', 'Order'), apps.get_model('api', 'OrderStatsRollup'),
+        using=schema_editor.connection.alias,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_payment_idempotency'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderStatsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='The day the orders were created on.')),
+                ('hour', models.PositiveSmallIntegerField(help_text='The hour of the day (0-23) the orders were created in.')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSING', 'Processing'), ('SHIPPED', 'Shipped'), ('DELIVERED', 'Delivered'), ('CANCELLED', 'Cancelled')], help_text='The current status of the orders.', max_length=20)),
+                ('order_count', models.IntegerField(default=0, help_text='The number of orders in this bucket.')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, help_text="The sum of the orders' total prices.", max_digits=14)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'hour', 'status'), name='unique_order_stats_bucket')],
+            },
+        ),
+        migrations.RunPython(backfill_order_stats, migrations.RunPython.noop),
+    ]
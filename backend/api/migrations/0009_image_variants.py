@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customdesign',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/AVIF versions of the snapshot, generated after upload (see api/images.py).'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/AVIF versions of the image, generated after upload (see api/images.py).'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:10
+
+import api.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='The storage path of the file.', max_length=255, unique=True)),
+                ('sha256', models.CharField(help_text='The SHA-256 digest of the file contents.', max_length=64)),
+                ('size', models.PositiveBigIntegerField(help_text='The size of the file in bytes.')),
+                ('ref_count', models.IntegerField(default=0, help_text='The number of products and custom designs using this file.')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the file was first uploaded.')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When the reference count last changed.')),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='customdesign',
+            name='image',
+            field=models.ImageField(help_text='A snapshot of the rendered design.', storage=api.storage.image_storage, upload_to='custom_designs/'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='image',
+            field=models.ImageField(help_text='An image of the T-shirt.', storage=api.storage.image_storage, upload_to='products/'),
+        ),
+    ]
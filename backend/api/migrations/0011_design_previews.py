@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:15
+
+import api.storage
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_image_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DesignPreview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('spec_hash', models.CharField(help_text='The SHA-256 of the canonical design spec.', max_length=64, unique=True)),
+                ('spec', models.JSONField(help_text='The canonical design spec the preview was rendered from.')),
+                ('image', models.ImageField(help_text='The rendered preview image.', storage=api.storage.image_storage, upload_to='design_previews/')),
+                ('size', models.PositiveBigIntegerField(help_text='The size of the preview image in bytes, for the cache size bound.')),
+                ('hit_count', models.PositiveIntegerField(default=0, help_text='How many times the preview was reused instead of uploading a new one.')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the preview was first rendered.')),
+                ('last_used_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, help_text='When the preview was last created or reused; eviction removes the oldest first.')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='customdesign',
+            name='spec',
+            field=models.JSONField(blank=True, default=dict, help_text='The canonical design parameters (shirt color, text, decal) the snapshot was rendered from.'),
+        ),
+        migrations.AddField(
+            model_name='customdesign',
+            name='spec_hash',
+            field=models.CharField(blank=True, help_text='The SHA-256 of the canonical spec, shared with the DesignPreview it reused.', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='imageblob',
+            name='ref_count',
+            field=models.IntegerField(default=0, help_text='The number of products, custom designs and design previews using this file.'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:25
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_design_previews'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(help_text='The registered name of the task to run.', max_length=100)),
+                ('payload', models.JSONField(blank=True, default=dict, help_text='The keyword arguments the task is called with.')),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('SUCCEEDED', 'Succeeded'), ('DEAD', 'Dead')], default='QUEUED', help_text='The state of the job.', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0, help_text='How many times the job has been started.')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=5, help_text='The job is marked dead after failing this many times.')),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, help_text='The job is not started before this time (used for retry backoff).')),
+                ('locked_by', models.CharField(blank=True, help_text='The worker running the job.', max_length=100)),
+                ('locked_at', models.DateTimeField(blank=True, help_text='When the current attempt started.', null=True)),
+                ('last_error', models.TextField(blank=True, help_text='The traceback of the last failed attempt.')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the job was enqueued.')),
+                ('finished_at', models.DateTimeField(blank=True, help_text='When the job succeeded or was marked dead.', null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx')],
+            },
+        ),
+    ]
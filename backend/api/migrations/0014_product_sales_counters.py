@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_product_sales(apps, schema_editor):
+    from api.rollups import rebuild_product_sales
+    rebuild_product_sales(
+        apps.get_model('api', 'OrderItem'), apps.get_model('api', 'ProductSalesRollup'), apps.get_model('api', 'ProductSalesTotal'),
+        using=schema_editor.connection.alias,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_order_total_price_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSalesTotal',
+            fields=[
+                ('product', models.OneToOneField(help_text='The product sold.', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='sales_total', serialize=False, to='api.product')),
+                ('units_sold', models.IntegerField(default=0, help_text='The number of units sold in shipped or delivered orders.')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, help_text="The sum of the units' prices.", max_digits=14)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-units_sold'], name='product_sales_top_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductSalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='The day the orders were created on.')),
+                ('units_sold', models.IntegerField(default=0, help_text='The number of units sold in shipped or delivered orders.')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, help_text="The sum of the units' prices.", max_digits=14)),
+                ('product', models.ForeignKey(help_text='The product sold.', on_delete=django.db.models.deletion.CASCADE, related_name='sales_rollups', to='api.product')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'product'), name='unique_product_sales_bucket')],
+            },
+        ),
+        migrations.RunPython(backfill_product_sales, migrations.RunPython.noop),
+    ]
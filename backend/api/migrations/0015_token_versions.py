@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_product_sales_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenVersion',
+            fields=[
+                ('user_id', models.IntegerField(help_text='The id of the user the version belongs to.', primary_key=True, serialize=False)),
+                ('version', models.PositiveIntegerField(default=0, help_text='Bumped to revoke every token issued before.')),
+            ],
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_token_versions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='designpreview',
+            name='customer',
+            field=models.ForeignKey(help_text='The customer who uploaded the preview (empty for previews cached before they were per customer, which are never reused).', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='design_previews', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='designpreview',
+            name='spec_hash',
+            field=models.CharField(help_text='The SHA-256 of the canonical design spec.', max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name='designpreview',
+            constraint=models.UniqueConstraint(fields=('customer', 'spec_hash'), name='unique_design_preview'),
+        ),
+    ]
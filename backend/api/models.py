@@ -1,6 +1,10 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.contrib.auth.models import User
 
+from .storage import image_storage
+
 class Product(models.Model):
     """
     Represents a T-shirt product available for sale in the store.
@@ -10,18 +14,147 @@ class Product(models.Model):
     description = models.TextField(help_text="A detailed description of the T-shirt.")
     price = models.DecimalField(max_digits=10, decimal_places=2, help_text="The price of the T-shirt in INR.")
     stock = models.PositiveIntegerField(default=0, help_text="The number of units available in stock.")
-    image = models.ImageField(upload_to='products/', help_text="An image of the T-shirt.")
+    image = models.ImageField(upload_to='products/', storage=image_storage, help_text="An image of the T-shirt.")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized WebP/AVIF versions of the image, generated after upload (see api/images.py).")
     created_at = models.DateTimeField(auto_now_add=True, help_text="The date and time the product was added to the store.")
     
     # New fields for categorizing products
     is_featured = models.BooleanField(default=False, help_text="Is this product featured on the homepage?")
     is_trending = models.BooleanField(default=False, help_text="Is this a trending product?")
     is_bestseller = models.BooleanField(default=False, help_text="Is this a best-selling product?")
-    is_custom = models.BooleanField(default=False, help_text="Identifies if the product is a custom design by a user.")
+
+    class Meta:
+        indexes = [
+            # Catalog listing: newest first, with the id tie-breaker used by the cursor pagination.
+            models.Index(fields=['-created_at', '-id'], name='product_newest_idx'),
+            # Homepage sections: small partial indexes holding only the flagged products.
+            models.Index(fields=['-created_at', '-id'], condition=models.Q(is_featured=True), name='product_featured_idx'),
+            models.Index(fields=['-created_at', '-id'], condition=models.Q(is_trending=True), name='product_trending_idx'),
+            models.Index(fields=['-created_at', '-id'], condition=models.Q(is_bestseller=True), name='product_bestseller_idx'),
+            # Low-stock alerts (stock < threshold).
+            models.Index(fields=['stock'], name='product_stock_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - ₹{self.price}"
 
+class CustomDesign(models.Model):
+    """
+    Represents a one-off T-shirt design created by a customer in the 3D configurator.
+    Custom designs are kept out of the Product table so storefront queries only ever scan the real catalog.
+    A design is ordered through an OrderItem; designs that never end up in an order can be purged in bulk.
+    """
+    customer = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='custom_designs', help_text="The user who created the design.")
+    name = models.CharField(max_length=255, help_text="The name of the custom design.")
+    description = models.TextField(blank=True, help_text="A summary of the design (shirt color, text, etc.).")
+    price = models.DecimalField(max_digits=10, decimal_places=2, help_text="The price of the custom T-shirt in INR.")
+    image = models.ImageField(upload_to='custom_designs/', storage=image_storage, help_text="A snapshot of the rendered design.")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized WebP/AVIF versions of the snapshot, generated after upload (see api/images.py).")
+    spec = models.JSONField(default=dict, blank=True, help_text="The canonical design parameters (shirt color, text, decal) the snapshot was rendered from.")
+    spec_hash = models.CharField(max_length=64, blank=True, help_text="The SHA-256 of the canonical spec, shared with the DesignPreview it reused.")
+    created_at = models.DateTimeField(auto_now_add=True, help_text="The date and time the design was created.")
+
+    def __str__(self):
+        return f"{self.name} - ₹{self.price}"
+
+class OrderQuerySet(models.QuerySet):
+
+    def with_details(self):
+        """
+        Loads the customer, the line items and each item's product/custom design up front, so
+        serializing any number of orders with OrderSerializer takes a constant number of queries.
+        """
+        return self.select_related('customer').prefetch_related(
+            models.Prefetch('items', queryset=OrderItem.objects.select_related('product', 'custom_design'))
+        )
+
+    def with_item_count(self):
+        """
+        Annotates `item_count`, the number of line items, as a correlated subquery. The subquery is only
+        evaluated for the rows returned, so a page of orders costs the same however many orders match,
+        and rows can be streamed as they are read (a JOIN + GROUP BY would aggregate them all first).
+        """
+        item_count = (
+            OrderItem.objects.filter(order=models.OuterRef('pk'))
+            .values('order').annotate(count=models.Count('*')).values('count')
+        )
+        return self.annotate(item_count=Coalesce(models.Subquery(item_count), 0))
+
+    def with_list_summary(self):
+        """
+        Loads just the columns of AdminOrderListSerializer, with the customer's username joined in and
+        the item count (see with_item_count).
+        """
+        return self.only(
+            'id', 'created_at', 'customer_id', 'status', 'total_price', 'razorpay_order_id', 'razorpay_payment_id',
+        ).annotate(customer_username=models.F('customer__username')).with_item_count()
+
+class DesignPreview(models.Model):
+    """
+    A rendered preview of a configurator design, keyed on its customer and the canonical hash of its spec
+    (see api/designs.py). Creating a design whose spec the customer rendered before reuses the stored preview
+    instead of uploading a new snapshot. Previews are rendered and uploaded by the client, so they are never
+    shared between customers: one customer's upload can't stand in for another's design. The least recently
+    used previews are evicted once the cache outgrows DESIGN_PREVIEW_CACHE_MAX_ENTRIES or DESIGN_PREVIEW_CACHE_MAX_BYTES.
+    """
+    customer = models.ForeignKey(User, on_delete=models.CASCADE, null=True, related_name='design_previews', help_text="The customer who uploaded the preview (empty for previews cached before they were per customer, which are never reused).")
+    spec_hash = models.CharField(max_length=64, help_text="The SHA-256 of the canonical design spec.")
+    spec = models.JSONField(help_text="The canonical design spec the preview was rendered from.")
+    image = models.ImageField(upload_to='design_previews/', storage=image_storage, help_text="The rendered preview image.")
+    size = models.PositiveBigIntegerField(help_text="The size of the preview image in bytes, for the cache size bound.")
+    hit_count = models.PositiveIntegerField(default=0, help_text="How many times the preview was reused instead of uploading a new one.")
+    created_at = models.DateTimeField(auto_now_add=True, help_text="When the preview was first rendered.")
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True, help_text="When the preview was last created or reused; eviction removes the oldest first.")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['customer', 'spec_hash'], name='unique_design_preview'),
+        ]
+
+    def __str__(self):
+        return f"Preview {self.spec_hash[:12]} ({self.hit_count} hits)"
+
+class ImageBlob(models.Model):
+    """
+    A content-addressed image file (see api/storage.py), shared by every upload with identical bytes.
+    `ref_count` is the number of Product/CustomDesign/DesignPreview rows using the file; blobs that drop to zero
+    references are deleted by the cleanup_orphaned_images management command.
+    """
+    name = models.CharField(max_length=255, unique=True, help_text="The storage path of the file.")
+    sha256 = models.CharField(max_length=64, help_text="The SHA-256 digest of the file contents.")
+    size = models.PositiveBigIntegerField(help_text="The size of the file in bytes.")
+    ref_count = models.IntegerField(default=0, help_text="The number of products, custom designs and design previews using this file.")
+    created_at = models.DateTimeField(auto_now_add=True, help_text="When the file was first uploaded.")
+    updated_at = models.DateTimeField(auto_now=True, help_text="When the reference count last changed.")
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+    @classmethod
+    def acquire(cls, name, sha256, size):
+        """Adds a reference to the blob stored at `name`, registering it on first use."""
+        if cls.retain(name):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(name=name, sha256=sha256, size=size, ref_count=1)
+        except IntegrityError:
+            # A concurrent upload of the same bytes registered it first.
+            cls.objects.filter(name=name).update(ref_count=models.F('ref_count') + 1, updated_at=timezone.now())
+
+    @classmethod
+    def retain(cls, name):
+        """
+        Adds a reference to an already registered blob, for rows pointed at a stored file without
+        uploading it again. Returns False if `name` is not a registered blob.
+        """
+        return bool(cls.objects.filter(name=name).update(ref_count=models.F('ref_count') + 1, updated_at=timezone.now()))
+
+    @classmethod
+    def release(cls, name):
+        """Drops a reference to the blob at `name`. Files that aren't blobs (legacy uploads) are ignored."""
+        cls.objects.filter(name=name, ref_count__gt=0).update(ref_count=models.F('ref_count') - 1, updated_at=timezone.now())
+
 class Order(models.Model):
     """
     Represents a single order made by a customer.
@@ -41,22 +174,177 @@ class Order(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING', help_text="The current status of the order.")
     
     # Razorpay payment details
-    razorpay_order_id = models.CharField(max_length=100, blank=True, null=True, help_text="The order ID generated by Razorpay.")
+    razorpay_order_id = models.CharField(max_length=100, blank=True, null=True, unique=True, help_text="The order ID generated by Razorpay. Unique, so payment callbacks look orders up through an index.")
     razorpay_payment_id = models.CharField(max_length=100, blank=True, null=True, help_text="The payment ID from a successful Razorpay transaction.")
     razorpay_signature = models.CharField(max_length=200, blank=True, null=True, help_text="The signature returned by Razorpay for payment verification.")
 
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # A customer's order history, newest first.
+            models.Index(fields=['customer', '-created_at'], name='order_customer_created_idx'),
+            # Status filters (admin lists, analytics), optionally narrowed by date.
+            models.Index(fields=['status', 'created_at'], name='order_status_created_idx'),
+            # Date-range filters and the newest-first admin order list.
+            models.Index(fields=['created_at'], name='order_created_idx'),
+            # The admin order list sorted by total, paged on (total_price, id).
+            models.Index(fields=['total_price', 'id'], name='order_total_price_idx'),
+        ]
+
     def __str__(self):
         return f"Order #{self.id} by {self.customer.username} - {self.status}"
 
+class OrderStatsRollup(models.Model):
+    """
+    Pre-aggregated order statistics: the number of orders and their revenue per (day, hour, status).
+    Kept up to date incrementally as orders are created, change status or are deleted (see api/rollups.py),
+    so the admin dashboard reads a few hundred rows instead of scanning the whole order history.
+    """
+    day = models.DateField(help_text="The day the orders were created on.")
+    hour = models.PositiveSmallIntegerField(help_text="The hour of the day (0-23) the orders were created in.")
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES, help_text="The current status of the orders.")
+    order_count = models.IntegerField(default=0, help_text="The number of orders in this bucket.")
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="The sum of the orders' total prices.")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'hour', 'status'], name='unique_order_stats_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.hour:02d}:00 {self.status}: {self.order_count} orders"
+
 class OrderItem(models.Model):
     """
     Represents a single product within an order (a line item).
-    This model connects a specific product to an order and stores the quantity and the price at the time of purchase.
+    This model connects a specific product (or a customer's custom design) to an order and stores
+    the quantity and the price at the time of purchase. Exactly one of `product` and `custom_design` is set.
     """
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items', help_text="The order this item belongs to.")
-    product = models.ForeignKey(Product, on_delete=models.PROTECT, help_text="The product being ordered. PROTECT prevents deleting a product that has been ordered.")
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, null=True, blank=True, help_text="The product being ordered. PROTECT prevents deleting a product that has been ordered.")
+    custom_design = models.ForeignKey(CustomDesign, on_delete=models.PROTECT, null=True, blank=True, related_name='order_items', help_text="The custom design being ordered, for configurator orders.")
     quantity = models.PositiveIntegerField(help_text="The number of units of the product ordered.")
     price = models.DecimalField(max_digits=10, decimal_places=2, help_text="The price of a single unit of the product at the time the order was placed.")
 
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    models.Q(product__isnull=False, custom_design__isnull=True)
+                    | models.Q(product__isnull=True, custom_design__isnull=False)
+                ),
+                name='orderitem_product_xor_custom_design',
+            ),
+        ]
+
+    @property
+    def item_name(self):
+        return self.product.name if self.product_id else self.custom_design.name
+
+    def __str__(self):
+        return f"{self.quantity} x {self.item_name} in Order #{self.order.id}"
+
+class ProductSalesRollup(models.Model):
+    """
+    Units sold and revenue per (product, day), counting the items of SHIPPED and DELIVERED orders on the day
+    the order was created. Kept up to date incrementally as orders move in and out of those statuses
+    (see api/rollups.py), so the top sellers of the last 7/30/90 days are summed from at most one row per
+    product and day instead of joining every order.
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='sales_rollups', help_text="The product sold.")
+    day = models.DateField(help_text="The day the orders were created on.")
+    units_sold = models.IntegerField(default=0, help_text="The number of units sold in shipped or delivered orders.")
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="The sum of the units' prices.")
+
+    class Meta:
+        constraints = [
+            # Also the index for windows (day >= N days ago).
+            models.UniqueConstraint(fields=['day', 'product'], name='unique_product_sales_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.product_id}: {self.units_sold} sold"
+
+class ProductSalesTotal(models.Model):
+    """
+    All-time units sold and revenue per product, maintained alongside ProductSalesRollup,
+    so the all-time top sellers are read straight off an index on `units_sold`.
+    """
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name='sales_total', help_text="The product sold.")
+    units_sold = models.IntegerField(default=0, help_text="The number of units sold in shipped or delivered orders.")
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, help_text="The sum of the units' prices.")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-units_sold'], name='product_sales_top_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}: {self.units_sold} sold"
+
+class PaymentVerification(models.Model):
+    """
+    Idempotency record for a verified Razorpay payment.
+    Stores the response returned for a payment ID, so a retried webhook or a double-submitted
+    callback gets the same answer back instead of re-running the stock decrement and status update.
+    """
+    razorpay_payment_id = models.CharField(max_length=100, primary_key=True, help_text="The Razorpay payment ID that was verified.")
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='payment_verifications', help_text="The order the payment was for.")
+    status_code = models.PositiveSmallIntegerField(help_text="The HTTP status code returned for the verification.")
+    response = models.JSONField(help_text="The response body returned for the verification.")
+    created_at = models.DateTimeField(auto_now_add=True, help_text="When the payment was first verified.")
+
+    def __str__(self):
+        return f"{self.razorpay_payment_id} for Order #{self.order_id} ({self.status_code})"
+
+class Job(models.Model):
+    """
+    A unit of background work (e.g. an order confirmation email) in the database-backed job queue.
+    Jobs are enqueued in the same transaction as the change that caused them, so they exist only if it
+    commits, and are run by `run_jobs` worker processes (see api/jobs.py). A failing job is retried with
+    backoff until it has been attempted `max_attempts` times, then parked in the DEAD state for inspection.
+    """
+    QUEUED = 'QUEUED'
+    RUNNING = 'RUNNING'
+    SUCCEEDED = 'SUCCEEDED'
+    DEAD = 'DEAD'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (DEAD, 'Dead'),
+    ]
+
+    task = models.CharField(max_length=100, help_text="The registered name of the task to run.")
+    payload = models.JSONField(default=dict, blank=True, help_text="The keyword arguments the task is called with.")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED, help_text="The state of the job.")
+    attempts = models.PositiveSmallIntegerField(default=0, help_text="How many times the job has been started.")
+    max_attempts = models.PositiveSmallIntegerField(default=5, help_text="The job is marked dead after failing this many times.")
+    run_at = models.DateTimeField(default=timezone.now, help_text="The job is not started before this time (used for retry backoff).")
+    locked_by = models.CharField(max_length=100, blank=True, help_text="The worker running the job.")
+    locked_at = models.DateTimeField(null=True, blank=True, help_text="When the current attempt started.")
+    last_error = models.TextField(blank=True, help_text="The traceback of the last failed attempt.")
+    created_at = models.DateTimeField(auto_now_add=True, help_text="When the job was enqueued.")
+    finished_at = models.DateTimeField(null=True, blank=True, help_text="When the job succeeded or was marked dead.")
+
+    class Meta:
+        indexes = [
+            # Workers poll for due jobs: status = QUEUED AND run_at <= now, oldest first.
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job #{self.id} {self.task} ({self.status}, {self.attempts}/{self.max_attempts})"
+
+class TokenVersion(models.Model):
+    """
+    The current JWT version of a user (see api/authentication.py). Tokens carry the version they were issued
+    with, and bumping it revokes every token issued before. Users whose tokens were never revoked have no row.
+    `user_id` is a plain integer rather than a foreign key, so a deleted user's tokens stay revoked.
+    """
+    user_id = models.IntegerField(primary_key=True, help_text="The id of the user the version belongs to.")
+    version = models.PositiveIntegerField(default=0, help_text="Bumped to revoke every token issued before.")
+
     def __str__(self):
-        return f"{self.quantity} x {self.product.name} in Order #{self.order.id}"
+        return f"User {self.user_id}: token version {self.version}"
@@ -0,0 +1,154 @@
+import operator
+from base64 import b64decode, b64encode
+from functools import reduce
+from urllib import parse
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination over a unique ordering, e.g. ('-created_at', '-id').
+    DRF's cursor only holds the value of the first ordering field plus an offset past the rows sharing
+    that value, and the offset is capped at `offset_cutoff` (1000): with more ties than that, paging
+    loops or skips rows. Here the cursor holds the values of *every* ordering field of the last row shown,
+    and the next page is the rows strictly after that key, `Q(field__gt=v) | Q(field=v, id__gt=pk)` with
+    the comparisons flipped for descending fields. There is no offset, so any number of ties pages
+    correctly, and each page is an indexed range scan from the key.
+    The ordering must end with a unique field ('id'); subclasses keep DRF's `get_ordering` hook.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        reverse, position = (False, None) if self.cursor is None else (self.cursor.reverse, self.cursor.position)
+
+        # A reverse (previous page) cursor walks back from its key, then the page is flipped into order again.
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(queryset.model, ordering, position))
+
+        # One extra row tells whether there is a page beyond this one.
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > len(self.page)
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        # The keys the next/previous links continue from; an empty page keeps the key it was asked for.
+        self.next_position = self._get_position_from_instance(self.page[-1], self.ordering) if self.page else position
+        self.previous_position = self._get_position_from_instance(self.page[0], self.ordering) if self.page else position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.next_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.previous_position))
+
+    def _after(self, model, ordering, position):
+        """The rows strictly after `position` (one value per ordering field) in `ordering`, as a Q object."""
+        if len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        clauses, equal = [], Q()
+        for order, raw in zip(ordering, position):
+            name = order.lstrip('-')
+            try:
+                value = model._meta.get_field(name).to_python(raw)
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            lookup = f"{name}__lt" if order.startswith('-') else f"{name}__gt"
+            clauses.append(equal & Q(**{lookup: value}))
+            equal &= Q(**{name: value})
+        return reduce(operator.or_, clauses)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+            position = tokens.get('p')
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=tuple(position) if position else None)
+
+    def encode_cursor(self, cursor):
+        tokens = {}
+        if cursor.reverse:
+            tokens['r'] = '1'
+        if cursor.position is not None:
+            tokens['p'] = list(cursor.position)
+
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        fields = [order.lstrip('-') for order in ordering]
+        if isinstance(instance, dict):
+            return tuple(str(instance[name]) for name in fields)
+        return tuple(str(getattr(instance, name)) for name in fields)
+
+
+class ProductCursorPagination(KeysetCursorPagination):
+    """
+    Cursor pagination for the product catalog, newest first.
+    The cursor holds the (`created_at`, `id`) key of the last product shown, so a page is an indexed range
+    scan from that key instead of an OFFSET over every earlier product: page 1000 costs about the same as
+    page 1, however many products share a timestamp (e.g. a bulk import).
+    The page size can be tuned per request with `?page_size=`, capped at `max_page_size`.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = getattr(settings, 'PRODUCT_PAGE_SIZE', 24)
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'PRODUCT_MAX_PAGE_SIZE', 100)
+
+
+class AdminOrderCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination for the admin order list, which has to stay fast with millions of orders:
+    no OFFSET and no COUNT(*) over the filtered table, just an indexed range scan per page.
+    The sort column comes from `?ordering=` (see OrderListAdminView.ordering_fields); 'id' is always
+    appended in the same direction, so the cursor key (value, id) is unique even when many orders share a total.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = getattr(settings, 'ADMIN_ORDER_PAGE_SIZE', 50)
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'ADMIN_ORDER_MAX_PAGE_SIZE', 200)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        if ordering[0].lstrip('-') == 'id':
+            return ordering[:1]
+        tiebreak = '-id' if ordering[0].startswith('-') else 'id'
+        return (ordering[0], tiebreak)
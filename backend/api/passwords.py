@@ -0,0 +1,162 @@
+import atexit
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password, verify_password
+from django.contrib.auth.signals import user_login_failed
+from rest_framework import status
+from rest_framework.exceptions import APIException, Throttled
+
+
+class HasherBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many logins in progress, try again shortly."
+    default_code = 'hasher_busy'
+
+
+class RateLimiter:
+    """
+    In-memory token buckets, one per key (an IP address or a username): each holds up to `capacity`
+    tokens and refills at `rate` tokens per second. Only the `max_keys` most recently used buckets are
+    kept; a forgotten bucket starts full again. Per process, so with N workers the limits are N times looser.
+    """
+
+    def __init__(self, capacity, rate, max_keys=100_000, clock=time.monotonic):
+        self.capacity = capacity
+        self.rate = rate
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict()  # key: (tokens, updated)
+        self._lock = threading.Lock()
+
+    def consume(self, key):
+        """Takes a token from `key`'s bucket. Returns 0 if there was one, else the seconds until there is."""
+        with self._lock:
+            now = self.clock()
+            tokens, updated = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+
+_ip_limiter = None
+_username_limiter = None
+_limiters_lock = threading.Lock()
+
+
+def get_limiters():
+    global _ip_limiter, _username_limiter
+    with _limiters_lock:
+        if _ip_limiter is None:
+            _ip_limiter = RateLimiter(settings.LOGIN_IP_BURST, settings.LOGIN_IP_RATE)
+            _username_limiter = RateLimiter(settings.LOGIN_USERNAME_BURST, settings.LOGIN_USERNAME_RATE)
+        return _ip_limiter, _username_limiter
+
+
+def reset_limiters():
+    """Forgets every bucket (tests, or after changing the LOGIN_* rate settings)."""
+    global _ip_limiter, _username_limiter
+    with _limiters_lock:
+        _ip_limiter = _username_limiter = None
+
+
+def throttle(request, username=None):
+    """
+    Spends a token from the client IP's bucket and, for logins, the username's bucket, before any hashing.
+    Raises Throttled (429 with Retry-After) when either is empty. The IP is REMOTE_ADDR, so behind a
+    reverse proxy it has to be set from the forwarded header by the proxy setup.
+    """
+    ip_limiter, username_limiter = get_limiters()
+    wait = ip_limiter.consume(request.META.get('REMOTE_ADDR', ''))
+    if username is not None:
+        wait = max(wait, username_limiter.consume(username.lower()))
+    if wait:
+        raise Throttled(wait=wait)
+
+
+# --- Hashing pool ---
+# PBKDF2 is deliberately slow. Hashing runs in a pool of PASSWORD_HASHER_WORKERS processes, with at most
+# PASSWORD_HASHER_MAX_PENDING hashes queued or running, so a login burst uses a bounded share of the CPU
+# instead of every request thread; logins beyond that are refused with 503 rather than queued.
+
+_pool = None
+_slots = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is None:
+            # Spawned, not forked: forking a process that is running server threads is unsafe.
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASHER_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=django.setup,
+            )
+            _slots = threading.BoundedSemaphore(settings.PASSWORD_HASHER_MAX_PENDING)
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool, _slots
+
+
+def shutdown_pool():
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+        _pool = _slots = None
+
+
+def run_hasher(function, *args):
+    """Runs `function(*args)` in the hashing pool (inline with PASSWORD_HASHER_WORKERS = 0)."""
+    if not settings.PASSWORD_HASHER_WORKERS:
+        return function(*args)
+    pool, slots = _get_pool()
+    if not slots.acquire(timeout=settings.PASSWORD_HASHER_QUEUE_TIMEOUT):
+        raise HasherBusy()
+    try:
+        return pool.submit(function, *args).result()
+    finally:
+        slots.release()
+
+
+def hash_password(password):
+    """make_password, in the hashing pool."""
+    return run_hasher(make_password, password)
+
+
+def check_credentials(request, username, password):
+    """
+    Checks a username and password like ModelBackend (active users only), with the rate limits applied
+    first and the hashing done in the pool. Returns the user, or None for wrong credentials.
+    """
+    throttle(request, username)
+    User = get_user_model()
+    user = User._default_manager.filter(**{User.USERNAME_FIELD: username}).first() if username else None
+    if user is None:
+        # Hash anyway, so unknown usernames take as long as wrong passwords and can't be told apart.
+        run_hasher(make_password, password)
+        valid = False
+    else:
+        valid, must_update = run_hasher(verify_password, password, user.password)
+        if valid and must_update:
+            # The hasher settings were strengthened since the password was stored.
+            user.password = hash_password(password)
+            user.save(update_fields=['password'])
+    if not valid or not user.is_active:
+        user_login_failed.send(sender=__name__, credentials={'username': username}, request=request)
+        return None
+    return user
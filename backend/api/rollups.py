@@ -0,0 +1,176 @@
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import Case, Count, DecimalField, F, Sum, Value, When
+from django.db.models.functions import ExtractHour, TruncDate
+from django.utils import timezone
+
+from .models import Order, OrderItem, OrderStatsRollup, ProductSalesRollup, ProductSalesTotal
+
+# Orders whose items count as sold in the product sales counters.
+SALES_STATUSES = {'SHIPPED', 'DELIVERED'}
+
+REVENUE = DecimalField(max_digits=14, decimal_places=2)
+
+
+def order_snapshot(order):
+    """
+    Returns the (day, hour, status, total_price) bucket an order contributes to,
+    or None for an order that has not been saved yet.
+    """
+    if order.created_at is None:
+        return None
+    created = timezone.localtime(order.created_at)
+    return (created.date(), created.hour, order.status, order.total_price)
+
+
+def _add_to_bucket(day, hour, status, count, revenue):
+    bucket = OrderStatsRollup.objects.filter(day=day, hour=hour, status=status)
+    if bucket.update(order_count=F('order_count') + count, revenue=F('revenue') + revenue):
+        return
+    try:
+        with transaction.atomic():
+            OrderStatsRollup.objects.create(day=day, hour=hour, status=status, order_count=count, revenue=revenue)
+    except IntegrityError:
+        # A concurrent request created the bucket first.
+        bucket.update(order_count=F('order_count') + count, revenue=F('revenue') + revenue)
+
+
+def record_order_change(before, after):
+    """
+    Moves an order's contribution from the `before` snapshot to the `after` snapshot.
+    Pass None as `before` for a new order and as `after` for a deleted one.
+    """
+    if before == after:
+        return
+    if before is not None:
+        day, hour, status, total_price = before
+        _add_to_bucket(day, hour, status, -1, -total_price)
+    if after is not None:
+        day, hour, status, total_price = after
+        _add_to_bucket(day, hour, status, 1, total_price)
+
+
+def record_status_change(order, new_status):
+    """
+    Updates the rollups for a status change written with a queryset `.update()`,
+    which bypasses the Order save signals. Also updates `order.status` in memory.
+    """
+    before = order_snapshot(order)
+    record_product_sales(order, order.status, new_status)
+    order.status = new_status
+    after = order_snapshot(order)
+    record_order_change(before, after)
+    order._stats_snapshot = after
+
+
+def rebuild_order_stats(order_model=Order, rollup_model=OrderStatsRollup, using=DEFAULT_DB_ALIAS):
+    """
+    Recomputes every rollup row from the Order table with one aggregate query.
+    The models (and database) can be passed in so migrations can call this with historical models.
+    Returns the number of rollup rows written.
+    """
+    buckets = order_model.objects.using(using).annotate(
+        day=TruncDate('created_at'),
+        hour=ExtractHour('created_at'),
+    ).values('day', 'hour', 'status').annotate(
+        order_count=Count('id'),
+        revenue=Sum('total_price'),
+    ).order_by()
+
+    with transaction.atomic(using=using):
+        rollup_model.objects.using(using).all().delete()
+        rows = rollup_model.objects.using(using).bulk_create(
+            [rollup_model(**bucket) for bucket in buckets],
+            batch_size=1000,
+        )
+    return len(rows)
+
+
+# --- Product sales counters ---
+
+def _item_sales(items):
+    """Sums units and revenue per product over `items` (an OrderItem queryset)."""
+    return items.filter(product__isnull=False).values('product_id').annotate(
+        units_sold=Sum('quantity'),
+        revenue=Sum(F('price') * F('quantity'), output_field=REVENUE),
+    ).order_by()
+
+
+def _add_to_counters(model, sales, **bucket):
+    """
+    Adds {product_id: (units, revenue)} to the `model` counters in `bucket`: existing rows are
+    incremented with one UPDATE, missing ones created with one INSERT.
+    """
+    existing = set(model.objects.filter(product_id__in=sales, **bucket).values_list('product_id', flat=True))
+    if existing:
+        model.objects.filter(product_id__in=existing, **bucket).update(
+            units_sold=F('units_sold') + Case(*[When(product_id=pk, then=Value(sales[pk][0])) for pk in existing]),
+            revenue=F('revenue') + Case(
+                *[When(product_id=pk, then=Value(sales[pk][1])) for pk in existing], output_field=REVENUE,
+            ),
+        )
+    missing = {pk: sales[pk] for pk in sales if pk not in existing}
+    if not missing:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create([
+                model(product_id=pk, units_sold=units, revenue=revenue, **bucket) for pk, (units, revenue) in missing.items()
+            ])
+    except IntegrityError:
+        # A concurrent request created some of the rows first.
+        _add_to_counters(model, missing, **bucket)
+
+
+def _add_product_sales(order, sign):
+    items = getattr(order, '_prefetched_objects_cache', {}).get('items')
+    if items is None:
+        rows = _item_sales(OrderItem.objects.filter(order=order))
+        sales = {row['product_id']: (sign * row['units_sold'], sign * row['revenue']) for row in rows}
+    else:
+        # Items loaded by Order.objects.with_details() (e.g. the admin status update) save a query.
+        sales = {}
+        for item in items:
+            if item.product_id:
+                units, revenue = sales.get(item.product_id, (0, 0))
+                sales[item.product_id] = (units + sign * item.quantity, revenue + sign * item.price * item.quantity)
+    if sales:
+        _add_to_counters(ProductSalesRollup, sales, day=timezone.localtime(order.created_at).date())
+        _add_to_counters(ProductSalesTotal, sales)
+
+
+def record_product_sales(order, old_status, new_status):
+    """
+    Adds an order's items to the product sales counters when it enters SALES_STATUSES,
+    and takes them out again when it leaves them (e.g. a shipped order is cancelled).
+    """
+    counted_before, counted_after = old_status in SALES_STATUSES, new_status in SALES_STATUSES
+    if counted_before != counted_after:
+        _add_product_sales(order, 1 if counted_after else -1)
+
+
+def remove_product_sales(order):
+    """Takes a counted order out of the product sales counters; call it before the order's items are deleted."""
+    if order.status in SALES_STATUSES:
+        _add_product_sales(order, -1)
+
+
+def rebuild_product_sales(item_model=OrderItem, rollup_model=ProductSalesRollup, total_model=ProductSalesTotal, using=DEFAULT_DB_ALIAS):
+    """
+    Recomputes the product sales counters from the items of every SHIPPED/DELIVERED order.
+    The models (and database) can be passed in so migrations can call this with historical models.
+    Returns the number of (product, day) rows written.
+    """
+    items = item_model.objects.using(using).filter(order__status__in=SALES_STATUSES)
+    buckets = items.filter(product__isnull=False).annotate(day=TruncDate('order__created_at')).values(
+        'product_id', 'day',
+    ).annotate(
+        units_sold=Sum('quantity'),
+        revenue=Sum(F('price') * F('quantity'), output_field=REVENUE),
+    ).order_by()
+
+    with transaction.atomic(using=using):
+        rollup_model.objects.using(using).all().delete()
+        total_model.objects.using(using).all().delete()
+        rows = rollup_model.objects.using(using).bulk_create([rollup_model(**bucket) for bucket in buckets], batch_size=1000)
+        total_model.objects.using(using).bulk_create([total_model(**total) for total in _item_sales(items)], batch_size=1000)
+    return len(rows)
@@ -0,0 +1,67 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Set while a read-only view handler runs; copied into the threads of sync_to_async calls made from it.
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_alias():
+    """The read replica's database alias, or None when there isn't one (DATABASE_READ_REPLICA)."""
+    alias = settings.DATABASE_READ_REPLICA
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def replica_reads():
+    """Sends the reads made inside the block to the read replica, if there is one."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def reads_from_replica(handler):
+    """
+    Decorates a view handler (sync or async) that only reads, so its queries go to the read replica.
+    Only for endpoints that can serve data a replication lag behind: a request never reads its own writes there.
+    """
+    if iscoroutinefunction(handler):
+        @wraps(handler)
+        async def wrapper(*args, **kwargs):
+            with replica_reads():
+                return await handler(*args, **kwargs)
+    else:
+        @wraps(handler)
+        def wrapper(*args, **kwargs):
+            with replica_reads():
+                return handler(*args, **kwargs)
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    """
+    Writes always go to the primary (default) database. Reads go to the primary too, except inside
+    replica_reads() (see reads_from_replica), which sends them to the DATABASE_READ_REPLICA alias.
+    Both hold the same schema, so migrations run on both and objects from either can be related.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get():
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Not the instance's database: an object read from the replica is saved to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
@@ -0,0 +1,166 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Product
+
+# Boolean product flags that the search endpoint reports facet counts for.
+FACET_FIELDS = ('is_featured', 'is_trending', 'is_bestseller')
+
+# Name of the SQLite FTS5 virtual table holding the inverted index (created in migration 0004).
+FTS_TABLE = 'api_product_fts'
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(query):
+    """
+    Splits a free-text query into lowercase search terms, dropping any punctuation
+    so user input can never inject FTS query syntax.
+    """
+    return [token.lower() for token in TOKEN_RE.findall(query or '')]
+
+
+class BaseSearchBackend:
+    """
+    Interface for product search backends.
+    A backend keeps its index in sync through `index_product`/`remove_product`
+    (called from the Product save/delete signals) and answers queries with `search`.
+    """
+
+    def search(self, query, queryset=None):
+        """
+        Returns `queryset` (default: all products) narrowed to products matching `query`,
+        ordered from most to least relevant.
+        """
+        raise NotImplementedError
+
+    def index_product(self, product):
+        pass
+
+    def remove_product(self, product_id):
+        pass
+
+    def rebuild(self):
+        """Re-indexes every product from scratch. Returns the number of products indexed."""
+        return 0
+
+    def summarize(self, queryset, filters=None):
+        """
+        Counts the matched products that pass `filters` (field lookups, e.g. the request's flag filters)
+        and, across all matched products, how many have each boolean flag set, in a single aggregate query.
+        Returns (count, facets).
+        """
+        return self._facets(queryset.order_by().aggregate(**self._facet_aggregates(filters)))
+
+    async def asummarize(self, queryset, filters=None):
+        """Async version of `summarize`, for the async search view."""
+        return self._facets(await queryset.order_by().aaggregate(**self._facet_aggregates(filters)))
+
+    @staticmethod
+    def _facet_aggregates(filters):
+        return {
+            'total': Count('id', filter=Q(**filters) if filters else None),
+            **{field: Count('id', filter=Q(**{field: True})) for field in FACET_FIELDS},
+        }
+
+    @staticmethod
+    def _facets(counts):
+        return counts['total'], {field: counts[field] or 0 for field in FACET_FIELDS}
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """
+    Search backend using an SQLite FTS5 inverted index over Product.name and Product.description.
+    Results are ranked with BM25, weighting matches in the name above matches in the description.
+    Every term is matched as a prefix, so "tee" finds "tees" and "t-shirt" finds "t shirts".
+    """
+    # BM25 column weights, in the same order as the FTS table columns (name, description).
+    NAME_WEIGHT = 10.0
+    DESCRIPTION_WEIGHT = 1.0
+
+    def build_match_expression(self, query):
+        # Each term is quoted (so it is treated as a literal) and suffixed with '*' for prefix matching.
+        # Terms are implicitly AND-ed together by FTS5.
+        return ' '.join(f'"{token}"*' for token in tokenize(query))
+
+    def search(self, query, queryset=None):
+        if queryset is None:
+            queryset = Product.objects.all()
+        expression = self.build_match_expression(query)
+        if not expression:
+            return queryset.none()
+        # The index narrows the products; each match's BM25 score is then read back from the index by rowid.
+        matches = RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [expression])
+        rank = RawSQL(
+            f'SELECT bm25({FTS_TABLE}, %s, %s) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = {Product._meta.db_table}.id',
+            [self.NAME_WEIGHT, self.DESCRIPTION_WEIGHT, expression],
+            output_field=FloatField(),
+        )
+        return queryset.filter(id__in=matches).annotate(search_rank=rank).order_by('search_rank', '-id')
+
+    def index_product(self, product):
+        with connection.cursor() as cursor:
+            # FTS5 has no UPSERT, so replace the row by deleting it first.
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [product.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description) VALUES (%s, %s, %s)',
+                [product.pk, product.name, product.description],
+            )
+
+    def remove_product(self, product_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [product_id])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+                f'SELECT id, name, description FROM api_product'
+            )
+            return cursor.rowcount
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """
+    Index-free fallback for databases without FTS5.
+    Every term must appear (as a substring) in the name or description; products whose
+    name matches the first term are ranked first.
+    """
+
+    def search(self, query, queryset=None):
+        if queryset is None:
+            queryset = Product.objects.all()
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+        for token in tokens:
+            queryset = queryset.filter(Q(name__icontains=token) | Q(description__icontains=token))
+        return queryset.annotate(
+            name_hit=Count('id', filter=Q(name__icontains=tokens[0]))
+        ).order_by('-name_hit', '-created_at', '-id')
+
+
+_backend = None
+
+
+def get_search_backend():
+    """
+    Returns the configured search backend (settings.PRODUCT_SEARCH_BACKEND).
+    Defaults to SQLite FTS5 when running on SQLite, and to the simple backend otherwise.
+    """
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'PRODUCT_SEARCH_BACKEND', None)
+        if path:
+            _backend = import_string(path)()
+        elif connection.vendor == 'sqlite':
+            _backend = SQLiteFTS5Backend()
+        else:
+            _backend = SimpleSearchBackend()
+    return _backend
@@ -1,12 +1,20 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Product, Order, OrderItem
+from .models import Product, CustomDesign, Order, OrderItem
 from decimal import Decimal # <--- CRITICAL FIX: ADDED IMPORT
+from collections import defaultdict
+from django.db import transaction
+from .images import variant_urls
+from .designs import canonical_spec, spec_hash, describe_spec, find_preview, create_preview, attach_preview
+from .passwords import hash_password
+from .metrics import TimedSerializerMixin
 
 # Define the fixed shipping rate as a Decimal to ensure correct financial arithmetic
 FIXED_SHIPPING_CHARGE = Decimal('40.00') # <--- CRITICAL FIX: DEFINED AS DECIMAL
 
-class UserSerializer(serializers.ModelSerializer):
+HEX_COLOR_RE = r'^#(?:[0-9a-fA-F]{3}){1,2}$'
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the User model.
     It's used for user registration, ensuring the password is write-only for security.
@@ -19,12 +27,13 @@ class UserSerializer(serializers.ModelSerializer):
         extra_kwargs = {'password': {'write_only': True, 'required': False}}
 
     def create(self, validated_data):
-        # Use the create_user method to handle password hashing automatically.
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data.get('email', ''),
-            password=validated_data['password']
+        # Like create_user, but the password is hashed in the hashing pool (see api/passwords.py).
+        user = User(
+            username=User.normalize_username(validated_data['username']),
+            email=User.objects.normalize_email(validated_data.get('email', '')),
         )
+        user.password = hash_password(validated_data['password'])
+        user.save()
         return user
 
     def update(self, instance, validated_data):
@@ -36,7 +45,7 @@ class UserSerializer(serializers.ModelSerializer):
         # Handle password change separately to ensure it is hashed.
         password = validated_data.get('password')
         if password:
-            instance.set_password(password)
+            instance.password = hash_password(password)
         
         instance.save()
         return instance
@@ -49,30 +58,155 @@ class UserSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Only Gmail accounts are allowed for registration.")
         return value
 
-class ProductSerializer(serializers.ModelSerializer):
+def parse_fields_param(value):
+    """
+    Splits a `?fields=id,name,price` query parameter into a list of field names.
+    Returns None when the parameter is missing or empty.
+    """
+    if not value:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class ProductSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Product model.
     It will convert all fields from the Product model into JSON format.
+    Supports a sparse fieldset: pass `fields=[...]` when constructing the serializer, or
+    `?fields=id,name,price` on a read request, to return only those fields.
+    `image_srcset` holds srcset strings for the resized WebP/AVIF variants plus a thumbnail URL
+    (null until the variants have been generated).
     """
+    image_srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = Product
-        fields = '__all__'
+        exclude = ('image_variants',)
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is None:
+            # Only honour the query parameter on read requests so writes always validate every field.
+            request = self.context.get('request')
+            if request is not None and request.method in ('GET', 'HEAD'):
+                fields = parse_fields_param(request.query_params.get('fields'))
+
+        if fields:
+            # Drop any field that was not requested. Unknown names are silently ignored.
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+    def get_image_srcset(self, obj):
+        return variant_urls(obj.image_variants, self.context.get('request'))
+
+class TextPositionSerializer(serializers.Serializer):
+    x = serializers.IntegerField(min_value=0, max_value=2048)
+    y = serializers.IntegerField(min_value=0, max_value=2048)
+
+class DesignSpecSerializer(serializers.Serializer):
+    """
+    Validates the structured parameters of a configurator design.
+    `decal_sha256` identifies an uploaded background image by the SHA-256 of its bytes.
+    """
+    shirt_color = serializers.RegexField(HEX_COLOR_RE)
+    text = serializers.CharField(max_length=100, required=False, allow_blank=True, trim_whitespace=False, default='')
+    text_color = serializers.RegexField(HEX_COLOR_RE, required=False, default='#ffffff')
+    text_size = serializers.IntegerField(min_value=8, max_value=256, required=False, default=50)
+    text_position = TextPositionSerializer(required=False, default={'x': 300, 'y': 575})
+    decal_sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False, allow_null=True, default=None)
+
+    def to_internal_value(self, data):
+        return canonical_spec(super().to_internal_value(data))
 
-class OrderItemSerializer(serializers.ModelSerializer):
+class CustomDesignSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Serializer for the CustomDesign model (designs created in the 3D configurator).
+    The price is set by the server, never by the client.
+    When a `spec` is given and the customer already uploaded a preview for it, the snapshot `image`
+    can be left out: the cached preview is reused instead of uploading a new one.
+    """
+    image_srcset = serializers.SerializerMethodField()
+    # binary=True also accepts the spec as a JSON string, as sent in multipart uploads.
+    spec = serializers.JSONField(binary=True, required=False)
+    image = serializers.ImageField(required=False)
+
+    class Meta:
+        model = CustomDesign
+        fields = ('id', 'name', 'description', 'price', 'image', 'image_srcset', 'spec', 'spec_hash', 'created_at')
+        read_only_fields = ('price', 'spec_hash', 'created_at')
+
+    def get_image_srcset(self, obj):
+        return variant_urls(obj.image_variants, self.context.get('request'))
+
+    def validate_spec(self, value):
+        spec = DesignSpecSerializer(data=value)
+        spec.is_valid(raise_exception=True)
+        return spec.validated_data
+
+    def validate(self, data):
+        if not data.get('spec') and not data.get('image'):
+            raise serializers.ValidationError({'image': "An image is required for designs without a spec."})
+        return data
+
+    def create(self, validated_data):
+        spec = validated_data.get('spec')
+        if spec:
+            digest = spec_hash(spec)
+            image = validated_data.pop('image', None)
+            customer = validated_data['customer']
+            preview = find_preview(customer, digest)
+            if preview is None:
+                if image is None:
+                    raise serializers.ValidationError({'image': "No preview has been rendered for this design yet; upload one."})
+                preview = create_preview(customer, spec, digest, image)
+            attach_preview(validated_data, preview)
+            validated_data.setdefault('description', describe_spec(spec))
+        return super().create(validated_data)
+
+class OrderItemSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the OrderItem model.
     - `product`: A read-only nested representation of the associated product.
-    - `product_id`: A write-only field to specify which product to add when creating an order.
+    - `custom_design`: A read-only nested representation of the associated custom design.
+    - `product_id` / `custom_design_id`: Write-only fields to specify what to add when creating an order.
+      Exactly one of them must be given.
     """
     product = ProductSerializer(read_only=True)
-    product_id = serializers.IntegerField(write_only=True)
+    custom_design = CustomDesignSerializer(read_only=True)
+    product_id = serializers.IntegerField(write_only=True, required=False)
+    custom_design_id = serializers.IntegerField(write_only=True, required=False)
 
     class Meta:
         model = OrderItem
-        fields = ('id', 'product', 'product_id', 'quantity', 'price')
+        fields = ('id', 'product', 'custom_design', 'product_id', 'custom_design_id', 'quantity', 'price')
+
+    def validate(self, attrs):
+        if ('product_id' in attrs) == ('custom_design_id' in attrs):
+            raise serializers.ValidationError("Each item needs exactly one of product_id or custom_design_id.")
+        return attrs
+
+
+class AdminOrderListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Flat, lightweight representation of an order for the admin order list.
+    `customer_username` and `item_count` are annotated by Order.objects.with_list_summary(), so a page is serialized
+    from a single query; the nested OrderSerializer is kept for the admin order detail view.
+    """
+    customer_username = serializers.CharField(read_only=True)
+    item_count = serializers.IntegerField(read_only=True)
 
+    class Meta:
+        model = Order
+        fields = (
+            'id', 'created_at', 'customer_id', 'customer_username', 'status', 'total_price',
+            'item_count', 'razorpay_order_id', 'razorpay_payment_id',
+        )
+        read_only_fields = fields
 
-class OrderSerializer(serializers.ModelSerializer):
+
+class OrderSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Order model.
     This is a nested serializer that includes all the OrderItems associated with the order.
@@ -90,38 +224,58 @@ class OrderSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         # Extract the nested 'items' data from the request payload.
         items_data = validated_data.pop('items')
-        
-        # Create the main Order instance first.
-        order = Order.objects.create(**validated_data)
-        
-        # Initialize total_price as a Decimal, matching the type of product.price
-        total_price = Decimal('0.00') 
-        for item_data in items_data:
-            product = Product.objects.get(id=item_data['product_id'])
-            
-            # Critical business logic: Check for sufficient stock before proceeding.
-            if product.stock < item_data['quantity']:
-                order.delete() # Rollback the order creation if any item is out of stock.
-                raise serializers.ValidationError(
-                    f"Not enough stock for {product.name}. Only {product.stock} available."
-                )
-            
-            # Use the product's current price, not a price from the frontend.
-            item_price = product.price
-            OrderItem.objects.create(
-                order=order, 
-                product=product, 
-                quantity=item_data['quantity'], 
-                price=item_price
-            )
-            total_price += item_price * item_data['quantity']
-        
-        # --- FIX: ADD THE FIXED SHIPPING CHARGE (Decimal + Decimal is valid) ---
-        if total_price > 0:
-            total_price += FIXED_SHIPPING_CHARGE
-        
-        # Update the order with the calculated FINAL total price.
-        order.total_price = total_price
-        order.save()
-        
-        return order
\ No newline at end of file
+        customer = validated_data['customer']
+
+        product_ids = {item['product_id'] for item in items_data if 'product_id' in item}
+        design_ids = {item['custom_design_id'] for item in items_data if 'custom_design_id' in item}
+
+        # Validation and all writes happen in one transaction, so a failure leaves nothing behind.
+        with transaction.atomic():
+            # Fetch every product in one query and lock the rows so concurrent checkouts
+            # for the same products are serialized instead of both passing the stock check.
+            products = Product.objects.select_for_update().in_bulk(product_ids)
+            # Custom designs are made to order (no stock), but only the designer may order them.
+            designs = CustomDesign.objects.filter(customer=customer).in_bulk(design_ids)
+
+            # The same product may appear on several lines (e.g. different sizes), so check the combined quantity.
+            requested = defaultdict(int)
+            for item_data in items_data:
+                if 'product_id' in item_data:
+                    requested[item_data['product_id']] += item_data['quantity']
+
+            # Critical business logic: Check for sufficient stock before writing anything.
+            for product_id, quantity in requested.items():
+                product = products.get(product_id)
+                if product is None:
+                    raise serializers.ValidationError(f"Product {product_id} not found.")
+                if product.stock < quantity:
+                    raise serializers.ValidationError(
+                        f"Not enough stock for {product.name}. Only {product.stock} available."
+                    )
+            if design_ids - designs.keys():
+                raise serializers.ValidationError("Custom design not found.")
+
+            # Use the current product/design price, not a price from the frontend.
+            items = []
+            total_price = Decimal('0.00')
+            for item_data in items_data:
+                if 'custom_design_id' in item_data:
+                    design = designs[item_data['custom_design_id']]
+                    item = OrderItem(custom_design=design, quantity=item_data['quantity'], price=design.price)
+                else:
+                    product = products[item_data['product_id']]
+                    item = OrderItem(product=product, quantity=item_data['quantity'], price=product.price)
+                items.append(item)
+                total_price += item.price * item.quantity
+
+            # --- FIX: ADD THE FIXED SHIPPING CHARGE (Decimal + Decimal is valid) ---
+            if total_price > 0:
+                total_price += FIXED_SHIPPING_CHARGE
+
+            # Create the order with its FINAL total price, then all line items in one INSERT.
+            order = Order.objects.create(total_price=total_price, **validated_data)
+            for item in items:
+                item.order = order
+            OrderItem.objects.bulk_create(items)
+
+        return order
@@ -0,0 +1,159 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_init, post_save, post_delete, pre_delete, pre_save
+from django.contrib.auth.models import User
+from django.dispatch import receiver
+
+from .models import Product, CustomDesign, DesignPreview, Order, ImageBlob
+from .search import get_search_backend
+from .rollups import order_snapshot, record_order_change, record_product_sales, remove_product_sales
+from .caching import invalidate_products
+from .images import needs_variants, schedule_variants
+from .tasks import order_status_changed
+from .authentication import CLAIM_FIELDS, revoke_tokens
+from .metrics import install_query_recorder
+
+
+@receiver(post_save, sender=Product)
+def index_product_on_save(sender, instance, **kwargs):
+    """Keeps the search index and the response cache in sync whenever a product is created or edited."""
+    get_search_backend().index_product(instance)
+    invalidate_products([instance.pk])
+
+
+@receiver(post_delete, sender=Product)
+def remove_product_from_index(sender, instance, **kwargs):
+    """Drops a deleted product from the search index and the response cache."""
+    get_search_backend().remove_product(instance.pk)
+    invalidate_products([instance.pk])
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=CustomDesign)
+def generate_image_variants(sender, instance, **kwargs):
+    """Queues thumbnail/WebP/AVIF generation whenever a new image is uploaded."""
+    if needs_variants(instance):
+        schedule_variants(instance)
+
+
+# --- Content-addressed image reference counts ---
+# Uploading acquires a reference (see api/storage.py); replacing or deleting the image releases it.
+
+@receiver(post_init, sender=Product)
+@receiver(post_init, sender=CustomDesign)
+@receiver(post_init, sender=DesignPreview)
+def remember_image_name(sender, instance, **kwargs):
+    if 'image' not in instance.get_deferred_fields():
+        instance._image_name = instance.image.name
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=CustomDesign)
+@receiver(post_save, sender=DesignPreview)
+def release_replaced_image(sender, instance, **kwargs):
+    previous = getattr(instance, '_image_name', None)
+    if previous and previous != instance.image.name:
+        ImageBlob.release(previous)
+    instance._image_name = instance.image.name
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=CustomDesign)
+@receiver(post_delete, sender=DesignPreview)
+def release_deleted_image(sender, instance, **kwargs):
+    if instance.image:
+        ImageBlob.release(instance.image.name)
+
+
+# --- Order statistics rollups ---
+# Each Order remembers the rollup bucket it was loaded with, so a save only has to move
+# its contribution from the old bucket to the new one.
+
+ROLLUP_FIELDS = {'created_at', 'status', 'total_price'}
+
+
+@receiver(post_init, sender=Order)
+def remember_order_snapshot(sender, instance, **kwargs):
+    # Skip instances loaded with .only()/.defer(); reading a deferred field would cost a query.
+    # pre_save fetches the snapshot for those if they are ever saved.
+    if not ROLLUP_FIELDS & instance.get_deferred_fields():
+        instance._stats_snapshot = order_snapshot(instance)
+
+
+@receiver(pre_save, sender=Order)
+def load_missing_order_snapshot(sender, instance, **kwargs):
+    if not hasattr(instance, '_stats_snapshot'):
+        stored = Order.objects.filter(pk=instance.pk).only(*ROLLUP_FIELDS).first()
+        instance._stats_snapshot = order_snapshot(stored) if stored else None
+
+
+@receiver(post_save, sender=Order)
+def update_stats_on_order_save(sender, instance, created, **kwargs):
+    """
+    Adds new orders to the rollups and moves orders whose status or total changed.
+    Status changes also update the product sales counters and enqueue their background jobs (see api/tasks.py).
+    """
+    before = None if created else instance._stats_snapshot
+    after = order_snapshot(instance)
+    record_order_change(before, after)
+    if before is not None:
+        _day, _hour, old_status, _total = before
+        record_product_sales(instance, old_status, instance.status)
+        order_status_changed(instance, old_status, instance.status)
+    instance._stats_snapshot = after
+
+
+@receiver(pre_delete, sender=Order)
+def remove_sales_on_order_delete(sender, instance, **kwargs):
+    # Before the delete cascades to the items the counters are computed from.
+    remove_product_sales(instance)
+
+
+@receiver(post_delete, sender=Order)
+def update_stats_on_order_delete(sender, instance, **kwargs):
+    record_order_change(getattr(instance, '_stats_snapshot', order_snapshot(instance)), None)
+
+
+# --- Token revocation ---
+# Tokens carry the user's claims (see api/authentication.py). Changing a claim, the password or the
+# active flag revokes the tokens issued before; so does deleting the user.
+
+TOKEN_FIELDS = ('password', 'is_active', *CLAIM_FIELDS)
+
+
+def token_fields(user):
+    return tuple(getattr(user, field) for field in TOKEN_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_token_fields(sender, instance, **kwargs):
+    # Skip users built from token claims, whose password is deferred; pre_save fetches the stored values.
+    if not set(TOKEN_FIELDS) & instance.get_deferred_fields():
+        instance._token_fields = token_fields(instance)
+
+
+@receiver(pre_save, sender=User)
+def load_missing_token_fields(sender, instance, **kwargs):
+    if not hasattr(instance, '_token_fields'):
+        stored = User.objects.filter(pk=instance.pk).only(*TOKEN_FIELDS).first()
+        instance._token_fields = token_fields(stored) if stored else None
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens_on_user_change(sender, instance, created, **kwargs):
+    current = token_fields(instance)
+    if not created and instance._token_fields != current:
+        revoke_tokens(instance.pk)
+    instance._token_fields = current
+
+
+@receiver(post_delete, sender=User)
+def revoke_tokens_on_user_delete(sender, instance, **kwargs):
+    revoke_tokens(instance.pk)
+
+
+# --- Request metrics ---
+
+@receiver(connection_created)
+def record_request_queries(sender, connection, **kwargs):
+    """Counts and times each request's queries for the request metrics (see api/metrics.py)."""
+    install_query_recorder(connection)
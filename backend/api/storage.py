@@ -0,0 +1,54 @@
+import hashlib
+import posixpath
+
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File storage that names every upload after the SHA-256 of its bytes:
+
+        custom_designs/custom_snapshot.png -> custom_designs/3f/3fa2...e9.png
+
+    Uploading bytes that are already stored writes nothing; the existing file is reused and
+    its ImageBlob reference count goes up. Files whose count drops to zero are removed by the
+    cleanup_orphaned_images management command.
+    """
+
+    def __init__(self, **kwargs):
+        # Two concurrent uploads of the same bytes may both write the file; the content is identical.
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(**kwargs)
+
+    @staticmethod
+    def hash_content(content):
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        return digest.hexdigest()
+
+    def _save(self, name, content):
+        from .models import ImageBlob
+
+        digest = self.hash_content(content)
+        directory = posixpath.dirname(name)
+        extension = posixpath.splitext(name)[1].lower()
+        blob_name = posixpath.join(directory, digest[:2], digest + extension)
+
+        if not self.exists(blob_name):
+            blob_name = super()._save(blob_name, content)
+        ImageBlob.acquire(blob_name, digest, content.size)
+        return blob_name
+
+
+_image_storage = None
+
+
+def image_storage():
+    """Storage used by uploaded product and custom design images (a callable, so migrations stay stable)."""
+    global _image_storage
+    if _image_storage is None:
+        _image_storage = ContentAddressedStorage()
+    return _image_storage
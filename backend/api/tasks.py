@@ -0,0 +1,86 @@
+import logging
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import send_mail
+
+from .images import generate_variants
+from .jobs import enqueue_many, task
+from .models import Order, Product
+
+logger = logging.getLogger(__name__)
+
+# Background tasks enqueued when an order enters each status.
+STATUS_TASKS = {
+    'PROCESSING': ['orders.send_payment_confirmation', 'inventory.check_low_stock'],
+    'SHIPPED': ['orders.send_status_update'],
+    'DELIVERED': ['orders.send_status_update'],
+    'CANCELLED': ['orders.send_status_update'],
+}
+
+
+def order_status_changed(order, old_status, new_status):
+    """
+    Enqueues the background work for an order status transition with a single INSERT, so the
+    request that changed the status (e.g. the payment callback) doesn't wait for any of it.
+    """
+    names = STATUS_TASKS.get(new_status, []) if new_status != old_status else []
+    if names:
+        enqueue_many([(name, {'order_id': order.pk, 'status': new_status}) for name in names])
+
+
+def _order_with_customer(order_id):
+    return Order.objects.select_related('customer').get(pk=order_id)
+
+
+@task('orders.send_payment_confirmation')
+def send_payment_confirmation(order_id, status):
+    order = _order_with_customer(order_id)
+    if not order.customer.email:
+        return
+    send_mail(
+        f"Payment received for order #{order.id}",
+        f"Hi {order.customer.username},\n\nWe received your payment of ₹{order.total_price} "
+        f"for order #{order.id}. We'll let you know when it ships.",
+        settings.DEFAULT_FROM_EMAIL,
+        [order.customer.email],
+    )
+
+
+@task('orders.send_status_update')
+def send_status_update(order_id, status):
+    order = _order_with_customer(order_id)
+    if not order.customer.email or order.status != status:
+        # The order moved on before the job ran; the newer status has its own job.
+        return
+    send_mail(
+        f"Order #{order.id} is now {order.get_status_display().lower()}",
+        f"Hi {order.customer.username},\n\nYour order #{order.id} is now {order.get_status_display().lower()}.",
+        settings.DEFAULT_FROM_EMAIL,
+        [order.customer.email],
+    )
+
+
+@task('inventory.check_low_stock')
+def check_low_stock(order_id, status):
+    """Emails staff about products from a paid order whose stock fell below LOW_STOCK_THRESHOLD."""
+    low = list(
+        Product.objects.filter(orderitem__order_id=order_id, stock__lt=settings.LOW_STOCK_THRESHOLD)
+        .distinct().values_list('name', 'stock')
+    )
+    recipients = list(User.objects.filter(is_staff=True).exclude(email='').values_list('email', flat=True))
+    if not low or not recipients:
+        return
+    logger.info("Low stock after order #%s: %s", order_id, low)
+    send_mail(
+        f"Low stock: {len(low)} product(s)",
+        "\n".join(f"{name}: {stock} left" for name, stock in low),
+        settings.DEFAULT_FROM_EMAIL,
+        recipients,
+    )
+
+
+@task('images.generate_variants')
+def generate_image_variants(model_label, pk):
+    """Builds the resized WebP/AVIF variants of a newly uploaded product or design image (see api/images.py)."""
+    generate_variants(model_label, pk)
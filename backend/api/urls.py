@@ -5,13 +5,22 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .views import (
     RegisterView,
     LoginView,
+    RevokeTokensView,
     ProductViewSet,
+    CustomDesignViewSet,
     OrderViewSet,
     CreateRazorpayOrderView,
     VerifyPaymentView,
     AdminDashboardStats,
+    AdminDashboardSummary,
+    AdminGatewayStats,
+    AdminMetrics,
+    AdminProductAnalytics,
     OrderListAdminView,
+    OrderDetailAdminView,
     UserListAdminView,
+    OrderExportAdminView,
+    UserExportAdminView,
     # ADDED: New import for the detail view
     UserDetailAdminView,
     UpdateOrderStatusView
@@ -20,6 +29,7 @@ from .views import (
 # Create a router and register our viewsets with it.
 router = DefaultRouter()
 router.register(r'products', ProductViewSet, basename='product')
+router.register(r'custom-designs', CustomDesignViewSet, basename='custom-design')
 router.register(r'orders', OrderViewSet, basename='order')
 
 # The API URLs are now determined automatically by the router.
@@ -34,6 +44,7 @@ urlpatterns = [
     # JWT Token URLs
     path('auth/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('auth/revoke/', RevokeTokensView.as_view(), name='token_revoke'),
 
     # Razorpay Payment URLs
     path('payment/create-order/', CreateRazorpayOrderView.as_view(), name='create-razorpay-order'),
@@ -41,14 +52,21 @@ urlpatterns = [
 
     # Admin Dashboard URL
     path('admin/stats/', AdminDashboardStats.as_view(), name='admin-stats'),
+    path('admin/dashboard/', AdminDashboardSummary.as_view(), name='admin-dashboard'),
+    path('admin/products/analytics/', AdminProductAnalytics.as_view(), name='admin-product-analytics'),
+    path('admin/gateway/stats/', AdminGatewayStats.as_view(), name='admin-gateway-stats'),
+    path('admin/metrics/', AdminMetrics.as_view(), name='admin-metrics'),
     
     # ADMIN USER PATHS
     path('admin/users/', UserListAdminView.as_view(), name='admin-user-list'),
+    path('admin/users/export/<str:fmt>/', UserExportAdminView.as_view(), name='admin-user-export'),
     # ADDED: Detail path for retrieving, updating, and deleting a single user.
     # The frontend calls this URL: '/admin/users/<int:pk>/'
     path('admin/users/<int:pk>/', UserDetailAdminView.as_view(), name='admin-user-detail'),
     
     # ADMIN ORDER PATHS
     path('admin/orders/', OrderListAdminView.as_view(), name='admin-order-list'),
+    path('admin/orders/<int:pk>/', OrderDetailAdminView.as_view(), name='admin-order-detail'),
+    path('admin/orders/export/<str:fmt>/', OrderExportAdminView.as_view(), name='admin-order-export'),
     path('admin/orders/<int:order_id>/status/', UpdateOrderStatusView.as_view(), name='update-order-status'),
 ]
\ No newline at end of file
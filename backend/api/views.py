@@ -1,19 +1,42 @@
 import os
-import razorpay
+import logging
 from django.conf import settings 
 from rest_framework import viewsets, status, permissions, generics 
 from rest_framework.views import APIView
+from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
-# Import ExtractWeekDay, TruncHour, TruncMonth, TruncYear
-from django.db.models.functions import TruncMonth, TruncYear, TruncHour, ExtractWeekDay 
-from django.db.models import Count, Sum, F 
-from datetime import date, timedelta # Import for date filtering
+from django.db import transaction
+from django.core.cache import cache
+from django.utils import timezone
+from django.http import Http404, HttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from asgiref.sync import sync_to_async
+
+from .models import Product, CustomDesign, Order, PaymentVerification
+from .authentication import VersionedRefreshToken, revoke_tokens
+from .passwords import check_credentials, throttle
+from .serializers import ProductSerializer, CustomDesignSerializer, DesignSpecSerializer, OrderSerializer, UserSerializer, OrderItemSerializer, AdminOrderListSerializer, parse_fields_param
+from .pagination import ProductCursorPagination, AdminOrderCursorPagination
+from .filters import AdminOrderFilterBackend
+from .search import FACET_FIELDS, get_search_backend
+from .inventory import InsufficientStock, decrement_stock_for_order
+from .rollups import record_status_change
+from .tasks import order_status_changed
+from .caching import acached_product_response, aproduct_cache_key
+from .async_views import AsyncAPIView, AsyncViewSetMixin
+from .routers import reads_from_replica
+from .metrics import PROMETHEUS_CONTENT_TYPE, get_metrics
+from .designs import spec_hash, find_preview
+from .dashboard import order_stats, cached_dashboard_summary, top_selling_products
+from .exports import (
+    EXPORT_FORMATS, ORDER_COLUMNS, USER_COLUMNS, ExportContentNegotiation,
+    export_response, order_export_queryset, user_export_queryset,
+)
+from . import gateway
 
-from .models import Product, Order
-from .serializers import ProductSerializer, OrderSerializer, UserSerializer, OrderItemSerializer
+logger = logging.getLogger(__name__)
 
 # --- User Authentication Views ---
 
@@ -25,11 +48,12 @@ class RegisterView(APIView):
     permission_classes = [permissions.AllowAny] # Anyone can register
 
     def post(self, request):
+        throttle(request)
         serializer = UserSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
             # Generate JWT tokens for the new user immediately after registration
-            refresh = RefreshToken.for_user(user)
+            refresh = VersionedRefreshToken.for_user(user)
             return Response({
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
@@ -50,9 +74,10 @@ class LoginView(APIView):
     def post(self, request):
         username = request.data.get('username')
         password = request.data.get('password')
-        user = authenticate(username=username, password=password)
+        # Rate limited per IP and username, hashed in a bounded process pool (see api/passwords.py).
+        user = check_credentials(request, username, password)
         if user:
-            refresh = RefreshToken.for_user(user)
+            refresh = VersionedRefreshToken.for_user(user)
             return Response({
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
@@ -63,49 +88,151 @@ class LoginView(APIView):
         return Response({'error': 'Invalid Credentials'}, status=status.HTTP_401_UNAUTHORIZED)
 
 
+class RevokeTokensView(APIView):
+    """
+    API endpoint to log out everywhere: revokes every access and refresh token issued to the user so far,
+    including the one used for this request.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        revoke_tokens(request.user.pk)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 # --- E-commerce ViewSets ---
 
 # api/views.py
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(AsyncViewSetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and managing products.
     - List and Retrieve actions are allowed for any user.
     - Create, Update, and Delete actions are restricted to admin users.
+      (Customer designs from the configurator go to CustomDesignViewSet instead.)
+    - The list is cursor-paginated, newest first (see ProductCursorPagination); `?fields=` selects a sparse fieldset.
+    - List and Retrieve responses are cached (see api/caching.py) and support ETag/If-None-Match.
+    - The read-only actions (list, retrieve, search) are async and read from the replica database, if one is
+      configured (see api/routers.py); the admin write actions stay synchronous.
     """
-    queryset = Product.objects.all().order_by('-created_at')
+    queryset = Product.objects.all().order_by('-created_at', '-id')
     serializer_class = ProductSerializer
+    pagination_class = ProductCursorPagination
 
     def get_permissions(self):
-        # --- REPLACE THE OLD METHOD WITH THIS ---
-        if self.action == 'create':
-            # Allow any logged-in user to create a custom product
-            self.permission_classes = [permissions.IsAuthenticated]
-        elif self.action in ['update', 'partial_update', 'destroy']:
-            # Only allow admins to modify or delete existing products
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            # Only allow admins to add, modify or delete catalog products
             self.permission_classes = [permissions.IsAdminUser]
         else:
             # Allow anyone to view products (list, retrieve)
             self.permission_classes = [permissions.AllowAny]
         return super().get_permissions()
 
+    @reads_from_replica
+    async def list(self, request, *args, **kwargs):
+        # DRF's cursor paginator is synchronous, so a cache miss builds the page in one sync_to_async hop.
+        build = sync_to_async(super().list)
+        return await acached_product_response(
+            request, await aproduct_cache_key(request), lambda: build(request, *args, **kwargs)
+        )
+
+    @reads_from_replica
+    async def retrieve(self, request, *args, **kwargs):
+        async def build():
+            try:
+                instance = await self.get_queryset().aget(pk=kwargs['pk'])
+            except (Product.DoesNotExist, TypeError, ValueError):
+                raise Http404
+            self.check_object_permissions(request, instance)
+            return Response(self.get_serializer(instance).data)
+
+        return await acached_product_response(request, await aproduct_cache_key(request, pk=kwargs['pk']), build)
+
     def get_queryset(self):
         # ... (this method remains unchanged) ...
-        queryset = Product.objects.all().order_by('-created_at')
-        is_featured = self.request.query_params.get('is_featured')
-        is_trending = self.request.query_params.get('is_trending')
-        is_bestseller = self.request.query_params.get('is_bestseller')
+        queryset = Product.objects.all().order_by('-created_at', '-id').filter(**self.flag_filters())
 
-        if is_featured == 'true':
-            queryset = queryset.filter(is_featured=True)
+        # Sparse fieldset: only load the requested columns (plus the cursor keys) from the database.
+        fields = parse_fields_param(self.request.query_params.get('fields'))
+        if fields and self.request.method in permissions.SAFE_METHODS:
+            concrete = {f.name for f in Product._meta.concrete_fields}
+            selected = [name for name in fields if name in concrete]
+            if 'image_srcset' in fields:
+                selected.append('image_variants')
+            queryset = queryset.only('id', 'created_at', *selected)
 
-        if is_trending == 'true':
-            queryset = queryset.filter(is_trending=True)
+        return queryset
 
-        if is_bestseller == 'true':
-            queryset = queryset.filter(is_bestseller=True)
+    def flag_filters(self):
+        """The is_featured/is_trending/is_bestseller filters of the request (`?is_featured=true`), as field lookups."""
+        return {field: True for field in FACET_FIELDS if self.request.query_params.get(field) == 'true'}
+
+    # Maximum number of ranked results returned by the search action.
+    SEARCH_MAX_RESULTS = 100
+
+    @action(detail=False, methods=['get'])
+    @reads_from_replica
+    async def search(self, request):
+        """
+        Full-text product search: GET /api/products/search/?q=<terms>&limit=<n>
+        Results are ranked by relevance and every term is prefix-matched. The response also
+        includes facet counts of the boolean flags across all matching products.
+        The is_featured/is_trending/is_bestseller filters narrow the results as on the list endpoint.
+        """
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = min(int(request.query_params.get('limit', 24)), self.SEARCH_MAX_RESULTS)
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        backend = get_search_backend()
+        # The facets describe the whole match set; the count, like the results, only the filtered products.
+        count, facets = await backend.asummarize(backend.search(query, queryset=Product.objects.all()), self.flag_filters())
+        results = [
+            product async for product in backend.search(query, queryset=self.get_queryset().order_by())[:max(limit, 0)]
+        ]
 
-        return queryset
+        serializer = self.get_serializer(results, many=True)
+        return Response({
+            "query": query,
+            "count": count,
+            "facets": facets,
+            "results": serializer.data,
+        })
+
+
+class CustomDesignViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for the custom T-shirt designs customers create in the 3D configurator.
+    Users can only see and delete their own designs. Designs are immutable once uploaded.
+    """
+    serializer_class = CustomDesignSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    http_method_names = ['get', 'post', 'delete', 'head', 'options']
+
+    def get_queryset(self):
+        return CustomDesign.objects.filter(customer=self.request.user).order_by('-created_at')
+
+    def perform_create(self, serializer):
+        # The price of a custom T-shirt is fixed server-side.
+        serializer.save(customer=self.request.user, price=settings.CUSTOM_DESIGN_PRICE)
+
+    @action(detail=False, methods=['post'])
+    def lookup(self, request):
+        """
+        Looks up the preview the user already uploaded for a design spec. Read-only: only creating a
+        design from the preview counts as a use. On a hit the client can create the design from the spec
+        alone, skipping the snapshot upload.
+        """
+        spec = DesignSpecSerializer(data=request.data)
+        spec.is_valid(raise_exception=True)
+        digest = spec_hash(spec.validated_data)
+        preview = find_preview(request.user, digest, use=False)
+        return Response({
+            'spec_hash': digest,
+            'cached': preview is not None,
+            'image': request.build_absolute_uri(preview.image.url) if preview else None,
+        })
 
 
 class OrderViewSet(viewsets.ModelViewSet):
@@ -117,11 +244,13 @@ class OrderViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         # Users can only view their own orders, not others'.
-        return Order.objects.filter(customer=self.request.user).order_by('-created_at')
+        return Order.objects.filter(customer=self.request.user).with_details().order_by('-created_at')
 
     def perform_create(self, serializer):
         # Automatically assign the logged-in user as the customer for the new order.
-        serializer.save(customer=self.request.user)
+        order = serializer.save(customer=self.request.user)
+        # Reload with items and products prefetched so the response costs a constant number of queries.
+        serializer.instance = Order.objects.with_details().get(pk=order.pk)
 
 class UpdateOrderStatusView(APIView):
     """
@@ -131,7 +260,7 @@ class UpdateOrderStatusView(APIView):
 
     def patch(self, request, order_id):
         try:
-            order = Order.objects.get(id=order_id)
+            order = Order.objects.with_details().get(id=order_id)
         except Order.DoesNotExist:
             return Response({"error": "Order not found"}, status=status.HTTP_404_NOT_FOUND)
         
@@ -148,22 +277,19 @@ class UpdateOrderStatusView(APIView):
 
 # --- Razorpay Integration Views ---
 
-# Initialize the Razorpay client from Django settings
-# FIX: Now reading keys from settings.py where they are defined directly.
-razorpay_client = razorpay.Client(
-    auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
-)
+# Gateway calls go through api/gateway.py (pooled connections, timeouts, retries and a circuit breaker).
 
-class CreateRazorpayOrderView(APIView):
+class CreateRazorpayOrderView(AsyncAPIView):
     """
     Creates a Razorpay order ID required to initialize the payment flow.
+    Async: under ASGI the gateway round trip doesn't hold a worker thread.
     """
     permission_classes = [permissions.IsAuthenticated]
 
-    def post(self, request):
+    async def post(self, request):
         order_id = request.data.get("order_id")
         try:
-            order = Order.objects.get(id=order_id, customer=request.user)
+            order = await Order.objects.aget(id=order_id, customer=request.user)
         except Order.DoesNotExist:
             return Response({"error": "Order not found"}, status=status.HTTP_404_NOT_FOUND)
 
@@ -175,20 +301,26 @@ class CreateRazorpayOrderView(APIView):
         amount = int(order.total_price * 100) 
         
         try:
-            razorpay_order = razorpay_client.order.create({
+            razorpay_order = await gateway.create_order({
                 "amount": amount,
                 "currency": "INR",
                 "receipt": f"order_rcptid_{order.id}",
-            })
-        except Exception as e:
-            # Handle Razorpay API errors (e.g., invalid keys or parameters) gracefully
-            print(f"Razorpay Order Creation Error: {e}")
-            return Response({"error": "Razorpay API error during order creation.", "details": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            }, asynchronous=isinstance(request._request, ASGIRequest))
+        except gateway.GatewayUnavailable as e:
+            # The gateway has been failing; answer immediately instead of queueing behind it.
+            retry_after = max(1, round(gateway.get_gateway().breaker.retry_after()))
+            return Response(
+                {"error": "The payment gateway is temporarily unavailable. Please try again shortly.", "details": str(e)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': str(retry_after)},
+            )
+        except gateway.GatewayError as e:
+            # Handle Razorpay API errors (e.g., invalid keys or parameters, timeouts) gracefully
+            logger.warning("Razorpay order creation failed for order #%s: %s", order.id, e)
+            return Response({"error": "Razorpay API error during order creation.", "details": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
 
 
         # Store the Razorpay order ID in our database
-        order.razorpay_order_id = razorpay_order['id']
-        order.save()
+        await Order.objects.filter(pk=order.pk).aupdate(razorpay_order_id=razorpay_order['id'])
 
         return Response({
             "razorpay_order_id": razorpay_order['id'],
@@ -198,13 +330,41 @@ class CreateRazorpayOrderView(APIView):
             "key": settings.RAZORPAY_KEY_ID # <--- Using settings key
         })
 
-class VerifyPaymentView(APIView):
+class VerifyPaymentView(AsyncAPIView):
     """
     Verifies the payment signature returned by Razorpay after a successful payment.
+    Verification is idempotent per `razorpay_payment_id`: the first result is recorded
+    (PaymentVerification) and cached, and any retry of the same payment gets that result back
+    without re-running the stock decrement or touching the database.
+    Replays are answered with async cache/ORM calls; the locked stock update runs in a
+    transaction, which the async ORM doesn't support, so it goes through sync_to_async.
     """
     permission_classes = [permissions.IsAuthenticated]
 
-    def post(self, request):
+    @staticmethod
+    def cache_key(payment_id):
+        return f'payment-verification:{payment_id}'
+
+    async def recorded_response(self, payment_id):
+        """Returns the stored response for an already verified payment, or None."""
+        cached = await cache.aget(self.cache_key(payment_id))
+        if cached is None:
+            record = await PaymentVerification.objects.filter(pk=payment_id).values('status_code', 'response').afirst()
+            if record is None:
+                return None
+            cached = (record['status_code'], record['response'])
+            await cache.aset(self.cache_key(payment_id), cached, settings.PAYMENT_IDEMPOTENCY_CACHE_TIMEOUT)
+        status_code, body = cached
+        return Response(body, status=status_code)
+
+    def record(self, order, payment_id, body, status_code):
+        """Stores the result for `payment_id` so retries replay it."""
+        PaymentVerification.objects.create(
+            razorpay_payment_id=payment_id, order=order, status_code=status_code, response=body
+        )
+        return status_code, body
+
+    async def post(self, request):
         params_dict = {
             'razorpay_order_id': request.data.get("razorpay_order_id"),
             'razorpay_payment_id': request.data.get("razorpay_payment_id"),
@@ -213,153 +373,156 @@ class VerifyPaymentView(APIView):
 
         try:
             # This utility function will raise an exception if the signature is invalid
-            razorpay_client.utility.verify_payment_signature(params_dict)
-            
-            order = Order.objects.get(razorpay_order_id=params_dict['razorpay_order_id'])
-            order.razorpay_payment_id = params_dict['razorpay_payment_id']
-            order.razorpay_signature = params_dict['razorpay_signature']
-            order.status = 'PROCESSING'
-            order.save()
-
-            # Reduce the stock for each item in the order
-            for item in order.items.all():
-                item.product.stock -= item.quantity
-                item.product.save()
-
-            return Response({"status": "Payment Successful"}, status=status.HTTP_200_OK)
+            gateway.verify_payment_signature(params_dict)
         except Exception as e:
             # In case of verification failure, keep the order PENDING (default status)
             return Response({"error": "Payment Verification Failed", "details": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+        # Replays are only answered after the signature checks out, so a forged request can't read them.
+        payment_id = params_dict['razorpay_payment_id']
+        replay = await self.recorded_response(payment_id)
+        if replay is not None:
+            return replay
+
+        return await sync_to_async(self.apply_payment)(
+            params_dict['razorpay_order_id'], payment_id, params_dict['razorpay_signature']
+        )
+
+    def apply_payment(self, razorpay_order_id, payment_id, signature):
+        try:
+            # The whole callback is a fixed number of queries regardless of the order size.
+            with transaction.atomic():
+                order = Order.objects.select_for_update().get(razorpay_order_id=razorpay_order_id)
+                # Concurrent duplicates queue on the order's lock; all but the first find its result here.
+                result = PaymentVerification.objects.filter(pk=payment_id).values_list('status_code', 'response').first()
+                if result is None:
+                    result = self.process_payment(order, payment_id, signature)
+        except Order.DoesNotExist:
+            return Response({"error": "Order not found"}, status=status.HTTP_404_NOT_FOUND)
+        status_code, body = result
+        cache.set(self.cache_key(payment_id), result, settings.PAYMENT_IDEMPOTENCY_CACHE_TIMEOUT)
+        return Response(body, status=status_code)
+
+    def process_payment(self, order, payment_id, signature):
+        """Applies a payment to the locked order and records the result. Runs inside apply_payment's transaction."""
+        payment_fields = {
+            'razorpay_payment_id': payment_id,
+            'razorpay_signature': signature,
+        }
+        try:
+            # Takes all of the order's stock or none of it.
+            decrement_stock_for_order(order)
+        except InsufficientStock as e:
+            # The customer has paid but stock ran out between checkout and payment.
+            # Record the payment so an admin can refund it, and leave the order PENDING.
+            Order.objects.filter(pk=order.pk).update(**payment_fields)
+            return self.record(order, payment_id, {"error": "Insufficient stock", "details": str(e)}, status.HTTP_409_CONFLICT)
+        Order.objects.filter(pk=order.pk).update(status='PROCESSING', **payment_fields)
+        # Emails and alerts run on the job queue; the callback only enqueues them.
+        order_status_changed(order, order.status, 'PROCESSING')
+        record_status_change(order, 'PROCESSING')
+        return self.record(order, payment_id, {"status": "Payment Successful"}, status.HTTP_200_OK)
+
 
 # --- Admin Dashboard Views ---
 
 class AdminDashboardStats(APIView):
     """
     Provides aggregated statistics for the admin dashboard, including hourly and day-of-week data.
+    Every figure is read from the OrderStatsRollup table (one row per day/hour/status),
+    never from the full order history, on the read replica if there is one.
     Restricted to admin users only.
     """
     permission_classes = [permissions.IsAdminUser]
 
+    @reads_from_replica
     def get(self, request):
-        today = date.today()
-        
-        # 1. Group orders by month and count them
-        monthly_orders = Order.objects.annotate(month=TruncMonth('created_at')).values('month').annotate(count=Count('id')).order_by('month')
-        
-        # 2. Group orders by year and count them
-        yearly_orders = Order.objects.annotate(year=TruncYear('created_at')).values('year').annotate(count=Count('id')).order_by('year')
-        
-        # 3. Count orders for each status type
-        status_counts = Order.objects.values('status').annotate(count=Count('id'))
-        
-        # 4. Calculate total revenue from 'DELIVERED' orders only
-        total_revenue = Order.objects.filter(status='DELIVERED').aggregate(total=Sum('total_price'))['total'] or 0
-
-        # 5. Daily Order Trend (Last 30 days)
-        thirty_days_ago = today - timedelta(days=30)
-        daily_orders = Order.objects.filter(
-            created_at__date__gte=thirty_days_ago # Filter orders from the last 30 days
-        ).extra({'date': "date(created_at)"}).values('date').annotate(
-            count=Count('id')
-        ).order_by('date')
-        
-        # 6. Hourly Order Trend (Today only)
-        hourly_orders_today_raw = Order.objects.filter(
-            created_at__date=today # Filter orders for today
-        ).annotate(
-            hour_group=TruncHour('created_at')
-        ).values('hour_group').annotate(
-            count=Count('id')
-        ).order_by('hour_group')
-        
-        hourly_orders_today = [
-            # Format datetime object to 'HH:00' string, e.g., '14:00'
-            {'hour': item['hour_group'].strftime('%H:00'), 'count': item['count']}
-            for item in hourly_orders_today_raw
-        ]
-        
-        # Fill in hours with zero count for a continuous hourly graph
-        all_hours = {f"{h:02d}:00": 0 for h in range(24)}
-        for item in hourly_orders_today:
-            all_hours[item['hour']] = item['count']
-
-        hourly_orders_today_filled = [
-            {'hour': hour, 'count': count} 
-            for hour, count in sorted(all_hours.items())
-        ]
-        
-        # 7. Orders by Day of Week (Aggregating all time data)
-        # Note: ExtractWeekDay returns 1=Sunday, 2=Monday, ..., 7=Saturday
-        orders_by_day_of_week = Order.objects.annotate(
-            day_of_week_num=ExtractWeekDay('created_at')
-        ).values('day_of_week_num').annotate(
-            count=Count('id')
-        ).order_by('day_of_week_num')
-        
-        return Response({
-            "monthly_orders": list(monthly_orders),
-            "yearly_orders": list(yearly_orders),
-            "status_distribution": list(status_counts),
-            "total_revenue": total_revenue,
-            "daily_orders": list(daily_orders), 
-            "hourly_orders_today": hourly_orders_today_filled, 
-            "orders_by_day_of_week": list(orders_by_day_of_week), # <--- NEW FIELD
-        })
+        return Response(order_stats())
+
+
+class AdminDashboardSummary(APIView):
+    """
+    Everything the admin dashboard shows on load in one round trip: the order charts of AdminDashboardStats,
+    KPI counts, the most recent orders and the products lowest on stock (see api/dashboard.py).
+    The payload is cached for ADMIN_DASHBOARD_CACHE_TIMEOUT seconds and shared by all admins,
+    and computed on the read replica if there is one.
+    Restricted to admin users only.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    @reads_from_replica
+    def get(self, request):
+        return Response(cached_dashboard_summary())
+
+
+class AdminGatewayStats(APIView):
+    """
+    Reports the payment gateway client's counters for this worker process: requests, retries,
+    timeouts, errors, short-circuited calls, response latency and the circuit breaker state.
+    Restricted to admin users only.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(gateway.get_gateway().stats())
+
+
+class AdminMetrics(APIView):
+    """
+    Serves the request metrics of this worker process (per-view latency histogram, database queries and
+    time, serializer time and response bytes; see api/metrics.py) in the Prometheus text format.
+    Restricted to admin users only.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    # The response is plain text whatever the scraper's Accept header says.
+    content_negotiation_class = ExportContentNegotiation
+
+    def get(self, request):
+        return HttpResponse(get_metrics().render(), content_type=PROMETHEUS_CONTENT_TYPE)
 
 
 # ADDED: New view for product-centric analytics (Stock and Top Sellers)
 class AdminProductAnalytics(APIView):
     """
     Provides stock alerts and top-selling product data for the admin dashboard.
+    Top sellers come from the product sales counters (see api/rollups.py): all time by default, or over
+    the last `?days=` 7, 30 or 90 days. `?limit=` sets how many are returned (default 5, at most 50).
     Restricted to admin users only.
     """
     permission_classes = [permissions.IsAdminUser]
-    
-    # Define a default low stock threshold
-    LOW_STOCK_THRESHOLD = 10 
 
+    LOW_STOCK_THRESHOLD = settings.LOW_STOCK_THRESHOLD
+    # At most this many low-stock products are listed; low_stock_count has the full count.
+    LOW_STOCK_ALERT_LIMIT = 50
+    SALES_WINDOWS = (7, 30, 90)
+    MAX_LIMIT = 50
+
+    @reads_from_replica
     def get(self, request):
-        # 1. Low Stock/Inventory Analysis
-        # Fetch products where the current stock is below the threshold
-        low_stock_products = Product.objects.filter(stock__lt=self.LOW_STOCK_THRESHOLD).order_by('stock')
-        
+        days = request.query_params.get('days')
+        limit = request.query_params.get('limit', '5')
+        if days is not None and (not days.isdigit() or int(days) not in self.SALES_WINDOWS):
+            return Response({"error": f"days must be one of {', '.join(map(str, self.SALES_WINDOWS))}."}, status=status.HTTP_400_BAD_REQUEST)
+        if not limit.isdigit() or not 1 <= int(limit) <= self.MAX_LIMIT:
+            return Response({"error": f"limit must be between 1 and {self.MAX_LIMIT}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Both the alerts and the count are served by the index on Product.stock.
+        low_stock_products = Product.objects.filter(stock__lt=self.LOW_STOCK_THRESHOLD)
         low_stock_data = [
             {
-                'id': product.id,
-                'name': product.name,
-                'current_stock': product.stock,
+                'id': product['id'],
+                'name': product['name'],
+                'current_stock': product['stock'],
                 'threshold': self.LOW_STOCK_THRESHOLD
             }
-            for product in low_stock_products
+            for product in low_stock_products.order_by('stock', 'id').values('id', 'name', 'stock')[:self.LOW_STOCK_ALERT_LIMIT]
         ]
-        
-        # 2. Top Selling Products Analysis
-        # Import OrderItem is assumed to be available in models and linked to Product.
-        # Aggregate the quantity of items sold, grouped by product.
-        # Filter: Only consider items from orders that are DELIVERED or SHIPPED
-        top_selling_products_query = Order.objects.filter(
-            status__in=['DELIVERED', 'SHIPPED']
-        ).values(
-            'items__product__name', 
-            'items__product__id'
-        ).annotate(
-            total_sold=Sum('items__quantity')
-        ).order_by('-total_sold')[:5] # Get the top 5
-        
-        top_selling_data = [
-            {
-                'id': item['items__product__id'],
-                'name': item['items__product__name'],
-                'total_sold': item['total_sold'],
-            }
-            for item in top_selling_products_query
-        ]
-        
+
         return Response({
             "low_stock_alerts": low_stock_data,
-            "top_selling_products": top_selling_data,
-            "low_stock_count": len(low_stock_data), # Count for easy KPI display
+            "top_selling_products": top_selling_products(int(limit), int(days) if days else None),
+            "low_stock_count": low_stock_products.count(),
+            "days": int(days) if days else None,
         })
 
 
@@ -383,8 +546,62 @@ class UserDetailAdminView(generics.RetrieveUpdateDestroyAPIView):
 
 class OrderListAdminView(generics.ListAPIView):
     """
-    API endpoint for admins to list all orders.
+    API endpoint for admins to list orders, a page at a time.
+    Filters (see api/filters.py): `status`, `from` / `to`, `customer`, `razorpay_order_id`.
+    Sorting: `?ordering=` one of `ordering_fields`, prefixed with '-' for descending (default: newest first).
+    Each page is one query (see OrderQuerySet.with_list_summary).
     """
-    queryset = Order.objects.all().order_by('-created_at')
+    queryset = Order.objects.with_list_summary()
+    serializer_class = AdminOrderListSerializer
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = AdminOrderCursorPagination
+    filter_backends = [AdminOrderFilterBackend, OrderingFilter]
+    ordering_fields = ['created_at', 'total_price', 'id']
+
+
+class OrderDetailAdminView(generics.RetrieveAPIView):
+    """
+    API endpoint for admins to view one order with its customer and items.
+    """
+    queryset = Order.objects.with_details()
     serializer_class = OrderSerializer
-    permission_classes = [permissions.IsAdminUser]
\ No newline at end of file
+    permission_classes = [permissions.IsAdminUser]
+
+
+class AdminExportView(APIView):
+    """
+    Base view for the streaming admin exports: GET .../export/<csv|ndjson>/?from=YYYY-MM-DD&to=YYYY-MM-DD
+    Subclasses set the base `queryset`, the `export_queryset(queryset, params)` builder that filters it and
+    selects the columns (see api/exports.py), the columns and the file name.
+    Restricted to admin users only.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    content_negotiation_class = ExportContentNegotiation
+    queryset = None
+    export_queryset = None
+    columns = None
+    filename = None
+
+    def get(self, request, fmt):
+        if fmt not in EXPORT_FORMATS:
+            return Response({"error": f"Unknown export format: {fmt}"}, status=status.HTTP_404_NOT_FOUND)
+        # Invalid filters raise a ValidationError, answered with 400.
+        queryset = self.export_queryset(self.queryset.all(), request.query_params)
+        return export_response(request._request, queryset, self.columns, fmt, f'{self.filename}-{timezone.localdate()}')
+
+
+class OrderExportAdminView(AdminExportView):
+    """Streams every order (one row each, with its item count). Also filters on `status` (comma-separated)."""
+    queryset = Order.objects.all()
+    export_queryset = staticmethod(order_export_queryset)
+    columns = ORDER_COLUMNS
+    filename = 'orders'
+
+
+class UserExportAdminView(AdminExportView):
+    """Streams every user with their order count. Also filters on `is_staff` and `is_active` (true/false)."""
+    queryset = User.objects.all()
+    export_queryset = staticmethod(user_export_queryset)
+    columns = USER_COLUMNS
+    filename = 'users'
+
@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ecommerce_project.settings')
+# Persistent connections aren't reused reliably under ASGI (they belong to whichever thread ran the sync
+# code), so connections are closed after every request unless configured otherwise (see settings.py).
+os.environ.setdefault('DATABASE_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
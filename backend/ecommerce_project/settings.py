@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
+from decimal import Decimal
+
+from .database import database_config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -56,6 +60,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Per-view latency, query and serializer metrics, and ?profile=1 for staff (see api/metrics.py)
+    'api.metrics.RequestMetricsMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -84,12 +90,37 @@ WSGI_APPLICATION = 'ecommerce_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Configured from the environment (see ecommerce_project/database.py for the URL forms):
+# DATABASE_URL is the primary database, SQLite in db.sqlite3 by default. DATABASE_REPLICA_URL optionally
+# adds a read replica, which the read-only endpoints (product list, detail and search, the admin dashboard
+# stats) query while every write goes to the primary (see api/routers.py). Replication lag adds to the
+# staleness of the cached product responses.
+# Connections are reused across requests for DATABASE_CONN_MAX_AGE seconds and health-checked before
+# reuse. Under ASGI the default is 0 (set in asgi.py), as Django advises: persistent connections belong to
+# whichever thread ran the request's sync code and aren't reused reliably. With PostgreSQL,
+# DATABASE_POOL_MAX_SIZE > 0 uses a connection pool per worker process instead, the better choice there.
+# SQLite databases get tuned pragmas and immediate transactions, so concurrent checkouts queue for the
+# write lock instead of failing with "database is locked" (DATABASE_SQLITE_TUNING=false turns this off;
+# see SQLITE_PRAGMAS and the benchmark_sqlite_writes command). Switch a served SQLite database to WAL
+# once with the enable_sqlite_wal command.
+DATABASE_OPTIONS = {
+    'conn_max_age': int(os.environ.get('DATABASE_CONN_MAX_AGE', 60)),
+    'conn_health_checks': os.environ.get('DATABASE_CONN_HEALTH_CHECKS', 'true').lower() in ('1', 'true', 'yes'),
+    'pool_max_size': int(os.environ.get('DATABASE_POOL_MAX_SIZE', 0)),
+    'pool_min_size': int(os.environ.get('DATABASE_POOL_MIN_SIZE', 2)),
+    'pool_timeout': int(os.environ.get('DATABASE_POOL_TIMEOUT', 10)),
+    'sqlite_tuning': os.environ.get('DATABASE_SQLITE_TUNING', 'true').lower() in ('1', 'true', 'yes'),
+}
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3'), BASE_DIR, **DATABASE_OPTIONS),
 }
+if os.environ.get('DATABASE_REPLICA_URL'):
+    DATABASES['replica'] = database_config(os.environ['DATABASE_REPLICA_URL'], BASE_DIR, **DATABASE_OPTIONS)
+
+DATABASE_ROUTERS = ['api.routers.PrimaryReplicaRouter']
+# Alias of the read replica; None reads everything from the primary.
+DATABASE_READ_REPLICA = 'replica' if 'replica' in DATABASES else None
 
 
 # Password validation
@@ -144,16 +175,89 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django Rest Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Builds request.user from the token's signed claims instead of a per-request query (see api/authentication.py).
+        'api.authentication.ClaimsJWTAuthentication',
     )
 }
 
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Any Django cache backend works here (e.g. Redis or Memcached in production).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Cached product list/detail responses (see api/caching.py)
+PRODUCT_CACHE_ALIAS = 'default'
+PRODUCT_CACHE_TIMEOUT = 60 * 5
+
+# Image variants generated after upload (see api/images.py): resized to each width
+# (never upscaled), encoded in each format and stored under content-hashed names.
+IMAGE_VARIANT_WIDTHS = [320, 640, 1024]
+IMAGE_VARIANT_FORMATS = ['webp', 'avif']
+IMAGE_VARIANT_DIR = 'variants'
+# Generated by `run_jobs` workers, from jobs queued when an image is uploaded.
+
+# Product catalog pagination (see api/pagination.py)
+PRODUCT_PAGE_SIZE = 24
+PRODUCT_MAX_PAGE_SIZE = 100
+
+# Admin order list (see api/pagination.py)
+ADMIN_ORDER_PAGE_SIZE = 50
+ADMIN_ORDER_MAX_PAGE_SIZE = 200
+
+# Admin dashboard summary (see api/dashboard.py): seconds the payload is cached for,
+# and the number of recent orders / low-stock products it lists.
+ADMIN_DASHBOARD_CACHE_TIMEOUT = 15
+ADMIN_DASHBOARD_LIST_SIZE = 10
+
+# Request metrics (see api/metrics.py), served in the Prometheus format at /api/admin/metrics/:
+# the latency histogram's bucket bounds in seconds, and the rows of a ?profile=1 report.
+REQUEST_METRICS_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+REQUEST_PROFILE_ROWS = 40
+
+# Price (INR) charged for a custom T-shirt designed in the configurator
+CUSTOM_DESIGN_PRICE = Decimal('1000.00')
+
+# Custom designs that never made it into an order are purged after this many days
+# (see the purge_custom_designs management command)
+CUSTOM_DESIGN_RETENTION_DAYS = 7
+
+# Rendered design previews are cached by the hash of their design spec (see api/designs.py);
+# the least recently used ones are evicted beyond these bounds
+DESIGN_PREVIEW_CACHE_MAX_ENTRIES = 5000
+DESIGN_PREVIEW_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
 # Simple JWT settings for token lifetimes
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    # Tokens carry the claims and token version ClaimsJWTAuthentication checks.
+    "TOKEN_OBTAIN_SERIALIZER": "api.authentication.VersionedTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "api.authentication.VersionedTokenRefreshSerializer",
 }
 
+# Seconds a worker caches a user's token version (see api/authentication.py). Revoking tokens clears the
+# version from the cache at once, but only from the cache the revoking process can reach: with the
+# per-process LocMemCache above, other workers accept revoked access tokens for up to this long. Keep it
+# well under ACCESS_TOKEN_LIFETIME, or point CACHES at a shared cache for immediate revocation everywhere.
+TOKEN_VERSION_CACHE_TIMEOUT = 30
+
+# Logins (see api/passwords.py). Token buckets per client IP and per username, checked before any
+# password hashing: up to BURST attempts at once, refilled at RATE attempts per second.
+LOGIN_IP_BURST = 20
+LOGIN_IP_RATE = 1.0
+LOGIN_USERNAME_BURST = 5
+LOGIN_USERNAME_RATE = 0.1
+# Password hashing runs in this many worker processes (0 hashes on the request thread), with at most
+# PASSWORD_HASHER_MAX_PENDING hashes queued or running; a login that can't get a slot within
+# PASSWORD_HASHER_QUEUE_TIMEOUT seconds is answered with 503.
+PASSWORD_HASHER_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+PASSWORD_HASHER_MAX_PENDING = PASSWORD_HASHER_WORKERS * 4
+PASSWORD_HASHER_QUEUE_TIMEOUT = 2
+
 # CORS settings to allow communication with the React frontend
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -162,6 +266,43 @@ CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:5173",
 ]
 
+# How long (seconds) a verified payment's result is cached for replaying duplicate callbacks.
+# Results are also stored in the PaymentVerification table, so this only bounds the fast path.
+PAYMENT_IDEMPOTENCY_CACHE_TIMEOUT = 60 * 60 * 24
+
 RAZORPAY_KEY_ID = "{YOUR_ID_HERE}"
 RAZORPAY_KEY_SECRET = "{YOUR_SECRET_KEY_HERE}"
 
+
+# Base URL of the Razorpay REST API used by the async gateway client (see api/gateway.py).
+# Point it at a local stub to load-test checkout without hitting Razorpay (see the loadtest_checkout command).
+RAZORPAY_API_URL = "https://api.razorpay.com/v1"
+# Gateway client limits (see PaymentGateway): seconds to connect (or wait for a pooled connection)
+# and to wait for a response, and the size of the connection pool.
+RAZORPAY_CONNECT_TIMEOUT = 3
+RAZORPAY_READ_TIMEOUT = 10
+RAZORPAY_MAX_CONNECTIONS = 20
+# Calls that never reached the gateway are retried this many times, with jittered exponential backoff
+# starting at RAZORPAY_RETRY_BACKOFF seconds.
+RAZORPAY_MAX_RETRIES = 2
+RAZORPAY_RETRY_BACKOFF = 0.2
+# After this many consecutive failed calls the circuit breaker opens and checkouts fail fast
+# for RAZORPAY_BREAKER_RESET_TIMEOUT seconds before the gateway is tried again.
+RAZORPAY_BREAKER_FAILURE_THRESHOLD = 5
+RAZORPAY_BREAKER_RESET_TIMEOUT = 30
+
+# Background job queue (see api/jobs.py; workers are started with `python manage.py run_jobs`)
+JOB_MAX_ATTEMPTS = 5            # attempts before a job is marked dead
+JOB_RETRY_BACKOFF = 10          # seconds before the first retry, doubling after each failure
+JOB_RETRY_MAX_BACKOFF = 60 * 60
+JOB_LOCK_TIMEOUT = 60 * 10      # a job RUNNING for longer is assumed to have lost its worker
+JOB_POLL_INTERVAL = 1           # seconds an idle worker waits before polling again
+JOB_BATCH_SIZE = 20             # jobs claimed per poll
+
+# Products below this stock level trigger a low-stock email to staff after a paid order
+LOW_STOCK_THRESHOLD = 10
+
+# Outgoing email (order confirmations, low-stock alerts); printed to the console in development
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+DEFAULT_FROM_EMAIL = 'T-Shirt Store <no-reply@example.com>'
+
@@ -0,0 +1,14 @@
+"""
+Settings for the test suite: `python manage.py test` uses them (see manage.py); other runners should set
+DJANGO_SETTINGS_MODULE=ecommerce_project.settings_test.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, DATABASE_OPTIONS, DATABASES, database_config
+
+# A second SQLite database stands in for the replica, so the routing tests can tell which one was read.
+if 'replica' not in DATABASES:
+    DATABASES['replica'] = database_config('sqlite:///db-replica.sqlite3', BASE_DIR, **DATABASE_OPTIONS)
+
+# Off except in the tests that enable it, since the test replica is a separate, empty database rather
+# than a copy of the primary.
+DATABASE_READ_REPLICA = None
@@ -6,7 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ecommerce_project.settings')
+    # The test runner gets the test settings (with a stand-in read replica).
+    test = sys.argv[1:2] == ['test']
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ecommerce_project.settings_test' if test else 'ecommerce_project.settings')
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -1,6 +1,7 @@
 import React from 'react';
+import CursorPager from './CursorPager';
 
-const AdminCategories = ({ products, error, handleCategoryToggle }) => {
+const AdminCategories = ({ products, productPages, handleProductPageChange, error, handleCategoryToggle }) => {
   return (
     <div className="p-6">
       <h3 className="text-xl font-semibold mb-4">Manage T-shirt Categories</h3>
@@ -47,6 +48,7 @@ const AdminCategories = ({ products, error, handleCategoryToggle }) => {
           </tbody>
         </table>
       </div>
+      <CursorPager pages={productPages} onPageChange={handleProductPageChange} />
       {error && <div className="text-sm text-red-500 mt-2">{error}</div>}
     </div>
   );
@@ -10,13 +10,25 @@ import AdminUsers from './AdminUsers';
 
 const API_BASE_URL = 'http://localhost:8000/api';
 
+// Drops empty filter values so they aren't sent as `?status=`.
+const activeParams = (filters) => Object.fromEntries(Object.entries(filters).filter(([, value]) => value));
+
 const AdminDashboard = () => {
   const [activeTab, setActiveTab] = useState('stats');
   const [stats, setStats] = useState(null);
   const [products, setProducts] = useState([]);
+  // The product list is cursor-paginated too; edits reload the page being shown (`productPageUrl`).
+  const [productPages, setProductPages] = useState({ next: null, previous: null });
+  const [productPageUrl, setProductPageUrl] = useState(null);
   const [orders, setOrders] = useState([]);
+  // The admin order list is paginated, filtered and sorted server-side.
+  const [orderFilters, setOrderFilters] = useState({ ordering: '-created_at' });
+  const [orderPages, setOrderPages] = useState({ next: null, previous: null });
+  const [selectedOrder, setSelectedOrder] = useState(null);
   const [users, setUsers] = useState([]);
   const [isLoading, setIsLoading] = useState(true);
+  // Tabs whose lists were fetched; each list is loaded the first time its tab is opened.
+  const [loadedTabs, setLoadedTabs] = useState({});
   const [error, setError] = useState('');
 
   // Product Management States
@@ -33,10 +45,13 @@ const AdminDashboard = () => {
   const accessToken = localStorage.getItem('access_token');
   const navigate = useNavigate(); // Hook for navigation
 
-  const fetchProducts = async () => {
+  // Fetches the first page of the catalog, or the page at `pageUrl` (a `next`/`previous` link of the product list).
+  const fetchProducts = async (pageUrl = null) => {
     try {
-      const productsResponse = await axios.get(`${API_BASE_URL}/products/`, { headers: { 'Authorization': `Bearer ${accessToken}` } });
-      setProducts(productsResponse.data);
+      const productsResponse = await axios.get(pageUrl || `${API_BASE_URL}/products/`, { headers: { 'Authorization': `Bearer ${accessToken}` } });
+      setProducts(productsResponse.data.results);
+      setProductPages({ next: productsResponse.data.next, previous: productsResponse.data.previous });
+      setProductPageUrl(pageUrl);
     } catch (err) {
       console.error('Error fetching products:', err);
       setError('Failed to load products. Please check your permissions.');
@@ -53,22 +68,49 @@ const AdminDashboard = () => {
     }
   };
 
-  const fetchAllData = async () => {
+  const showOrderPage = (data) => {
+    setOrders(data.results);
+    setOrderPages({ next: data.next, previous: data.previous });
+  };
+
+  // Fetches the first page for `filters`, or the page at `pageUrl` (a `next`/`previous` link, which keeps the filters).
+  const fetchOrders = async (filters = orderFilters, pageUrl = null) => {
+    try {
+      const ordersResponse = await axios.get(pageUrl || `${API_BASE_URL}/admin/orders/`, {
+        headers: { 'Authorization': `Bearer ${accessToken}` },
+        params: pageUrl ? undefined : activeParams(filters),
+      });
+      showOrderPage(ordersResponse.data);
+      setError('');
+    } catch (err) {
+      console.error('Error fetching orders:', err.response?.data);
+      setError('Failed to load orders. Check the filters.');
+    }
+  };
+
+  const handleOrderFiltersChange = (filters) => {
+    setOrderFilters(filters);
+    setSelectedOrder(null);
+    fetchOrders(filters);
+  };
+
+  const handleViewOrder = async (orderId) => {
+    try {
+      const orderResponse = await axios.get(`${API_BASE_URL}/admin/orders/${orderId}/`, { headers: { 'Authorization': `Bearer ${accessToken}` } });
+      setSelectedOrder(orderResponse.data);
+    } catch (err) {
+      console.error('Error fetching order:', err);
+      setError('Failed to load order details.');
+    }
+  };
+
+  // The stats tab needs a single request: the summary carries the charts, KPIs, recent orders and low stock.
+  const fetchDashboard = async () => {
     setIsLoading(true);
     setError('');
     try {
-      const authHeaders = { 'Authorization': `Bearer ${accessToken}` };
-      const [statsResponse, productsResponse, ordersResponse, usersResponse] = await Promise.all([
-        axios.get(`${API_BASE_URL}/admin/stats/`, { headers: authHeaders }),
-        axios.get(`${API_BASE_URL}/products/`, { headers: authHeaders }),
-        axios.get(`${API_BASE_URL}/admin/orders/`, { headers: authHeaders }),
-        axios.get(`${API_BASE_URL}/admin/users/`, { headers: authHeaders }),
-      ]);
-
-      setStats(statsResponse.data);
-      setProducts(productsResponse.data);
-      setOrders(ordersResponse.data);
-      setUsers(usersResponse.data);
+      const summaryResponse = await axios.get(`${API_BASE_URL}/admin/dashboard/`, { headers: { 'Authorization': `Bearer ${accessToken}` } });
+      setStats(summaryResponse.data);
     } catch (err) {
       console.error('Error fetching admin data:', err);
       setError('Failed to load dashboard data. Please check your permissions.');
@@ -78,9 +120,20 @@ const AdminDashboard = () => {
   };
 
   useEffect(() => {
-    fetchAllData();
+    fetchDashboard();
   }, []);
 
+  useEffect(() => {
+    const tabLoaders = { products: () => fetchProducts(), categories: () => fetchProducts(), orders: () => fetchOrders(), users: fetchUsers };
+    const loadTab = tabLoaders[activeTab];
+    // Products and categories share one paged list, so opening either one loads it for both.
+    const listName = activeTab === 'categories' ? 'products' : activeTab;
+    if (loadTab && !loadedTabs[listName]) {
+      setLoadedTabs(prevLoaded => ({ ...prevLoaded, [listName]: true }));
+      loadTab();
+    }
+  }, [activeTab]);
+
 
   // --- Logout Handler (FIXED) ---
   const handleLogout = () => {
@@ -112,7 +165,7 @@ const AdminDashboard = () => {
     if (window.confirm('Are you sure you want to delete this product?')) {
       try {
         await axios.delete(`${API_BASE_URL}/products/${productId}/`, { headers: { 'Authorization': `Bearer ${accessToken}` } });
-        fetchProducts();
+        fetchProducts(productPageUrl);
       } catch (err) {
         console.error('Error deleting product:', err);
         setFormError('Failed to delete product.');
@@ -147,7 +200,7 @@ const AdminDashboard = () => {
       setIsFormOpen(false);
       setEditingProduct(null);
       setImageFile(null);
-      fetchProducts();
+      fetchProducts(productPageUrl);
     } catch (err) {
       console.error('Error saving product:', err.response?.data);
       setFormError('Failed to save product. Check the form data.');
@@ -216,7 +269,7 @@ const AdminDashboard = () => {
         payload[category] = !product[category];
         const categoryHeaders = { 'Authorization': `Bearer ${accessToken}`, 'Content-Type': 'application/json' };
         await axios.patch(`${API_BASE_URL}/products/${productId}/`, payload, { headers: categoryHeaders });
-        fetchProducts();
+        fetchProducts(productPageUrl);
       }
     } catch (err) {
       console.error('Error toggling category:', err);
@@ -237,6 +290,7 @@ const AdminDashboard = () => {
           order.id === orderId ? { ...order, status: newStatus } : order
         )
       );
+      setSelectedOrder(prevOrder => (prevOrder?.id === orderId ? { ...prevOrder, status: newStatus } : prevOrder));
       setError('');
     } catch (err) {
       console.error('Error updating order status:', err.response?.data);
@@ -244,6 +298,26 @@ const AdminDashboard = () => {
     }
   };
 
+  // --- Export Handler ---
+  // Downloads a streaming CSV/NDJSON export, e.g. handleExport('orders', 'csv', { status: 'SHIPPED' }).
+  const handleExport = async (resource, format, filters = {}) => {
+    try {
+      const response = await axios.get(`${API_BASE_URL}/admin/${resource}/export/${format}/`, {
+        headers: { 'Authorization': `Bearer ${accessToken}` },
+        params: filters,
+        responseType: 'blob',
+      });
+      const url = URL.createObjectURL(response.data);
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = `${resource}-${new Date().toISOString().slice(0, 10)}.${format}`;
+      link.click();
+      URL.revokeObjectURL(url);
+    } catch (err) {
+      console.error(`Error exporting ${resource}:`, err);
+      setError(`Failed to export ${resource}.`);
+    }
+  };
 
   const renderContent = () => {
     if (isLoading) {
@@ -260,6 +334,8 @@ const AdminDashboard = () => {
         return (
           <AdminProducts
             products={products}
+            productPages={productPages}
+            handleProductPageChange={fetchProducts}
             isFormOpen={isFormOpen}
             editingProduct={editingProduct}
             formError={formError}
@@ -277,12 +353,28 @@ const AdminDashboard = () => {
         return (
           <AdminCategories
             products={products}
+            productPages={productPages}
+            handleProductPageChange={fetchProducts}
             error={error}
             handleCategoryToggle={handleCategoryToggle}
           />
         );
       case 'orders':
-        return <AdminOrders orders={orders} handleUpdateOrderStatus={handleUpdateOrderStatus} generalError={error} />;
+        return (
+          <AdminOrders
+            orders={orders}
+            orderFilters={orderFilters}
+            orderPages={orderPages}
+            selectedOrder={selectedOrder}
+            setSelectedOrder={setSelectedOrder}
+            handleOrderFiltersChange={handleOrderFiltersChange}
+            handleOrderPageChange={(pageUrl) => fetchOrders(orderFilters, pageUrl)}
+            handleViewOrder={handleViewOrder}
+            handleUpdateOrderStatus={handleUpdateOrderStatus}
+            handleExport={handleExport}
+            generalError={error}
+          />
+        );
       case 'users':
         return (
           <AdminUsers
@@ -295,6 +387,7 @@ const AdminDashboard = () => {
             handleUserFormSubmit={handleUserFormSubmit}
             handleEditUserClick={handleEditUserClick}
             handleDeleteUser={handleDeleteUser}
+            handleExport={handleExport}
           />
         );
       default:
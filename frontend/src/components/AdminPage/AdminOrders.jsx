@@ -1,7 +1,29 @@
-import React from 'react';
+import React, { useState } from 'react';
+import CursorPager from './CursorPager';
 
-const AdminOrders = ({ orders, handleUpdateOrderStatus, generalError }) => {
+const SORT_OPTIONS = [
+  { value: '-created_at', label: 'Newest first' },
+  { value: 'created_at', label: 'Oldest first' },
+  { value: '-total_price', label: 'Highest total' },
+  { value: 'total_price', label: 'Lowest total' },
+];
+
+const AdminOrders = ({
+  orders,
+  orderFilters,
+  orderPages,
+  selectedOrder,
+  setSelectedOrder,
+  handleOrderFiltersChange,
+  handleOrderPageChange,
+  handleViewOrder,
+  handleUpdateOrderStatus,
+  handleExport,
+  generalError,
+}) => {
   const STATUS_OPTIONS = ['PROCESSING', 'SHIPPED', 'DELIVERED', 'CANCELLED'];
+  // Filter inputs are applied on submit, so typing doesn't fire a request per keystroke.
+  const [draftFilters, setDraftFilters] = useState(orderFilters);
 
   const getStatusColor = (status) => {
     switch (status) {
@@ -23,9 +45,70 @@ const AdminOrders = ({ orders, handleUpdateOrderStatus, generalError }) => {
     handleUpdateOrderStatus(orderId, newStatus);
   };
 
+  const handleDraftChange = (e) => {
+    setDraftFilters({ ...draftFilters, [e.target.name]: e.target.value });
+  };
+
+  const handleFilterSubmit = (e) => {
+    e.preventDefault();
+    handleOrderFiltersChange(draftFilters);
+  };
+
+  const handleSortChange = (e) => {
+    const filters = { ...orderFilters, ordering: e.target.value };
+    setDraftFilters({ ...draftFilters, ordering: e.target.value });
+    handleOrderFiltersChange(filters);
+  };
+
+  // Exports use the same filters as the list; the sort order doesn't apply to them.
+  const { ordering, ...exportFilters } = orderFilters;
+
   return (
     <div className="p-6">
-      <h3 className="text-xl font-semibold mb-4">User Orders</h3>
+      <div className="flex items-center justify-between mb-4">
+        <h3 className="text-xl font-semibold">User Orders</h3>
+        <div className="space-x-2">
+          <button onClick={() => handleExport('orders', 'csv', exportFilters)} className="px-3 py-1 text-sm bg-gray-200 rounded-md hover:bg-gray-300">Export CSV</button>
+          <button onClick={() => handleExport('orders', 'ndjson', exportFilters)} className="px-3 py-1 text-sm bg-gray-200 rounded-md hover:bg-gray-300">Export NDJSON</button>
+        </div>
+      </div>
+      <form onSubmit={handleFilterSubmit} className="flex flex-wrap items-end gap-3 mb-4 text-sm">
+        <label className="flex flex-col">
+          Status
+          <select name="status" value={draftFilters.status || ''} onChange={handleDraftChange} className="p-1 border rounded-md">
+            <option value="">All</option>
+            <option value="PENDING">PENDING</option>
+            {STATUS_OPTIONS.map(status => (
+              <option key={status} value={status}>{status}</option>
+            ))}
+          </select>
+        </label>
+        <label className="flex flex-col">
+          From
+          <input type="date" name="from" value={draftFilters.from || ''} onChange={handleDraftChange} className="p-1 border rounded-md" />
+        </label>
+        <label className="flex flex-col">
+          To
+          <input type="date" name="to" value={draftFilters.to || ''} onChange={handleDraftChange} className="p-1 border rounded-md" />
+        </label>
+        <label className="flex flex-col">
+          Customer
+          <input type="text" name="customer" placeholder="ID or username" value={draftFilters.customer || ''} onChange={handleDraftChange} className="p-1 border rounded-md" />
+        </label>
+        <label className="flex flex-col">
+          Razorpay order ID
+          <input type="text" name="razorpay_order_id" value={draftFilters.razorpay_order_id || ''} onChange={handleDraftChange} className="p-1 border rounded-md" />
+        </label>
+        <button type="submit" className="px-3 py-1 bg-blue-600 text-white rounded-md hover:bg-blue-700">Apply</button>
+        <label className="flex flex-col ml-auto">
+          Sort by
+          <select value={orderFilters.ordering} onChange={handleSortChange} className="p-1 border rounded-md">
+            {SORT_OPTIONS.map(option => (
+              <option key={option.value} value={option.value}>{option.label}</option>
+            ))}
+          </select>
+        </label>
+      </form>
       {generalError && <div className="text-sm text-red-500 mb-4">{generalError}</div>}
       <div className="overflow-x-auto">
         <table className="min-w-full bg-white rounded-lg shadow-sm">
@@ -33,6 +116,7 @@ const AdminOrders = ({ orders, handleUpdateOrderStatus, generalError }) => {
             <tr className="bg-gray-200 text-left text-sm font-semibold text-gray-600">
               <th className="p-3">Order ID</th>
               <th className="p-3">Customer</th>
+              <th className="p-3">Items</th>
               <th className="p-3">Total</th>
               <th className="p-3">Status</th>
               <th className="p-3">Date</th>
@@ -41,8 +125,11 @@ const AdminOrders = ({ orders, handleUpdateOrderStatus, generalError }) => {
           <tbody>
             {orders.map(order => (
               <tr key={order.id} className="border-b border-gray-200 hover:bg-gray-100">
-                <td className="p-3 text-sm">{order.id}</td>
-                <td className="p-3 text-sm">{order.customer.username}</td>
+                <td className="p-3 text-sm">
+                  <button onClick={() => handleViewOrder(order.id)} className="text-blue-600 hover:underline">{order.id}</button>
+                </td>
+                <td className="p-3 text-sm">{order.customer_username}</td>
+                <td className="p-3 text-sm">{order.item_count}</td>
                 <td className="p-3 text-sm">₹{order.total_price}</td>
                 <td className="p-3 text-sm">
                   <select
@@ -64,8 +151,27 @@ const AdminOrders = ({ orders, handleUpdateOrderStatus, generalError }) => {
           </tbody>
         </table>
       </div>
+      <CursorPager pages={orderPages} onPageChange={handleOrderPageChange} />
+      {selectedOrder && (
+        <div className="mt-6 p-4 bg-white rounded-lg shadow-sm">
+          <div className="flex items-center justify-between mb-2">
+            <h4 className="font-semibold">
+              Order #{selectedOrder.id} by {selectedOrder.customer.username} ({selectedOrder.customer.email})
+            </h4>
+            <button onClick={() => setSelectedOrder(null)} className="text-sm text-gray-500 hover:text-gray-900">Close</button>
+          </div>
+          <ul className="text-sm space-y-1">
+            {selectedOrder.items.map(item => (
+              <li key={item.id}>
+                {item.quantity} × {item.product ? item.product.name : item.custom_design?.name} — ₹{item.price}
+              </li>
+            ))}
+          </ul>
+          <div className="text-sm mt-2">Total: ₹{selectedOrder.total_price} · {selectedOrder.status}</div>
+        </div>
+      )}
     </div>
   );
 };
 
-export default AdminOrders;
\ No newline at end of file
+export default AdminOrders;
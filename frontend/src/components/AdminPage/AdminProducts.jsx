@@ -1,4 +1,5 @@
 import React, { useState } from 'react';
+import CursorPager from './CursorPager';
 
 const ProductForm = ({ editingProduct, formError, setIsFormOpen, setEditingProduct, handleProductFormSubmit }) => {
   const [currentImageFile, setCurrentImageFile] = useState(null);
@@ -92,7 +93,7 @@ const ProductForm = ({ editingProduct, formError, setIsFormOpen, setEditingProdu
   );
 };
 
-const ProductList = ({ products, handleAddProductClick, handleEditProductClick, handleDeleteProduct }) => (
+const ProductList = ({ products, productPages, handleProductPageChange, handleAddProductClick, handleEditProductClick, handleDeleteProduct }) => (
   <div className="p-6">
     <div className="flex justify-between items-center mb-4">
       <h3 className="text-xl font-semibold">Manage Products</h3>
@@ -129,12 +130,15 @@ const ProductList = ({ products, handleAddProductClick, handleEditProductClick,
         </div>
       ))}
     </div>
+    <CursorPager pages={productPages} onPageChange={handleProductPageChange} />
   </div>
 );
 
 
 const AdminProducts = ({ 
   products, 
+  productPages,
+  handleProductPageChange,
   isFormOpen, 
   editingProduct, 
   formError, 
@@ -160,6 +164,8 @@ const AdminProducts = ({
   return (
     <ProductList 
       products={products} 
+      productPages={productPages}
+      handleProductPageChange={handleProductPageChange}
       handleAddProductClick={handleAddProductClick} 
       handleEditProductClick={handleEditProductClick}
       handleDeleteProduct={handleDeleteProduct}
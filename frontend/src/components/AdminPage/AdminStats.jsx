@@ -401,6 +401,55 @@ const AdminStats = ({ stats, productAnalytics }) => {
         </div>
       </section>
 
+      {/* Recent orders and low-stock products, both part of the dashboard summary */}
+      <section className="mb-10 grid grid-cols-1 lg:grid-cols-2 gap-6">
+        <div className="bg-white p-6 rounded-xl shadow-lg">
+          <h3 className="text-lg font-semibold text-gray-700 mb-4 flex items-center">
+            <Clock className="w-5 h-5 mr-2 text-indigo-600" /> Recent Orders
+          </h3>
+          <table className="min-w-full text-sm">
+            <tbody>
+              {(stats.recent_orders || []).map(order => (
+                <tr key={order.id} className="border-b border-gray-100">
+                  <td className="py-2">#{order.id}</td>
+                  <td className="py-2">{order.customer_username}</td>
+                  <td className="py-2">{order.item_count} items</td>
+                  <td className="py-2">₹{order.total_price}</td>
+                  <td className="py-2 text-gray-500">{order.status}</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+        <div className="bg-white p-6 rounded-xl shadow-lg">
+          <h3 className="text-lg font-semibold text-gray-700 mb-4 flex items-center">
+            <Package className="w-5 h-5 mr-2 text-red-600" /> Low Stock
+            {stats.kpis && (
+              <span className="ml-2 text-sm font-normal text-gray-400">
+                {stats.kpis.low_stock_products} below {stats.low_stock_threshold}, {stats.kpis.out_of_stock_products} sold out
+              </span>
+            )}
+          </h3>
+          <table className="min-w-full text-sm">
+            <tbody>
+              {(stats.low_stock || []).map(product => (
+                <tr key={product.id} className="border-b border-gray-100">
+                  <td className="py-2">{product.name}</td>
+                  <td className={`py-2 text-right font-semibold ${product.stock === 0 ? 'text-red-600' : 'text-amber-600'}`}>{product.stock} left</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+        {stats.kpis && (
+          <div className="lg:col-span-2 text-xs text-gray-400 flex items-center">
+            <Users className="w-4 h-4 mr-1" />
+            {stats.kpis.users} users ({stats.kpis.users_joined_today} joined today) · {stats.kpis.products} products ·
+            {' '}updated {new Date(stats.generated_at).toLocaleTimeString()}
+          </div>
+        )}
+      </section>
+
       {/* 2. Analytics Charts Section - Grouping all charts for a clean layout */}
       <section>
         <h3 className="text-xl font-semibold text-gray-700 mb-5">Order Trends & Visualization</h3>
@@ -65,9 +65,15 @@ const UserForm = ({ editingUser, userFormError, setIsUserFormOpen, setEditingUse
   </div>
 );
 
-const UserList = ({ users, handleEditUserClick, handleDeleteUser }) => (
+const UserList = ({ users, handleEditUserClick, handleDeleteUser, handleExport }) => (
   <div className="p-6">
-    <h3 className="text-xl font-semibold mb-4">Registered Users</h3>
+    <div className="flex items-center justify-between mb-4">
+      <h3 className="text-xl font-semibold">Registered Users</h3>
+      <div className="space-x-2">
+        <button onClick={() => handleExport('users', 'csv')} className="px-3 py-1 text-sm bg-gray-200 rounded-md hover:bg-gray-300">Export CSV</button>
+        <button onClick={() => handleExport('users', 'ndjson')} className="px-3 py-1 text-sm bg-gray-200 rounded-md hover:bg-gray-300">Export NDJSON</button>
+      </div>
+    </div>
     <div className="overflow-x-auto">
       <table className="min-w-full bg-white rounded-lg shadow-sm">
         <thead>
@@ -124,7 +130,8 @@ const AdminUsers = ({
   setEditingUser, 
   handleUserFormSubmit,
   handleEditUserClick,
-  handleDeleteUser
+  handleDeleteUser,
+  handleExport
 }) => {
   if (isUserFormOpen && editingUser) {
     return (
@@ -143,6 +150,7 @@ const AdminUsers = ({
       users={users} 
       handleEditUserClick={handleEditUserClick} 
       handleDeleteUser={handleDeleteUser} 
+      handleExport={handleExport}
     />
   );
 };
@@ -0,0 +1,23 @@
+import React from 'react';
+
+// Previous/Next buttons for a cursor-paginated list; `pages` holds the `next`/`previous` links of the current page.
+const CursorPager = ({ pages, onPageChange }) => (
+  <div className="flex justify-end space-x-2 mt-4">
+    <button
+      onClick={() => onPageChange(pages.previous)}
+      disabled={!pages.previous}
+      className="px-3 py-1 text-sm bg-gray-200 rounded-md hover:bg-gray-300 disabled:opacity-50"
+    >
+      Previous
+    </button>
+    <button
+      onClick={() => onPageChange(pages.next)}
+      disabled={!pages.next}
+      className="px-3 py-1 text-sm bg-gray-200 rounded-md hover:bg-gray-300 disabled:opacity-50"
+    >
+      Next
+    </button>
+  </div>
+);
+
+export default CursorPager;
@@ -190,7 +190,8 @@ export default function CheckoutSection() {
 
     // 1. Prepare Order Payload
     const orderItemsPayload = cartItems.map(item => ({
-        product_id: item.id,
+        // Configurator designs are ordered by design id, catalog items by product id
+        ...(item.customDesignId ? { custom_design_id: item.customDesignId } : { product_id: item.id }),
         quantity: item.quantity,
         price: item.price 
     }));
@@ -27,6 +27,7 @@ export default function App() {
   const [text, setText] = useState('NEXUS');
   const [textColor, setTextColor] = useState('#ffffff');
   const [backgroundImage, setBackgroundImage] = useState(null);
+  const [decalHash, setDecalHash] = useState(null);
   const [textSize, setTextSize] = useState(50);
   const [textPosition] = useState({ x: 300, y: 575 });
   const [isProcessing, setIsProcessing] = useState(false);
@@ -144,6 +145,10 @@ export default function App() {
 
   const loadImage = (file, setImage) => {
     if (!file) return;
+    // The decal is part of the design spec, identified by the SHA-256 of its bytes.
+    file.arrayBuffer()
+      .then((bytes) => crypto.subtle.digest('SHA-256', bytes))
+      .then((digest) => setDecalHash(Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, '0')).join('')));
     const reader = new FileReader();
     reader.onload = (e) => {
       const img = new Image();
@@ -153,6 +158,29 @@ export default function App() {
     reader.readAsDataURL(file);
   };
   
+  const addDesignToCart = (newDesign) => {
+    const MOCK_CART_KEY = 'mockCart';
+    const storedCart = JSON.parse(localStorage.getItem(MOCK_CART_KEY) || '[]');
+    const newCartItem = {
+        id: `custom-${newDesign.id}`, customDesignId: newDesign.id, name: newDesign.name, price: newDesign.price,
+        image: newDesign.image, quantity: 1, size: 'M', color: 'Custom',
+    };
+    storedCart.push(newCartItem);
+    localStorage.setItem(MOCK_CART_KEY, JSON.stringify(storedCart));
+    navigate('/cart');
+  };
+
+  const handleDesignResponse = async (response) => {
+    if (response.ok) {
+        addDesignToCart(await response.json());
+    } else if (response.status === 43) {
+         alert("Permission Denied: Your account cannot create products. Please log in as an admin or contact support.");
+    } else {
+        const errorData = await response.json();
+        alert(`An error occurred: ${JSON.stringify(errorData)}`);
+    }
+  };
+
   const handleExportAndOrder = async () => {
     setIsProcessing(true);
     const token = localStorage.getItem('access_token');
@@ -160,7 +188,35 @@ export default function App() {
         navigate('/auth');
         return;
     }
-    
+
+    const name = `Custom NEXUS T-Shirt - ${Date.now()}`;
+    const spec = {
+        shirt_color: color, text, text_color: textColor, text_size: textSize,
+        text_position: textPosition, decal_sha256: decalHash,
+    };
+
+    // If this exact design was rendered before, the server reuses its preview: no snapshot upload needed.
+    try {
+        const lookup = await fetch('http://127.0.0.1:8000/api/custom-designs/lookup/', {
+            method: 'POST',
+            headers: { 'Authorization': `Bearer ${token}`, 'Content-Type': 'application/json' },
+            body: JSON.stringify(spec),
+        });
+        if (lookup.ok && (await lookup.json()).cached) {
+            const response = await fetch('http://127.0.0.1:8000/api/custom-designs/', {
+                method: 'POST',
+                headers: { 'Authorization': `Bearer ${token}`, 'Content-Type': 'application/json' },
+                body: JSON.stringify({ name, spec }),
+            });
+            await handleDesignResponse(response);
+            setIsProcessing(false);
+            return;
+        }
+    } catch (error) {
+        // Fall back to uploading a snapshot.
+        console.error("Error looking up design preview:", error);
+    }
+
     // --- THIS IS THE MODIFIED LINE ---
     // Capture the 3D view canvas, not the 2D texture canvas
     rendererRef.current.domElement.toBlob(async (blob) => {
@@ -170,37 +226,18 @@ export default function App() {
             return;
         }
         const formData = new FormData();
-        formData.append('name', `Custom NEXUS T-Shirt - ${Date.now()}`);
-        formData.append('description', `Custom design with color: ${color} and text: "${text}".`);
-        formData.append('price', '1000');
-        formData.append('stock', '1');
+        formData.append('name', name);
+        formData.append('spec', JSON.stringify(spec));
         formData.append('image', blob, 'custom_snapshot.png'); // Upload the snapshot
-        formData.append('is_custom', 'true');
         try {
-            const response = await fetch('http://127.0.0.1:8000/api/products/', {
+            const response = await fetch('http://127.0.0.1:8000/api/custom-designs/', {
                 method: 'POST',
                 headers: { 'Authorization': `Bearer ${token}` },
                 body: formData,
             });
-            if (response.ok) {
-                const newProduct = await response.json();
-                const MOCK_CART_KEY = 'mockCart';
-                const storedCart = JSON.parse(localStorage.getItem(MOCK_CART_KEY) || '[]');
-                const newCartItem = {
-                    id: newProduct.id, name: newProduct.name, price: newProduct.price,
-                    image: newProduct.image, quantity: 1, size: 'M', color: 'Custom',
-                };
-                storedCart.push(newCartItem);
-                localStorage.setItem(MOCK_CART_KEY, JSON.stringify(storedCart));
-                navigate('/cart');
-            } else if (response.status === 43) {
-                 alert("Permission Denied: Your account cannot create products. Please log in as an admin or contact support.");
-            } else {
-                const errorData = await response.json();
-                alert(`An error occurred: ${JSON.stringify(errorData)}`);
-            }
+            await handleDesignResponse(response);
         } catch (error) {
-            console.error("Error creating custom product:", error);
+            console.error("Error creating custom design:", error);
             alert("A network error occurred. Please check your connection and try again.");
         } finally {
             setIsProcessing(false);
@@ -232,6 +269,7 @@ export default function App() {
                     <input type="color" value={color} onChange={(e) => {
                         setColor(e.target.value);
                         setBackgroundImage(null);
+                        setDecalHash(null);
                     }} className="w-10 h-10 p-0 border-none rounded-md cursor-pointer"/>
                 </div>
             </CollapsibleSection>
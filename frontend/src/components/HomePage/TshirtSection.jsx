@@ -45,7 +45,10 @@ const ProductCard = ({ product }) => {
       <div className="bg-white rounded-lg overflow-hidden h-full flex flex-col">
         <div className="bg-gray-100 p-4 flex items-center justify-center h-64 flex-shrink-0">
           <img
-            src={product.image}
+            // Resized WebP variants from the backend when available, the original upload otherwise
+            src={product.image_srcset?.thumbnail || product.image}
+            srcSet={product.image_srcset?.webp}
+            sizes="256px"
             alt={product.name}
             className="h-full w-auto object-contain"
             onError={(e) => {
@@ -178,9 +181,9 @@ export default function TshirtSection() {
             axios.get(`${API_BASE_URL}/products/?is_trending=true`),
             axios.get(`${API_BASE_URL}/products/?is_bestseller=true`),
           ]);
-        setFeaturedProducts(featuredResponse.data);
-        setTrendingProducts(trendingResponse.data);
-        setBestsellerProducts(bestsellerResponse.data);
+        setFeaturedProducts(featuredResponse.data.results);
+        setTrendingProducts(trendingResponse.data.results);
+        setBestsellerProducts(bestsellerResponse.data.results);
       } catch (err) {
         setError(
           "Failed to fetch products. Please check the backend connection."
@@ -153,10 +153,10 @@ export default function OrderHistoryPage() {
                                     {order.items.map((item) => (
                                         <div key={item.id} className="flex items-start space-x-4">
                                             <div className="w-16 h-16 bg-gray-100 rounded-md overflow-hidden flex-shrink-0">
-                                                {/* Note: item.product is a nested object returned by your OrderSerializer */}
+                                                {/* Note: item.product (or item.custom_design for configurator orders) is a nested object returned by your OrderSerializer */}
                                                 <img 
-                                                    src={item.product.image || "https://placehold.co/64x64/E5E7EB/4B5563?text=N"} 
-                                                    alt={item.product.name} 
+                                                    src={(item.product || item.custom_design).image || "https://placehold.co/64x64/E5E7EB/4B5563?text=N"} 
+                                                    alt={(item.product || item.custom_design).name} 
                                                     className="w-full h-full object-cover"
                                                     onError={(e) => {
                                                         e.target.onerror = null; 
@@ -165,7 +165,7 @@ export default function OrderHistoryPage() {
                                                 />
                                             </div>
                                             <div className="flex-1 min-w-0">
-                                                <p className="font-medium text-gray-800 truncate">{item.product.name}</p>
+                                                <p className="font-medium text-gray-800 truncate">{(item.product || item.custom_design).name}</p>
                                                 <p className="text-sm text-gray-500">Qty: {item.quantity} @ {formatPrice(item.price)} each</p>
                                             </div>
                                             <p className="font-semibold text-right flex-shrink-0">
@@ -34,8 +34,10 @@ const ProductCard = ({ product }) => {
         {/* Product Image Area */}
         <div className="bg-gray-100 mb-2 overflow-hidden aspect-square">
           <img
-            // Use the actual image field from the backend
-            src={product.image || `https://placehold.co/400x400/f3f4f6/9ca3af?text=Image+Missing`}
+            // Use the resized WebP variants from the backend, falling back to the original upload
+            src={product.image_srcset?.thumbnail || product.image || `https://placehold.co/400x400/f3f4f6/9ca3af?text=Image+Missing`}
+            srcSet={product.image_srcset?.webp}
+            sizes="(min-width: 1024px) 33vw, 50vw"
             alt={product.name}
             className="w-full h-full object-cover transition-transform duration-300 group-hover:scale-105"
             onError={(e) => {
@@ -140,9 +142,11 @@ function ProductGridDisplay() {
         setIsLoading(true);
         setError(null);
         try {
-            // Fetch ALL products from your backend endpoint
-            const response = await axios.get(`${API_BASE_URL}/products/`);
-            setAllProducts(response.data);
+            // Search server-side when there is a query, otherwise fetch the newest page of products
+            const response = searchQuery
+                ? await axios.get(`${API_BASE_URL}/products/search/`, { params: { q: searchQuery, limit: 100 } })
+                : await axios.get(`${API_BASE_URL}/products/`, { params: { page_size: 100 } });
+            setAllProducts(response.data.results);
         } catch (err) {
             setError("Failed to fetch products. Check backend API status.");
             console.error("Error fetching products:", err);
@@ -151,7 +155,7 @@ function ProductGridDisplay() {
         }
     };
     fetchProducts();
-  }, []); // Empty dependency array means it runs once on mount
+  }, [searchQuery]); // Re-fetch whenever the search query changes
 
   // Handlers (Same as before)
   const handleFilterChange = (key, value) => {
@@ -178,17 +182,8 @@ function ProductGridDisplay() {
   const processedProducts = useMemo(() => {
     let results = allProducts.filter(product => {
       
-      // 1. Apply Search Query Filter
-      if (searchQuery) {
-        // Check if product name or description contains the query
-        const nameMatch = product.name.toLowerCase().includes(searchQuery);
-        const descriptionMatch = product.description.toLowerCase().includes(searchQuery);
-        
-        if (!nameMatch && !descriptionMatch) {
-            return false; 
-        }
-      }
-      
+      // 1. The search query is matched server-side by /products/search/
+
       // 2. Apply Sidebar Filters
       let matches = true;
       for (const [key, values] of Object.entries(selectedFilters)) {